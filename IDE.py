@@ -1,14 +1,16 @@
 import sys
 import re
-import os
+import queue
+import time
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QPlainTextEdit, QWidget, QVBoxLayout, QHBoxLayout, QTreeWidget, QTreeWidgetItem,
     QTabWidget, QMenuBar, QMenu, QStatusBar, QFileDialog, QToolBar, QAction, QSplitter, QMessageBox,
-    QLineEdit, QPushButton, QLabel, QTextEdit
+    QLineEdit, QPushButton, QLabel, QTextEdit, QSpinBox, QDoubleSpinBox, QTableView, QHeaderView, QComboBox
 )
 from PyQt5.QtGui import QTextCursor, QTextBlockFormat, QTextFormat, QPainter, QColor, QIcon, QFont
-from PyQt5.QtCore import Qt, QRect, QSize
-from phases import lexical, syntactic, semantic, intermediate_code
+from PyQt5.QtCore import Qt, QRect, QSize, QThread, QTimer, QAbstractTableModel, QModelIndex
+from phases import lexical, intermediate_code
+from phases.pipeline import CompilationSession
 from util.treeNode import ASTNode
 
 
@@ -195,6 +197,158 @@ class CodeEditor(QPlainTextEdit):
 
 
 
+# Intervalo de refresco de la pestaña Ejecución mientras corre el programa (~30 cuadros/s)
+EXECUTION_FRAME_MS = 33
+# Intervalo mínimo entre actualizaciones de la tabla de variables (10 por segundo)
+STATE_REFRESH_MS = 100
+
+
+class ExecutionStateModel(QAbstractTableModel):
+    """
+    Modelo de la tabla de variables y temporales de la pestaña Ejecución.
+
+    Se actualiza de forma incremental: apply_changes() recibe solo los valores que cambiaron
+    desde la instantánea anterior y emite dataChanged para esas filas, sin reconstruir la tabla.
+    """
+
+    HEADERS = ("Nombre", "Tipo", "Valor")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows = []  # [nombre, valor] en orden de aparición (variables antes que temporales)
+        self.row_of = {}  # nombre -> fila
+        self.var_types = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        name, value = self.rows[index.row()]
+        if index.column() == 0:
+            return name
+        if index.column() == 1:
+            return self.var_types.get(name, "")
+        return intermediate_code.format_tac_value(value)
+
+    def reset(self, var_types=None):
+        """Vacía la tabla para una nueva ejecución."""
+        self.beginResetModel()
+        self.rows = []
+        self.row_of = {}
+        self.var_types = dict(var_types or {})
+        self.endResetModel()
+
+    def apply_changes(self, changes):
+        """Aplica {nombre: valor} de las entradas que cambiaron; las nuevas se agregan al final."""
+        new_names = []
+        first = last = None
+        for name, value in changes.items():
+            row = self.row_of.get(name)
+            if row is None:
+                new_names.append(name)
+                continue
+            self.rows[row][1] = value
+            if first is None or row < first:
+                first = row
+            if last is None or row > last:
+                last = row
+        if first is not None:
+            self.dataChanged.emit(self.index(first, 2), self.index(last, 2))
+        
+        if new_names:
+            new_names.sort(key=self._sort_key)
+            start = len(self.rows)
+            self.beginInsertRows(QModelIndex(), start, start + len(new_names) - 1)
+            for name in new_names:
+                self.row_of[name] = len(self.rows)
+                self.rows.append([name, changes[name]])
+            self.endInsertRows()
+
+    @staticmethod
+    def _sort_key(name):
+        # Variables en orden alfabético y después temporales por número (t0, t1, ..., t10)
+        if intermediate_code.is_temporary(name):
+            return (1, int(name[1:]), name)
+        return (0, 0, name)
+
+
+class ExecutionWorker(QThread):
+    """
+    Ejecuta el intérprete TAC fuera del hilo de la interfaz.
+
+    La comunicación es por colas: el hilo publica eventos en `events` (salida, solicitudes
+    de entrada, instantáneas del estado y fin de la ejecución) y recibe los valores de
+    entrada por `inputs`. La interfaz consume los eventos con un QTimer a tasa fija.
+    """
+
+    SNAPSHOT_INTERVAL = STATE_REFRESH_MS / 1000  # Segundos mínimos entre instantáneas
+
+    def __init__(self, interpreter, max_steps=None, time_limit=None):
+        super().__init__()
+        self.interpreter = interpreter
+        self.max_steps = max_steps
+        self.time_limit = time_limit
+        self.events = queue.Queue()
+        self.inputs = queue.Queue()
+        self._last_snapshot = 0.0
+        self._published = {}  # Valores ya enviados a la interfaz (para publicar solo cambios)
+        interpreter.output_callback = lambda value: self.events.put(("output", value))
+        interpreter.progress_callback = self._publish_snapshot
+
+    def _publish_snapshot(self, force=False):
+        """
+        Publica el PC y las variables que cambiaron desde la instantánea anterior
+        (como máximo una vez cada SNAPSHOT_INTERVAL, salvo force).
+        """
+        now = time.perf_counter()
+        if force or now - self._last_snapshot >= self.SNAPSHOT_INTERVAL:
+            self._last_snapshot = now
+            changes = self.interpreter.diff_memory(self._published)
+            self.events.put(("state", self.interpreter.pc, changes))
+
+    def run(self):
+        interpreter = self.interpreter
+        while True:
+            status = interpreter.run(self.max_steps, self.time_limit)
+            self._publish_snapshot(force=True)
+            if status != intermediate_code.STATUS_PAUSED:
+                break
+            
+            # Esperar el valor de entrada de la interfaz (None = detener)
+            var = interpreter.pending_input_variable()
+            self.events.put(("input", var))
+            value = self.inputs.get()
+            if value is None:
+                status = intermediate_code.STATUS_STOPPED
+                break
+            try:
+                interpreter.provide_input(value)
+                self.events.put(("input_received", var, intermediate_code.format_tac_value(interpreter.get_value(var))))
+            except ValueError as e:
+                # El read sigue pendiente: run() volverá a pausar y se pedirá otro valor
+                self.events.put(("input_error", str(e)))
+        self.events.put(("finished", status))
+
+    def send_input(self, value):
+        """Entrega un valor de entrada al programa (llamado desde la interfaz)."""
+        self.inputs.put(value)
+
+    def stop(self):
+        """Detiene la ejecución tanto si está corriendo como si espera una entrada."""
+        self.interpreter.request_stop()
+        self.inputs.put(None)
+
+
 class CompilerIDE(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -240,10 +394,12 @@ class CompilerIDE(QMainWindow):
         # Editor de código
         self.code_editor = CodeEditor()
         self.code_editor.textChanged.connect(self.check_for_changes)
+        self.code_editor.textChanged.connect(self.schedule_live_lexical)
 
         # Panel de Análisis (pestañas)
         self.analysis_tabs = QTabWidget()
         self.lexical_analysis_tab = QPlainTextEdit()
+        self.live_lexical_tab = QPlainTextEdit()  # Tokens y errores del texto del editor mientras se escribe
         self.syntax_analysis_tab = QTreeWidget()
         self.syntax_analysis_tab.setHeaderHidden(True)
         self.semantic_analysis_tab = QTreeWidget()
@@ -255,15 +411,34 @@ class CompilerIDE(QMainWindow):
 
         # Configurar los paneles de análisis como de solo lectura
         self.lexical_analysis_tab.setReadOnly(True)
+        self.live_lexical_tab.setReadOnly(True)
         self.intermediate_code_tab.setReadOnly(True)
         self.hash_table_tab.setReadOnly(True)
         
+        # Analizador léxico incremental compartido por la vista léxica en vivo y la fase léxica de
+        # la sesión: al compilar el texto del editor ya analizado no se vuelve a analizar nada
+        self.incremental_lexer = lexical.AnalizadorLexicoIncremental()
+
+        # Sesión de compilación del documento: cada fase se ejecuta una sola vez por versión del texto
+        self.compilation_session = CompilationSession(write_files=True, lexer=self.incremental_lexer.analizar)
+
         # Variables para el intérprete
         self.tac_interpreter = None
         self.tac_instructions = []
+        self.tac_var_types = {}  # Tipos de variables y temporales del código TAC
+        self.execution_worker = None  # Hilo que ejecuta el intérprete
+        self.execution_timer = QTimer(self)  # Refresco de la pestaña Ejecución a tasa fija
+        self.execution_timer.timeout.connect(self._process_execution_events)
         self.execution_running = False
 
+        # Vista léxica en vivo: se vuelve a analizar (solo las líneas editadas) cuando se deja de escribir
+        self.live_lexical_timer = QTimer(self)
+        self.live_lexical_timer.setSingleShot(True)
+        self.live_lexical_timer.setInterval(300)
+        self.live_lexical_timer.timeout.connect(self.update_live_lexical)
+
         self.analysis_tabs.addTab(self.lexical_analysis_tab, "Análisis Léxico")
+        self.analysis_tabs.addTab(self.live_lexical_tab, "Léxico en vivo")
         self.analysis_tabs.addTab(self.syntax_analysis_tab, "Análisis Sintáctico")
         self.analysis_tabs.addTab(self.semantic_analysis_tab, "Análisis Semántico")
         self.analysis_tabs.addTab(self.intermediate_code_tab, "Código Intermedio")
@@ -370,6 +545,7 @@ class CompilerIDE(QMainWindow):
         self.code_editor.setPlainText("")
         self.current_file_path = None
         self.file_content_on_disk = ""
+        self.compilation_session.invalidate()
         self.update_window_title()
 
     def open_file(self):
@@ -392,6 +568,7 @@ class CompilerIDE(QMainWindow):
                 self.code_editor.setPlainText(content)
                 self.current_file_path = file_path
                 self.file_content_on_disk = content  # Guardar el contenido del archivo en disco
+                self.compilation_session.invalidate()
                 self.update_window_title()
 
     def save_file(self):
@@ -419,9 +596,7 @@ class CompilerIDE(QMainWindow):
     def compile(self):
         if not self.ensure_file_saved():
             return
-        self.run_lexical_phase()
-        self.run_syntactic_phase()
-        self.run_semantic_phase()
+        # Cada fase ejecuta (y muestra) primero las anteriores
         self.run_intermediate_code_phase()
 
     def ensure_file_saved(self):
@@ -450,15 +625,29 @@ class CompilerIDE(QMainWindow):
                 return False
         return True
 
+    def _load_session_source(self):
+        """
+        Carga en la sesión de compilación el texto a compilar (el archivo en disco o,
+        si no hay archivo, el contenido del editor). Las fases solo se invalidan si el texto cambió.
+        """
+        if self.current_file_path:
+            with open(self.current_file_path, "r", encoding="utf-8") as f:
+                source = f.read()
+        else:
+            source = self.code_editor.toPlainText()
+        self.compilation_session.set_source(source)
+
+    # Las fases se ejecutan en la sesión solo si el texto cambió, pero sus resultados se vuelven a
+    # mostrar siempre: otra vista (por ejemplo, la léxica en vivo) pudo escribir en las pestañas.
+
     def run_lexical_phase(self):
         try:
-            tabla_tokens, tabla_errores = lexical.analizar_desde_archivo(self.current_file_path)
+            self._load_session_source()
+            result = self.compilation_session.lexical()
 
             # Mostrar resultados en el IDE
-            self.lexical_analysis_tab.setPlainText(tabla_tokens)
-            self.lexical_errors_tab.setPlainText(tabla_errores)
-
-            # Ya no generamos el archivo aquí, se hace en el analizador léxico
+            self.lexical_analysis_tab.setPlainText(lexical.generar_tabla_tokens(result.tokens))
+            self.lexical_errors_tab.setPlainText(lexical.generar_tabla_errores(result.lexical_errors))
         except Exception as e:
             QMessageBox.critical(self, "Error en análisis léxico", str(e))
             
@@ -466,18 +655,13 @@ class CompilerIDE(QMainWindow):
     def run_syntactic_phase(self):
         try:
             # Ejecutar primero el análisis léxico (si es necesario)
-            if not os.path.exists("tokens.txt") or not self.current_file_path:
-                # Si no hay tokens o no hay archivo abierto, ejecutar análisis léxico
-                self.run_lexical_phase()
-            
-            # Asegurarse de que el archivo de tokens existe después del análisis léxico
-            if not os.path.exists("tokens.txt"):
-                QMessageBox.warning(self, "Advertencia", 
-                                  "No se pudo generar el archivo de tokens. Por favor, verifique el archivo de código fuente.")
+            self.run_lexical_phase()
+            if self.compilation_session.pipeline is None:
                 return
 
             # Ejecutar el análisis sintáctico
-            ast_root, errors = syntactic.get_ast()
+            result = self.compilation_session.syntactic()
+            ast_root, errors = result.ast, result.syntax_errors
             
             # Verificar si hay errores fatales
             if errors and any("Fatal" in error for error in errors):
@@ -496,28 +680,14 @@ class CompilerIDE(QMainWindow):
     def run_semantic_phase(self):
         try:
             # Ejecutar primero el análisis sintáctico (que incluye el léxico)
-            if not os.path.exists("tokens.txt") or not self.current_file_path:
-                # Si no hay tokens o no hay archivo abierto, ejecutar análisis sintáctico
-                self.run_syntactic_phase()
-            else:
-                # Si hay tokens pero no se ha ejecutado el sintáctico, ejecutarlo
-                # Verificar si hay AST válido ejecutando el sintáctico
-                try:
-                    ast_root, errors = syntactic.get_ast()
-                    # Mostrar el árbol sintáctico también
-                    fill_tree_widget(self.syntax_analysis_tab, ast_root, self.syntax_errors_tab, errors)
-                except:
-                    # Si falla, ejecutar desde el léxico
-                    self.run_syntactic_phase()
-            
-            # Asegurarse de que el archivo de tokens existe después del análisis sintáctico
-            if not os.path.exists("tokens.txt"):
-                QMessageBox.warning(self, "Advertencia", 
-                                  "No se pudo generar el archivo de tokens. Por favor, verifique el archivo de código fuente.")
+            self.run_syntactic_phase()
+            if self.compilation_session.pipeline is None:
                 return
             
             # Ejecutar el análisis semántico
-            ast_anotado, tabla_simbolos, errores, annotations, ast_root = semantic.get_semantic_results()
+            result = self.compilation_session.semantic()
+            tabla_simbolos, errores = result.tabla_simbolos, result.semantic_errors
+            annotations, ast_root = result.annotations, result.ast
             
             # Mostrar árbol semántico anotado en la pestaña de análisis semántico
             if ast_root and annotations:
@@ -546,57 +716,49 @@ class CompilerIDE(QMainWindow):
                                    "Se encontraron errores fatales durante el análisis semántico.")
             
         except Exception as e:
-            self.semantic_analysis_tab.setPlainText(f"Error durante el análisis semántico:\n{str(e)}")
+            self.semantic_errors_tab.setPlainText(f"Error durante el análisis semántico:\n{str(e)}")
             import traceback
             traceback.print_exc()
 
     def run_intermediate_code_phase(self):
-        """Genera código intermedio TAC y lo ejecuta."""
+        """Genera código intermedio TAC (la ejecución se inicia desde la pestaña Ejecución)."""
         try:
             # Ejecutar primero el análisis semántico (que incluye sintáctico y léxico)
-            if not os.path.exists("tokens.txt") or not self.current_file_path:
-                self.run_semantic_phase()
-            else:
-                # Verificar si tenemos los resultados semánticos
-                try:
-                    ast_anotado, tabla_simbolos, errores, annotations, ast_root = semantic.get_semantic_results()
-                except:
-                    # Si falla, ejecutar análisis semántico completo
-                    self.run_semantic_phase()
-                    ast_anotado, tabla_simbolos, errores, annotations, ast_root = semantic.get_semantic_results()
-            
-            # Obtener resultados semánticos
-            ast_anotado, tabla_simbolos, errores, annotations, ast_root = semantic.get_semantic_results()
+            self.run_semantic_phase()
+            if self.compilation_session.pipeline is None:
+                return
+
+            result = self.compilation_session.intermediate()
             
-            if ast_root is None:
+            if result.ast is None:
                 self.intermediate_code_tab.setPlainText("Error: No se pudo obtener el AST. Ejecuta primero el análisis semántico.")
                 return
             
             # Verificar si hay errores semánticos fatales
-            if errores and any(error.get('fatal', False) for error in errores):
+            if result.has_fatal_errors():
                 self.intermediate_code_tab.setPlainText(
                     "Error: No se puede generar código intermedio debido a errores semánticos fatales.\n"
                     "Por favor, corrige los errores y vuelve a ejecutar el análisis semántico."
                 )
                 return
             
-            # Generar código TAC (sin ejecutar aún)
-            generator = intermediate_code.TACGenerator(annotations, tabla_simbolos)
-            instructions = generator.generate_from_ast(ast_root)
-            
             # Guardar instrucciones para ejecución interactiva
+            instructions = result.instructions
             self.tac_instructions = instructions
+            self.tac_var_types = result.var_types
             
             # Mostrar código TAC generado
             tac_text = "\n".join(instructions) if instructions else "No se generaron instrucciones."
             self.intermediate_code_tab.setPlainText(tac_text)
             
-            # Mostrar mensaje en ejecución
-            if hasattr(self, 'execution_output'):
+            # Mostrar mensaje en ejecución (sin borrar la salida de un programa en curso)
+            if hasattr(self, 'execution_output') and not self.execution_running:
                 self.execution_output.clear()
                 self.execution_output.append("=== CÓDIGO TAC GENERADO ===\n")
                 self.execution_output.append("Presione 'Ejecutar' para iniciar la ejecución interactiva.\n")
                 self.execution_output.append(f"Total de instrucciones: {len(instructions)}\n")
+                if result.optimization_report:
+                    self.execution_output.append(f"{result.optimization_report}\n")
                 if hasattr(self, 'execution_run_btn'):
                     self.execution_run_btn.setEnabled(True)
             
@@ -610,6 +772,20 @@ class CompilerIDE(QMainWindow):
             traceback.print_exc()
     
 
+    def schedule_live_lexical(self):
+        """Reinicia la espera de la vista léxica en vivo en cada cambio del editor."""
+        self.live_lexical_timer.start()
+
+    def update_live_lexical(self):
+        """
+        Actualiza la pestaña "Léxico en vivo" con el texto del editor (solo se vuelven a analizar las
+        líneas editadas). Las pestañas de análisis léxico muestran el texto compilado, que puede ser
+        el archivo en disco si hay cambios sin guardar.
+        """
+        tokens, errors = self.incremental_lexer.analizar(self.code_editor.toPlainText())
+        self.live_lexical_tab.setPlainText(
+            f"{lexical.generar_tabla_tokens(tokens)}\n{lexical.generar_tabla_errores(errors)}")
+
     def check_for_changes(self):
         """Verifica si hay cambios no guardados en el editor."""
         if self.current_file_path:
@@ -652,12 +828,17 @@ class CompilerIDE(QMainWindow):
         self.execution_output.setReadOnly(True)
         self.execution_output.setFont(QFont("Courier", 10))
         
-        # Área de estado (variables y código TAC actual)
+        # Área de estado (instrucción TAC actual y tabla de variables/temporales)
         state_label = QLabel("Estado de Ejecución (Variables y Código TAC):")
-        self.execution_state = QTextEdit()
-        self.execution_state.setReadOnly(True)
+        self.execution_current_inst = QLabel()
+        self.execution_current_inst.setFont(QFont("Courier", 9))
+        self.execution_state_model = ExecutionStateModel(self)
+        self.execution_state = QTableView()
+        self.execution_state.setModel(self.execution_state_model)
         self.execution_state.setFont(QFont("Courier", 9))
         self.execution_state.setMaximumHeight(200)
+        self.execution_state.verticalHeader().setVisible(False)
+        self.execution_state.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         
         # Área de entrada
         input_label = QLabel("Entrada (escriba un valor y presione Enter o clic en Enviar):")
@@ -685,10 +866,39 @@ class CompilerIDE(QMainWindow):
         control_layout.addWidget(self.execution_clear_btn)
         control_layout.addStretch()
         
+        # Límites de ejecución (0 = sin límite)
+        self.execution_max_steps = QSpinBox()
+        self.execution_max_steps.setRange(0, 2000000000)
+        self.execution_max_steps.setSingleStep(100000)
+        self.execution_max_steps.setSpecialValueText("Sin límite")
+        self.execution_max_steps.setValue(intermediate_code.DEFAULT_MAX_STEPS or 0)
+        self.execution_time_limit = QDoubleSpinBox()
+        self.execution_time_limit.setRange(0, 3600)
+        self.execution_time_limit.setDecimals(1)
+        self.execution_time_limit.setSuffix(" s")
+        self.execution_time_limit.setSpecialValueText("Sin límite")
+        self.execution_time_limit.setValue(intermediate_code.DEFAULT_TIME_LIMIT or 0)
+        self.execution_max_steps_label = QLabel()
+        control_layout.addWidget(self.execution_max_steps_label)
+        control_layout.addWidget(self.execution_max_steps)
+        control_layout.addWidget(QLabel("Tiempo máximo:"))
+        control_layout.addWidget(self.execution_time_limit)
+        
+        # Motor de ejecución (el límite de pasos se expresa en la unidad que cuenta cada motor)
+        self.execution_engine = QComboBox()
+        self.execution_engine.addItem("Máquina virtual TAC", intermediate_code.ENGINE_TAC)
+        self.execution_engine.addItem("Python nativo", intermediate_code.ENGINE_PYTHON)
+        self.execution_engine.addItem("Intérprete de AST", intermediate_code.ENGINE_AST)
+        self.execution_engine.currentIndexChanged.connect(self._update_step_limit_label)
+        self._update_step_limit_label()
+        control_layout.addWidget(QLabel("Motor:"))
+        control_layout.addWidget(self.execution_engine)
+        
         # Ensamblar layout
         layout.addWidget(output_label)
         layout.addWidget(self.execution_output)
         layout.addWidget(state_label)
+        layout.addWidget(self.execution_current_inst)
         layout.addWidget(self.execution_state)
         layout.addWidget(input_label)
         layout.addLayout(input_layout)
@@ -699,240 +909,185 @@ class CompilerIDE(QMainWindow):
     
     def _clear_execution(self):
         """Limpia las áreas de ejecución."""
+        self._shutdown_execution_worker()
         self.execution_output.clear()
-        self.execution_state.clear()
+        self.execution_current_inst.clear()
+        self.execution_state_model.reset()
         self.execution_input.clear()
         self.tac_interpreter = None
         self.tac_instructions = []
+        self.tac_var_types = {}
         self.execution_running = False
         self.execution_run_btn.setEnabled(True)
         self.execution_stop_btn.setEnabled(False)
         self.execution_send_btn.setEnabled(False)
     
     def _start_execution(self):
-        """Inicia la ejecución del código TAC."""
+        """Inicia la ejecución del código TAC en un hilo aparte."""
         try:
             # Obtener código TAC generado
             if not self.tac_instructions:
-                # Intentar generar código TAC
-                if not os.path.exists("tokens.txt") or not self.current_file_path:
+                # Generar código TAC a partir de la sesión de compilación
+                self.run_intermediate_code_phase()
+                if not self.tac_instructions:
                     QMessageBox.warning(self, "Advertencia", 
                                       "Primero debe ejecutar el análisis semántico para generar código intermedio.")
                     return
-                
-                try:
-                    ast_anotado, tabla_simbolos, errores, annotations, ast_root = semantic.get_semantic_results()
-                except:
-                    QMessageBox.warning(self, "Advertencia", 
-                                      "Primero debe ejecutar el análisis semántico.")
-                    return
-                
-                if ast_root is None:
-                    QMessageBox.warning(self, "Advertencia", 
-                                      "No se pudo obtener el AST.")
-                    return
-                
-                # Generar código TAC
-                from phases import intermediate_code
-                generator = intermediate_code.TACGenerator(annotations, tabla_simbolos)
-                self.tac_instructions = generator.generate_from_ast(ast_root)
-                
-                # Mostrar código TAC en la pestaña correspondiente
-                tac_text = "\n".join(self.tac_instructions) if self.tac_instructions else "No se generaron instrucciones."
-                self.intermediate_code_tab.setPlainText(tac_text)
             
-            # Crear intérprete
-            from phases import intermediate_code
-            self.tac_interpreter = intermediate_code.TACInterpreter()
-            self.tac_interpreter.load_from_list(self.tac_instructions)
+            self._shutdown_execution_worker()
+            
+            # Crear el motor de ejecución elegido
+            engine = self.execution_engine.currentData()
+            if engine == intermediate_code.ENGINE_TAC:
+                self.tac_interpreter = intermediate_code.TACInterpreter()
+                self.tac_interpreter.load_from_list(self.tac_instructions, self.tac_var_types)
+            else:
+                self.tac_interpreter = self.compilation_session.intermediate().create_engine(engine)
             
-            # Configurar callbacks para entrada/salida
-            self.tac_interpreter.output_callback = self._on_output
-            self.tac_interpreter.input_callback = self._on_input_request
+            # Límites configurados en la pestaña (0 = sin límite)
+            max_steps = self.execution_max_steps.value() or None
+            time_limit = self.execution_time_limit.value() or None
+            self.execution_worker = ExecutionWorker(self.tac_interpreter, max_steps, time_limit)
             
             # Iniciar ejecución
             self.execution_running = True
             self.execution_run_btn.setEnabled(False)
             self.execution_stop_btn.setEnabled(True)
+            self.execution_send_btn.setEnabled(False)
             self.execution_output.clear()
-            self.execution_state.clear()
+            self.execution_current_inst.clear()
+            self.execution_state_model.reset(self.tac_var_types)
             self.execution_output.append("=== INICIANDO EJECUCIÓN ===\n")
             
-            # Ejecutar
-            self._execute_step()
+            self.execution_worker.start()
+            self.execution_timer.start(EXECUTION_FRAME_MS)
             
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error iniciando ejecución:\n{str(e)}")
             import traceback
             traceback.print_exc()
     
-    def _execute_step(self):
-        """Ejecuta pasos del intérprete."""
-        if not self.execution_running or not self.tac_interpreter:
-            return
-        
-        try:
-            max_steps = 10000
-            steps = 0
-            
-            while self.execution_running and self.tac_interpreter.pc < len(self.tac_interpreter.instructions) and steps < max_steps:
-                instruction = self.tac_interpreter.instructions[self.tac_interpreter.pc].strip()
-                
-                # Saltar etiquetas
-                if instruction.endswith(':'):
-                    self.tac_interpreter.pc += 1
-                    continue
-                
-                # Ejecutar instrucción
-                result = self.tac_interpreter._execute_instruction(instruction)
-                
-                # Verificar si necesita pausar para entrada
-                if isinstance(result, tuple) and result[0] == "PAUSE":
-                    var_name = result[1]
-                    # Pausar y esperar entrada del usuario
-                    # El mensaje ya se muestra en el callback _on_input_request
-                    self._update_execution_state()
-                    self.execution_send_btn.setEnabled(True)
-                    self.execution_input.setFocus()
-                    return  # Pausar ejecución
-                
-                # Verificar error
-                if isinstance(result, tuple):
-                    success, error = result
-                    if not success:
-                        self.execution_output.append(f"ERROR: {error}")
-                        self.execution_running = False
-                        break
-                
-                # Avanzar contador de programa
-                self.tac_interpreter.pc += 1
-                steps += 1
-                
-                # Actualizar estado cada 5 pasos
-                if steps % 5 == 0:
-                    self._update_execution_state()
-            
-            # Verificar si terminó
-            if self.tac_interpreter.pc >= len(self.tac_interpreter.instructions):
-                self.execution_output.append("\n=== EJECUCIÓN COMPLETADA ===")
-                self.execution_running = False
-                self.execution_run_btn.setEnabled(True)
-                self.execution_stop_btn.setEnabled(False)
-                self.execution_send_btn.setEnabled(False)
-                self._update_execution_state()
-            elif steps >= max_steps:
-                self.execution_output.append(f"\n=== ADVERTENCIA: Límite de pasos alcanzado ({max_steps}) ===")
-                self.execution_running = False
-                self.execution_run_btn.setEnabled(True)
-                self.execution_stop_btn.setEnabled(False)
-                self.execution_send_btn.setEnabled(False)
-            
-        except Exception as e:
-            self.execution_output.append(f"ERROR: {str(e)}")
-            self.execution_running = False
-            self.execution_run_btn.setEnabled(True)
-            self.execution_stop_btn.setEnabled(False)
-            self.execution_send_btn.setEnabled(False)
-            import traceback
-            traceback.print_exc()
+    def _shutdown_execution_worker(self):
+        """Detiene el hilo de ejecución (si existe) y espera a que termine."""
+        self.execution_timer.stop()
+        if self.execution_worker is not None:
+            self.execution_worker.stop()
+            self.execution_worker.wait()
+            self.execution_worker = None
     
-    def _update_execution_state(self):
-        """Actualiza el estado de ejecución mostrando variables y código actual."""
-        if not self.tac_interpreter:
+    def _process_execution_events(self):
+        """Consume los eventos publicados por el hilo de ejecución (llamado por el QTimer)."""
+        worker = self.execution_worker
+        if worker is None:
             return
         
-        state_text = "=== ESTADO DE EJECUCIÓN ===\n\n"
+        output_lines = []
+        state_pc = None
+        state_changes = {}
+        # Solo los eventos ya publicados al inicio del cuadro, para no bloquear la interfaz
+        for _ in range(worker.events.qsize()):
+            event = worker.events.get_nowait()
+            kind = event[0]
+            if kind == "output":
+                output_lines.append(str(event[1]))
+                continue
+            if kind == "state":
+                # Acumular los cambios de todas las instantáneas del cuadro
+                state_pc = event[1]
+                state_changes.update(event[2])
+                continue
+            
+            # Los demás eventos se muestran después de la salida acumulada
+            if output_lines:
+                self.execution_output.append("\n".join(output_lines))
+                output_lines = []
+            if kind == "input":
+                self.execution_output.append(f"Esperando entrada para: {event[1]}")
+                self.execution_send_btn.setEnabled(True)
+                self.execution_input.setFocus()
+            elif kind == "input_received":
+                self.execution_output.append(f"Entrada recibida para {event[1]}: {event[2]}")
+            elif kind == "input_error":
+                self.execution_output.append(f"ERROR: {event[1]}")
+            elif kind == "finished":
+                if state_pc is not None:
+                    self._update_execution_state(state_pc, state_changes)
+                self._finish_execution(event[1])
+                return
         
-        # Mostrar instrucción actual
-        if self.tac_interpreter.pc < len(self.tac_interpreter.instructions):
-            current_inst = self.tac_interpreter.instructions[self.tac_interpreter.pc]
-            state_text += f"Instrucción {self.tac_interpreter.pc}/{len(self.tac_interpreter.instructions)-1}:\n"
-            state_text += f"  {current_inst}\n\n"
+        if output_lines:
+            self.execution_output.append("\n".join(output_lines))
+        if state_pc is not None:
+            self._update_execution_state(state_pc, state_changes)
+    
+    def _finish_execution(self, status):
+        """Muestra el resultado final de la ejecución y restablece los controles."""
+        self.execution_timer.stop()
+        worker = self.execution_worker
+        self.execution_worker = None
+        if worker is not None:
+            worker.wait()
         
-        # Mostrar variables con valores
-        state_text += "=== VARIABLES Y TEMPORALES ===\n"
-        if self.tac_interpreter.memory:
-            variables = []
-            temporales = []
-            for var, value in sorted(self.tac_interpreter.memory.items()):
-                if var.startswith('t'):
-                    temporales.append((var, value))
-                else:
-                    variables.append((var, value))
-            
-            if variables:
-                state_text += "Variables:\n"
-                for var, value in variables:
-                    state_text += f"  {var} = {value}\n"
-            
-            if temporales:
-                state_text += "\nTemporales (últimos 5):\n"
-                for var, value in temporales[-5:]:
-                    state_text += f"  {var} = {value}\n"
-        else:
-            state_text += "(Sin variables asignadas aún)\n"
+        interpreter = self.tac_interpreter
+        if status == intermediate_code.STATUS_ERROR:
+            self.execution_output.append(f"ERROR: {interpreter.error}")
+        elif status == intermediate_code.STATUS_FINISHED:
+            self.execution_output.append("\n=== EJECUCIÓN COMPLETADA ===")
+            self.execution_output.append(interpreter.stats_summary())
+        elif status in (intermediate_code.STATUS_STEP_LIMIT, intermediate_code.STATUS_TIME_LIMIT):
+            message = interpreter.limit_message(status, worker.max_steps, worker.time_limit)
+            self.execution_output.append(f"\n=== ADVERTENCIA: {message} ===")
         
-        self.execution_state.setPlainText(state_text)
+        self.execution_running = False
+        self.execution_run_btn.setEnabled(True)
+        self.execution_stop_btn.setEnabled(False)
+        self.execution_send_btn.setEnabled(False)
     
-    def _on_output(self, value):
-        """Callback para cuando el programa produce salida."""
-        self.execution_output.append(str(value))
-        self._update_execution_state()
+    def _update_step_limit_label(self):
+        """Rotula el límite de pasos con la unidad que cuenta el motor seleccionado."""
+        unit = intermediate_code.ENGINE_STEP_UNITS[self.execution_engine.currentData()]
+        self.execution_max_steps_label.setText(f"Límite de {unit}:")
+        self.execution_max_steps.setToolTip(f"Número máximo de {unit} a ejecutar (0 = sin límite)")
     
-    def _on_input_request(self, var_name):
-        """Callback para cuando el programa solicita entrada."""
-        # Solo mostrar el mensaje una vez
-        if not hasattr(self, '_last_input_request') or self._last_input_request != var_name:
-            self.execution_output.append(f"Esperando entrada para: {var_name}")
-            self._last_input_request = var_name
-        self._update_execution_state()
+    def _update_execution_state(self, pc, changes):
+        """Muestra la instrucción actual y aplica a la tabla solo las variables que cambiaron."""
+        if not self.tac_interpreter:
+            return
+        
+        instructions = self.tac_interpreter.instructions
+        if pc < len(instructions):
+            self.execution_current_inst.setText(f"Instrucción {pc}/{len(instructions)-1}:  {instructions[pc]}")
+        else:
+            self.execution_current_inst.setText("Fin del programa")
+        self.execution_state_model.apply_changes(changes)
     
     def _send_input_value(self):
-        """Envía un valor de entrada al intérprete."""
-        if not self.execution_running or not self.tac_interpreter:
+        """Envía un valor de entrada al hilo de ejecución."""
+        if not self.execution_running or self.execution_worker is None:
             return
         
         value_str = self.execution_input.text().strip()
         if not value_str:
             return
         
-        try:
-            # Convertir a número si es posible
-            if '.' in value_str:
-                value = float(value_str)
-            else:
-                value = int(value_str)
-        except ValueError:
-            value = value_str
-        
-        # Procesar la instrucción read que estaba pausada
-        if self.tac_interpreter.pc < len(self.tac_interpreter.instructions):
-            instruction = self.tac_interpreter.instructions[self.tac_interpreter.pc].strip()
-            if instruction.startswith("read "):
-                var = instruction[5:].strip()
-                # Asignar el valor directamente
-                self.tac_interpreter.set_value(var, value)
-                self.execution_output.append(f"Entrada recibida para {var}: {value}")
-                # Avanzar el PC
-                self.tac_interpreter.pc += 1
-            else:
-                # Si no es read, agregar a la cola (por si acaso)
-                self.tac_interpreter.input_queue.append(value)
-                self.execution_output.append(f"Entrada recibida: {value}")
-        
+        # El intérprete convierte el valor al tipo de la variable; si es inválido lo vuelve a pedir
+        self.execution_worker.send_input(value_str)
         self.execution_input.clear()
         self.execution_send_btn.setEnabled(False)
-        
-        # Continuar ejecución (que verificará si hay otro read)
-        self._execute_step()
     
     def _stop_execution(self):
         """Detiene la ejecución."""
+        self._shutdown_execution_worker()
         self.execution_running = False
         self.execution_run_btn.setEnabled(True)
         self.execution_stop_btn.setEnabled(False)
         self.execution_send_btn.setEnabled(False)
         self.execution_output.append("\n=== EJECUCIÓN DETENIDA POR EL USUARIO ===")
+    
+    def closeEvent(self, event):
+        """Detiene el hilo de ejecución antes de cerrar la ventana."""
+        self._shutdown_execution_worker()
+        super().closeEvent(event)
 
 def fill_tree_widget(widget: QTreeWidget, ast_root: ASTNode, error_output_widget: QPlainTextEdit, parser_errors: list):
     widget.clear()
@@ -0,0 +1,410 @@
+# ast_interpreter.py
+# Intérprete del AST anotado por compilación a closures (sin pasar por el código TAC)
+
+from phases.intermediate_code import (
+    TACGenerator, parse_literal, DEFAULT_MAX_STEPS, DEFAULT_TIME_LIMIT, ENGINE_AST, ENGINE_STEP_UNITS,
+)
+from phases.python_backend import GeneratorProgram, REQUEST_CHECKPOINT, REQUEST_READ
+
+
+def _divide(left, right):
+    def run():
+        x = left()
+        y = right()
+        return x / y if y != 0 else 0
+    return run
+
+
+def _modulo(left, right):
+    def run():
+        x = left()
+        y = right()
+        return x % y if y != 0 else 0
+    return run
+
+
+# Fábricas de closures para cada operador binario (semántica de la máquina virtual TAC)
+_BINARY = {
+    '+': lambda left, right: lambda: left() + right(),
+    '-': lambda left, right: lambda: left() - right(),
+    '*': lambda left, right: lambda: left() * right(),
+    '/': _divide,
+    '%': _modulo,
+    '<': lambda left, right: lambda: left() < right(),
+    '>': lambda left, right: lambda: left() > right(),
+    '<=': lambda left, right: lambda: left() <= right(),
+    '>=': lambda left, right: lambda: left() >= right(),
+    '==': lambda left, right: lambda: left() == right(),
+    '!=': lambda left, right: lambda: left() != right(),
+    '&&': lambda left, right: lambda: bool(left()) and bool(right()),
+    '||': lambda left, right: lambda: bool(left()) or bool(right()),
+}
+
+
+class _LoopState:
+    """Contador de iteraciones compartido por los ciclos del programa."""
+
+    __slots__ = ('steps', 'checkpoint', 'line')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.steps = 0
+        self.checkpoint = 0
+        self.line = 0  # Línea del código fuente del último punto de revisión
+
+
+class ClosureCompiler:
+    """
+    Compila el AST anotado a closures de Python, una por nodo, que se ejecutan directamente.
+
+    Las expresiones son funciones sin argumentos que retornan su valor. Las sentencias son
+    pares (función, es_generador): las que contienen cin o ciclos son generadores que se
+    suspenden con yield (entrada y puntos de revisión del watchdog); las demás son funciones
+    normales, así el código sin ciclos no paga el costo de los generadores. Las variables
+    viven en una lista (env) y cada closure captura el índice de la suya.
+    """
+
+    def __init__(self, annotations, symbol_table, write):
+        """
+        Args:
+            annotations: Diccionario de anotaciones del análisis semántico {id_nodo: {...}}
+            symbol_table: Tabla de símbolos con información de variables
+            write: Función que recibe cada valor de cout
+        """
+        # Se reutilizan las utilidades de lectura del AST del generador TAC
+        self.reader = TACGenerator(annotations, symbol_table, reuse_temps=False, optimization_level=0)
+        self.var_types = self.reader.collect_variable_types()
+        self.write = write
+        self.slots = {name: index for index, name in enumerate(self.var_types)}
+        self.env = []
+        self.state = _LoopState()
+
+    def lexema(self, node):
+        return self.reader.extract_lexema(node.name if hasattr(node, 'name') else str(node))
+
+    @staticmethod
+    def line_of(node):
+        """Línea del código fuente de un nodo con nombre 'lexema (linea:columna)' (0 si no tiene)."""
+        name = node.name if hasattr(node, 'name') else str(node)
+        if " (" in name and name.endswith(")"):
+            position = name.rsplit(" (", 1)[1][:-1]
+            if position.split(":")[0].isdigit():
+                return int(position.split(":")[0])
+        return 0
+
+    def slot(self, name):
+        if name not in self.slots:
+            self.slots[name] = len(self.slots)
+        return self.slots[name]
+
+    def compile(self, ast_root):
+        """
+        Compila el programa.
+
+        Returns:
+            Función generadora sin argumentos que ejecuta el programa
+        """
+        statements = []
+        if ast_root is not None and hasattr(ast_root, 'children'):
+            statements = [self.statement(child) for child in ast_root.children
+                          if child is not None and self.lexema(child) not in ('main', '{', '}', 'Programa')]
+        body, body_is_generator = self.sequence(statements)
+        body = body or (lambda: None)
+        self.env.extend([0] * (len(self.slots) - len(self.env)))
+        env, state, slots = self.env, self.state, self.slots
+
+        def program():
+            state.checkpoint = yield (REQUEST_CHECKPOINT, None, 0)
+            if body_is_generator:
+                yield from body()
+            else:
+                body()
+            return state.steps, {name: env[index] for name, index in slots.items()}
+        return program
+
+    # Sentencias
+
+    def sequence(self, statements):
+        """Une sentencias compiladas en una sola (agrupa las que no son generadores)."""
+        groups = []  # (funciones, es_generador)
+        for function, is_generator in statements:
+            if function is None:
+                continue
+            if groups and not is_generator and not groups[-1][1]:
+                groups[-1][0].append(function)
+            else:
+                groups.append(([function], is_generator))
+
+        plain = []
+        for functions, is_generator in groups:
+            if is_generator or len(functions) == 1:
+                plain.append((functions[0], is_generator))
+            else:
+                plain.append((self._run_all(tuple(functions)), False))
+
+        if not plain:
+            return None, False
+        if len(plain) == 1:
+            return plain[0]
+        if not any(is_generator for _, is_generator in plain):
+            return self._run_all(tuple(function for function, _ in plain)), False
+        steps = tuple(plain)
+
+        def run():
+            for function, is_generator in steps:
+                if is_generator:
+                    yield from function()
+                else:
+                    function()
+        return run, True
+
+    @staticmethod
+    def _run_all(functions):
+        def run():
+            for function in functions:
+                function()
+        return run
+
+    def block(self, node):
+        """Sentencias hijas de un bloque (then, else, Cuerpo)."""
+        children = node.children if node is not None and hasattr(node, 'children') else []
+        return self.sequence([self.statement(child) for child in children])
+
+    def statement(self, node):
+        """Compila una sentencia (misma estructura que TACGenerator.process_statement)."""
+        if node is None:
+            return None, False
+        node_name = node.name if hasattr(node, 'name') else str(node)
+        lexema = self.lexema(node)
+        children = node.children if hasattr(node, 'children') else []
+        env = self.env
+
+        if lexema in ('main', '{', '}'):
+            return self.sequence([self.statement(child) for child in children])
+
+        if node_name == "Declaración":
+            return self.sequence([self.statement(child) for child in children[1:]
+                                  if child is not None and hasattr(child, 'name') and child.name == "="])
+
+        if lexema in ('int', 'float', 'bool'):
+            return None, False
+
+        if lexema == "=" and len(children) >= 2:
+            value = self.expression(children[1])
+            if value is None:
+                return None, False
+            index = self.slot(self.lexema(children[0]))
+
+            def assign():
+                env[index] = value()
+            return assign, False
+
+        if lexema in ("+=", "-=", "*=", "/=", "%=") and len(children) >= 2:
+            value = self.expression(children[1])
+            if value is None:
+                return None, False
+            index = self.slot(self.lexema(children[0]))
+            combined = _BINARY[lexema[0]](lambda: env[index], value)
+
+            def assign():
+                env[index] = combined()
+            return assign, False
+
+        if lexema.startswith("Expansión de"):
+            return self.statement(children[0]) if children else (None, False)
+
+        if lexema == "if":
+            return self.if_statement(children)
+
+        if lexema in ("while", "do"):
+            return self.loop(node, children, until=lexema == "do")
+
+        if lexema == "cin" and children:
+            name = self.lexema(children[0])
+            index = self.slot(name)
+            state = self.state
+            line = self.line_of(node)
+
+            def read():
+                state.line = line
+                env[index] = yield (REQUEST_READ, name, state.steps)
+            return read, True
+
+        if lexema == "cout" and children:
+            value = self.expression(children[0])
+            if value is None:
+                return None, False
+            write = self.write
+
+            def output():
+                write(value())
+            return output, False
+
+        if lexema in ("=", "+=", "-=", "*=", "/=", "%=", "cin", "cout"):
+            return None, False
+        return self.sequence([self.statement(child) for child in children])
+
+    @staticmethod
+    def _parts(children):
+        return {child.name: child for child in children if hasattr(child, 'name')}
+
+    def if_statement(self, children):
+        parts = self._parts(children)
+        cond_node, then_node, else_node = parts.get("Condición"), parts.get("then"), parts.get("else")
+        if cond_node is None or then_node is None or not cond_node.children:
+            return None, False
+        condition = self.expression(cond_node.children[0])
+        if condition is None:
+            return None, False
+        then_body, then_is_generator = self.block(then_node)
+        else_body, else_is_generator = self.block(else_node) if else_node is not None else (None, False)
+        then_body = then_body or (lambda: None)
+        else_body = else_body or (lambda: None)
+
+        if not (then_is_generator or else_is_generator):
+            def run():
+                if condition():
+                    then_body()
+                else:
+                    else_body()
+            return run, False
+
+        def run_generator():
+            if condition():
+                if then_is_generator:
+                    yield from then_body()
+                else:
+                    then_body()
+            elif else_is_generator:
+                yield from else_body()
+            else:
+                else_body()
+        return run_generator, True
+
+    def loop(self, node, children, until):
+        """
+        while cond do ... end y do ... until cond. Cada iteración cuenta un paso y, al llegar
+        al punto de revisión, se suspende para que el motor revise los límites.
+        """
+        parts = self._parts(children)
+        cond_node, body_node = parts.get("Condición"), parts.get("Cuerpo")
+        if cond_node is None or body_node is None:
+            return None, False
+        condition = self.expression(cond_node.children[0]) if cond_node.children else None
+        body, body_is_generator = self.block(body_node)
+        body = body or (lambda: None)
+        state = self.state
+        line = self.line_of(node)
+
+        if not until and condition is not None:
+            def run_while():
+                while condition():
+                    state.steps += 1
+                    if state.steps >= state.checkpoint:
+                        state.line = line
+                        state.checkpoint = yield (REQUEST_CHECKPOINT, None, state.steps)
+                    if body_is_generator:
+                        yield from body()
+                    else:
+                        body()
+            return run_while, True
+
+        # do-until (o un ciclo sin condición, que no termina)
+        def run_until():
+            while True:
+                state.steps += 1
+                if state.steps >= state.checkpoint:
+                    state.line = line
+                    state.checkpoint = yield (REQUEST_CHECKPOINT, None, state.steps)
+                if body_is_generator:
+                    yield from body()
+                else:
+                    body()
+                if condition is not None and condition():
+                    return
+        return run_until, True
+
+    # Expresiones
+
+    def expression(self, node):
+        """Closure que calcula el valor de un nodo (o None si no se puede compilar)."""
+        if node is None:
+            return None
+        lexema = self.lexema(node)
+        children = node.children if hasattr(node, 'children') else []
+
+        if self.reader.is_literal(node):
+            value = parse_literal(str(self.reader.get_literal_value(node)))
+            return lambda: value
+        if self.reader.is_identifier(node):
+            env = self.env
+            index = self.slot(lexema)
+            return lambda: env[index]
+        if lexema in _BINARY and len(children) >= 2:
+            left = self.expression(children[0])
+            right = self.expression(children[1])
+            if left is None or right is None:
+                return None
+            return _BINARY[lexema](left, right)
+        if lexema == '!':
+            operand = self.expression(children[0]) if children else None
+            return None if operand is None else (lambda: not operand())
+        if children:
+            return self.expression(children[0])
+        return None
+
+
+class ASTProgram(GeneratorProgram):
+    """Programa compilado a closures por ClosureCompiler, ejecutado como motor de GeneratorProgram."""
+
+    engine_name = "intérprete de AST"
+    step_unit = ENGINE_STEP_UNITS[ENGINE_AST]
+
+    def __init__(self, ast_root, annotations, symbol_table=None, source=None):
+        """
+        Args:
+            ast_root: Nodo raíz del AST anotado
+            annotations: Diccionario de anotaciones del análisis semántico
+            symbol_table: Tabla de símbolos (opcional)
+            source: Texto del programa (opcional; pc es el índice de la línea en ejecución)
+        """
+        self.compiler = ClosureCompiler(annotations, symbol_table, self._write)
+        self.function = self.compiler.compile(ast_root)
+        super().__init__(self.compiler.slots, self.compiler.var_types)
+        self.instructions = source.splitlines() if source else []
+        self.reset()
+
+    def _start(self):
+        env = self.compiler.env
+        env[:] = [0] * len(env)
+        self.compiler.state.reset()
+        return self.function()
+
+    def _live_values(self):
+        env = self.compiler.env
+        return {name: env[index] for name, index in self.compiler.slots.items()}
+
+    def _current_line(self):
+        return max(self.compiler.state.line - 1, 0)
+
+
+def compile_program(ast_root, annotations, symbol_table=None, source=None):
+    """Compila el AST anotado a un ASTProgram listo para ejecutarse."""
+    return ASTProgram(ast_root, annotations, symbol_table, source)
+
+
+def run_ast(ast_root, annotations, symbol_table=None, input_values=None,
+            max_steps=DEFAULT_MAX_STEPS, time_limit=DEFAULT_TIME_LIMIT):
+    """
+    Ejecuta el AST anotado directamente.
+
+    Returns:
+        (execution_output: str, success: bool, error: str)
+    """
+    program = compile_program(ast_root, annotations, symbol_table)
+    if input_values is not None:
+        program.set_input(input_values)
+    success, error = program.execute(max_steps, time_limit)
+    return program.get_output(), success, error
@@ -0,0 +1,215 @@
+# cfg.py
+# Grafo de flujo de control (CFG) del código intermedio TAC: bloques básicos, aristas y dominadores
+
+from phases.intermediate_code import parse_tac_instruction
+
+
+class BasicBlock:
+    """
+    Bloque básico: secuencia de instrucciones TAC que se ejecuta completa, sin saltos hacia
+    dentro (salvo a su primera instrucción) ni hacia fuera (salvo en la última).
+    """
+
+    def __init__(self, index, instructions):
+        self.index = index  # Posición del bloque en el grafo
+        self.instructions = instructions  # Lista de TACInstruction
+        self.successors = []  # Índices de los bloques sucesores
+        self.predecessors = []  # Índices de los bloques predecesores
+
+    @property
+    def label(self):
+        """Etiqueta con la que empieza el bloque (o None)."""
+        first = self.instructions[0] if self.instructions else None
+        return first.label if first is not None and first.kind == 'label' else None
+
+    @property
+    def terminator(self):
+        """Última instrucción si es un salto (goto o condicional), o None."""
+        last = self.instructions[-1] if self.instructions else None
+        return last if last is not None and last.kind in ('goto', 'if') else None
+
+    def __repr__(self):
+        return f"BasicBlock({self.index}, {len(self.instructions)} instrucciones, sucesores={self.successors})"
+
+
+class ControlFlowGraph:
+    """
+    Grafo de flujo de control de una lista de instrucciones TAC.
+
+    Un bloque empieza en la primera instrucción, en cada etiqueta y después de cada salto.
+    El bloque 0 es la entrada. La construcción recorre las instrucciones una sola vez y
+    resuelve las etiquetas con un diccionario, por lo que es lineal en el tamaño del código.
+    """
+
+    def __init__(self, instructions):
+        """
+        Construye el grafo.
+
+        Args:
+            instructions: Lista de TACInstruction o de instrucciones TAC en texto
+        """
+        instructions = [parse_tac_instruction(inst) if isinstance(inst, str) else inst
+                        for inst in instructions]
+        self.blocks = []
+        self.block_of_label = {}  # Etiqueta -> índice del bloque que empieza con ella
+        self._idom = None
+        self._dom_interval = None  # Índice -> (entrada, salida) en el recorrido del árbol de dominadores
+
+        current = []
+        for inst in instructions:
+            if inst.kind == 'label' and current:
+                self._add_block(current)
+                current = []
+            current.append(inst)
+            if inst.kind in ('goto', 'if'):
+                self._add_block(current)
+                current = []
+        if current:
+            self._add_block(current)
+
+        for block in self.blocks:
+            jump = block.terminator
+            if jump is not None and jump.label in self.block_of_label:
+                self._add_edge(block.index, self.block_of_label[jump.label])
+            if (jump is None or jump.kind != 'goto') and block.index + 1 < len(self.blocks):
+                self._add_edge(block.index, block.index + 1)
+
+    def _add_block(self, instructions):
+        block = BasicBlock(len(self.blocks), instructions)
+        if block.label is not None:
+            self.block_of_label[block.label] = block.index
+        self.blocks.append(block)
+
+    def _add_edge(self, source, target):
+        if target not in self.blocks[source].successors:
+            self.blocks[source].successors.append(target)
+            self.blocks[target].predecessors.append(source)
+
+    def __len__(self):
+        return len(self.blocks)
+
+    def instructions(self, blocks=None):
+        """Instrucciones de los bloques indicados (por defecto todos), en orden."""
+        if blocks is None:
+            blocks = self.blocks
+        return [inst for block in blocks for inst in block.instructions]
+
+    def reachable(self):
+        """Índices de los bloques alcanzables desde la entrada."""
+        if not self.blocks:
+            return set()
+        seen = {0}
+        pending = [0]
+        while pending:
+            for target in self.blocks[pending.pop()].successors:
+                if target not in seen:
+                    seen.add(target)
+                    pending.append(target)
+        return seen
+
+    def reverse_postorder(self):
+        """Bloques alcanzables en postorden inverso (cada bloque antes que sus sucesores, salvo ciclos)."""
+        if not self.blocks:
+            return []
+        order = []
+        visited = {0}
+        # Recorrido en profundidad iterativo (sin recursión para programas grandes)
+        stack = [(0, iter(self.blocks[0].successors))]
+        while stack:
+            index, children = stack[-1]
+            for child in children:
+                if child not in visited:
+                    visited.add(child)
+                    stack.append((child, iter(self.blocks[child].successors)))
+                    break
+            else:
+                stack.pop()
+                order.append(index)
+        order.reverse()
+        return order
+
+    def immediate_dominators(self):
+        """
+        Dominador inmediato de cada bloque alcanzable ({índice: índice}; la entrada se domina
+        a sí misma). Usa el algoritmo iterativo de Cooper, Harvey y Kennedy sobre el postorden
+        inverso, que converge en pocas pasadas en grafos de programas estructurados.
+        """
+        if self._idom is not None:
+            return self._idom
+        order = self.reverse_postorder()
+        position = {index: i for i, index in enumerate(order)}
+        idom = {0: 0} if order else {}
+
+        def intersect(a, b):
+            while a != b:
+                while position[a] > position[b]:
+                    a = idom[a]
+                while position[b] > position[a]:
+                    b = idom[b]
+            return a
+
+        changed = True
+        while changed:
+            changed = False
+            for index in order[1:]:
+                new_idom = None
+                for pred in self.blocks[index].predecessors:
+                    if pred in idom:
+                        new_idom = pred if new_idom is None else intersect(pred, new_idom)
+                if idom.get(index) != new_idom:
+                    idom[index] = new_idom
+                    changed = True
+        self._idom = idom
+        return idom
+
+    def dominates(self, a, b):
+        """Indica si el bloque a domina al bloque b (todo camino desde la entrada a b pasa por a)."""
+        if self._dom_interval is None:
+            self._number_dominator_tree()
+        if a not in self._dom_interval or b not in self._dom_interval:
+            return False
+        enter_a, exit_a = self._dom_interval[a]
+        enter_b, exit_b = self._dom_interval[b]
+        return enter_a <= enter_b and exit_b <= exit_a
+
+    def _number_dominator_tree(self):
+        # Numerar el árbol de dominadores en profundidad: a domina a b si el intervalo de b
+        # está contenido en el de a, así cada consulta de dominates() es O(1)
+        children = {}
+        for index, parent in self.immediate_dominators().items():
+            if index != parent:
+                children.setdefault(parent, []).append(index)
+        self._dom_interval = {}
+        if not self.blocks:
+            return
+        counter = 0
+        enter = {0: 0}
+        stack = [(0, iter(children.get(0, ())))]
+        while stack:
+            index, pending = stack[-1]
+            child = next(pending, None)
+            if child is not None:
+                counter += 1
+                enter[child] = counter
+                stack.append((child, iter(children.get(child, ()))))
+            else:
+                stack.pop()
+                counter += 1
+                self._dom_interval[index] = (enter[index], counter)
+
+    def back_edges(self):
+        """Aristas (origen, cabecera) donde la cabecera domina al origen: los saltos de regreso de los ciclos."""
+        idom = self.immediate_dominators()
+        return [(block.index, target) for block in self.blocks if block.index in idom
+                for target in block.successors if self.dominates(target, block.index)]
+
+    def natural_loop(self, source, header):
+        """Bloques del ciclo natural de la arista de regreso source -> header (incluye la cabecera)."""
+        loop = {header}
+        pending = [source]
+        while pending:
+            index = pending.pop()
+            if index not in loop:
+                loop.add(index)
+                pending.extend(self.blocks[index].predecessors)
+        return loop
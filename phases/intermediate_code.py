@@ -2,6 +2,9 @@
 # Generación de Código Intermedio (TAC - Three Address Code) - Fase 4 del Compilador
 
 import os
+import re
+import time
+from abc import ABC, abstractmethod
 from util.treeNode import ASTNode
 from util.symbol_table import SymbolTable
 
@@ -12,19 +15,28 @@ class TACGenerator:
     Recorre el AST anotado semánticamente y genera instrucciones TAC.
     """
     
-    def __init__(self, annotations, symbol_table):
+    def __init__(self, annotations, symbol_table, reuse_temps=True, optimization_level=None,
+                 peephole_rules=None):
         """
         Inicializa el generador TAC.
         
         Args:
             annotations: Diccionario de anotaciones del análisis semántico {id_nodo: {'type': ..., 'value': ...}}
             symbol_table: Tabla de símbolos con información de variables
+            reuse_temps: Si es True, al terminar se reutilizan los temporales que ya no están vivos
+            optimization_level: Nivel de phases.optimization (None = nivel por defecto, 0 = sin optimizar)
+            peephole_rules: Reglas de phases.peephole que se aplican en el nivel 2 (None = por defecto)
         """
         self.annotations = annotations
         self.symbol_table = symbol_table
+        self.reuse_temps = reuse_temps
+        self.optimization_level = optimization_level
+        self.peephole_rules = peephole_rules
+        self.optimization_report = None  # OptimizationReport de la última generación
         self.temp_counter = 0  # Contador para temporales: t0, t1, t2, ...
         self.label_counter = 0  # Contador para etiquetas: L0, L1, L2, ...
         self.instructions = []  # Lista de instrucciones TAC
+        self.var_types = {}  # Tipo ('int', 'float', 'bool') de variables y temporales
         
     def get_node_id(self, node):
         """Obtiene el ID único de un nodo."""
@@ -35,12 +47,36 @@ class TACGenerator:
         node_id = self.get_node_id(node)
         return self.annotations.get(node_id, {})
     
-    def new_temp(self):
-        """Genera un nuevo temporal y retorna su nombre."""
+    def new_temp(self, tipo=None):
+        """Genera un nuevo temporal y retorna su nombre (registrando su tipo si se conoce)."""
         temp_name = f"t{self.temp_counter}"
         self.temp_counter += 1
+        if tipo:
+            self.var_types[temp_name] = tipo
         return temp_name
     
+    def operand_type(self, operand):
+        """Tipo de un operando TAC: el del literal o el registrado para la variable o temporal."""
+        if is_literal_operand(operand):
+            value = parse_literal(operand)
+            return 'bool' if isinstance(value, bool) else 'int' if isinstance(value, int) else 'float'
+        return self.var_types.get(operand)
+    
+    def arithmetic_type(self, operator, left, right, tipo=None):
+        """
+        Tipo del resultado de left operator right en la máquina virtual: '/' siempre es real
+        (aunque el análisis semántico anote int / int como 'int') y un operando real hace real
+        el resultado. Si no se conocen los tipos de los operandos se usa tipo (la anotación).
+        """
+        if operator == '/':
+            return 'float'
+        types = {self.operand_type(left), self.operand_type(right)}
+        if 'float' in types:
+            return 'float'
+        if types == {'int'}:
+            return 'int'
+        return tipo
+    
     def new_label(self):
         """Genera una nueva etiqueta y retorna su nombre."""
         label_name = f"L{self.label_counter}"
@@ -75,6 +111,7 @@ class TACGenerator:
         self.instructions = []  # Reiniciar instrucciones
         self.temp_counter = 0
         self.label_counter = 0
+        self.var_types = self.collect_variable_types()
         
         if ast_root is None:
             return []
@@ -91,8 +128,28 @@ class TACGenerator:
                     if lexema not in ('main', '{', '}', 'Programa'):
                         self.process_statement(child)
         
+        if self.optimization_level != 0:
+            from phases import optimization
+            level = self.optimization_level
+            if level is None:
+                level = optimization.DEFAULT_OPTIMIZATION_LEVEL
+            self.instructions, self.optimization_report = optimization.optimize_tac(
+                self.instructions, level, self.var_types, self.peephole_rules)
+        
+        if self.reuse_temps:
+            self.reuse_temporaries()
+        
         return self.instructions
     
+    def collect_variable_types(self):
+        """Obtiene el tipo declarado de cada variable a partir de la tabla de símbolos."""
+        var_types = {}
+        for entry in self.symbol_table or []:
+            if isinstance(entry, dict) and entry.get('nombre') and entry.get('tipo'):
+                # Si el nombre se declaró en varios ámbitos se conserva el primero
+                var_types.setdefault(entry['nombre'], entry['tipo'])
+        return var_types
+    
     def process_statement_list(self, node):
         """Procesa una lista de sentencias (bloque)."""
         if node is None:
@@ -196,14 +253,9 @@ class TACGenerator:
         node_type = annotation.get('type')
         node_value = annotation.get('value')
         
-        # Literal numérico o booleano
+        # Literal numérico o booleano: se usa directamente como operando inmediato
         if self.is_literal(node):
-            literal_value = self.get_literal_value(node)
-            # Si es un valor constante, podemos optimizar y retornarlo directamente
-            # o crear una instrucción de asignación
-            temp = self.new_temp()
-            self.add_instruction(f"{temp} = {literal_value}")
-            return temp
+            return str(self.get_literal_value(node))
         
         # Identificador (variable)
         if self.is_identifier(node):
@@ -279,9 +331,9 @@ class TACGenerator:
             else:
                 return int(lexema)
         except ValueError:
-            if lexema in ('true', 'false'):
-                return lexema == 'true'
+            pass
         
+        # Booleanos ('true'/'false') y cualquier otro literal se usan tal cual
         return lexema
     
     def format_value(self, value, value_type):
@@ -339,7 +391,8 @@ class TACGenerator:
         if left_result is None or right_result is None:
             return None
         
-        result_temp = self.new_temp()
+        tipo = self.arithmetic_type(operator, left_result, right_result, self.get_node_annotation(node).get('type'))
+        result_temp = self.new_temp(tipo)
         self.add_instruction(f"{result_temp} = {left_result} {operator} {right_result}")
         return result_temp
     
@@ -357,29 +410,40 @@ class TACGenerator:
         if left_result is None or right_result is None:
             return None
         
-        result_temp = self.new_temp()
+        result_temp = self.new_temp('bool')
         # Generar instrucción que evalúe a 'true' o 'false'
         self.add_instruction(f"{result_temp} = {left_result} {operator} {right_result}")
         return result_temp
     
     def process_logical_op(self, node, operator):
-        """Procesa una operación lógica (retorna un temporal booleano con 'true' o 'false')."""
+        """
+        Procesa una operación lógica con cortocircuito (retorna un temporal booleano).
+        
+        La expresión se traduce como condición con saltos, de modo que el operando derecho
+        no se evalúa si el izquierdo ya decide el resultado:
+            ifFalse a goto Lf      (a && b)
+            ifFalse b goto Lf
+            t = true
+            goto Lfin
+            Lf:
+            t = false
+            Lfin:
+        El temporal se define en ambos caminos.
+        """
         if not hasattr(node, 'children') or len(node.children) < 2:
             return None
         
-        left_node = node.children[0]
-        right_node = node.children[1]
-        
-        left_result = self.process_expression(left_node)
-        right_result = self.process_expression(right_node)
-        
-        if left_result is None or right_result is None:
+        false_label = self.new_label()
+        end_label = self.new_label()
+        if not self.process_conditional_jump(node, false_label):
             return None
         
-        result_temp = self.new_temp()
-        # Convertir operadores lógicos
-        tac_op = "&&" if operator == "&&" else "||"
-        self.add_instruction(f"{result_temp} = {left_result} {tac_op} {right_result}")
+        result_temp = self.new_temp('bool')
+        self.add_instruction(f"{result_temp} = true")
+        self.add_instruction(f"goto {end_label}")
+        self.add_instruction(f"{false_label}:")
+        self.add_instruction(f"{result_temp} = false")
+        self.add_instruction(f"{end_label}:")
         return result_temp
     
     def process_negation(self, node):
@@ -393,10 +457,62 @@ class TACGenerator:
         if expr_result is None:
             return None
         
-        result_temp = self.new_temp()
+        result_temp = self.new_temp('bool')
         self.add_instruction(f"{result_temp} = ! {expr_result}")
         return result_temp
     
+    def process_conditional_jump(self, node, label, jump_if=False):
+        """
+        Genera el salto de una condición sin guardar la comparación en un temporal.
+        
+        Una comparación produce directamente "ifFalse a < b goto L" (o "if a < b goto L" si
+        jump_if es True). && y || se evalúan en cortocircuito: cada operando salta por
+        separado y el derecho solo se evalúa si el izquierdo no decide el resultado; ! invierte
+        el sentido del salto. Cualquier otra condición se evalúa y se salta con
+        "ifFalse t goto L" o "if t goto L".
+        
+        Returns:
+            bool: True si se generó el salto
+        """
+        node_name = node.name if hasattr(node, 'name') else str(node)
+        lexema = self.extract_lexema(node_name)
+        keyword = "if" if jump_if else "ifFalse"
+        children = node.children if hasattr(node, 'children') else []
+        
+        if lexema in LOGICAL_OPERATORS and len(children) >= 2:
+            left_node, right_node = children[0], children[1]
+            # a && b salta si falla a; a || b salta si se cumple a
+            decides = lexema == "||"
+            if jump_if == decides:
+                # El operando izquierdo basta para saltar a la etiqueta
+                return (self.process_conditional_jump(left_node, label, jump_if)
+                        and self.process_conditional_jump(right_node, label, jump_if))
+            # El operando izquierdo decide no saltar: continuar después de la condición
+            skip_label = self.new_label()
+            if not self.process_conditional_jump(left_node, skip_label, decides):
+                return False
+            if not self.process_conditional_jump(right_node, label, jump_if):
+                return False
+            self.add_instruction(f"{skip_label}:")
+            return True
+        
+        if lexema == "!" and len(children) >= 1 and not self.is_literal(node):
+            return self.process_conditional_jump(children[0], label, not jump_if)
+        
+        if lexema in RELATIONAL_OPERATORS and len(children) >= 2:
+            left_result = self.process_expression(node.children[0])
+            right_result = self.process_expression(node.children[1])
+            if left_result is None or right_result is None:
+                return False
+            self.add_instruction(f"{keyword} {left_result} {lexema} {right_result} goto {label}")
+            return True
+        
+        cond_result = self.process_expression(node)
+        if cond_result is None:
+            return False
+        self.add_instruction(f"{keyword} {cond_result} goto {label}")
+        return True
+    
     def process_assignment(self, node):
         """Procesa una asignación simple: var = expr"""
         if not hasattr(node, 'children') or len(node.children) < 2:
@@ -432,7 +548,7 @@ class TACGenerator:
         
         if expr_result is not None:
             # Generar: var = var op expr
-            temp = self.new_temp()
+            temp = self.new_temp(self.arithmetic_type(base_op, var_name, expr_result, self.var_types.get(var_name)))
             self.add_instruction(f"{temp} = {var_name} {base_op} {expr_result}")
             self.add_instruction(f"{var_name} = {temp}")
     
@@ -464,19 +580,13 @@ class TACGenerator:
         # Procesar condición
         if hasattr(cond_node, 'children') and cond_node.children:
             cond_expr = cond_node.children[0]
-            cond_result = self.process_expression(cond_expr)
             
-            if cond_result is not None:
-                # Generar etiquetas
-                else_label = self.new_label() if else_node else None
-                end_label = self.new_label()
-                
-                # Saltar al else si la condición es falsa
-                if else_node:
-                    self.add_instruction(f"if {cond_result} == false goto {else_label}")
-                else:
-                    self.add_instruction(f"if {cond_result} == false goto {end_label}")
-                
+            # Generar etiquetas
+            else_label = self.new_label() if else_node else None
+            end_label = self.new_label()
+            
+            # Saltar al else (o al final) si la condición es falsa
+            if self.process_conditional_jump(cond_expr, else_label or end_label):
                 # Código del then
                 if hasattr(then_node, 'children') and then_node.children:
                     for stmt in then_node.children:
@@ -525,11 +635,8 @@ class TACGenerator:
         # Evaluar condición
         if hasattr(cond_node, 'children') and cond_node.children:
             cond_expr = cond_node.children[0]
-            cond_result = self.process_expression(cond_expr)
-            
-            if cond_result is not None:
-                # Saltar al final si la condición es falsa
-                self.add_instruction(f"if {cond_result} == false goto {end_label}")
+            # Saltar al final si la condición es falsa
+            self.process_conditional_jump(cond_expr, end_label)
         
         # Código del cuerpo
         if hasattr(body_node, 'children') and body_node.children:
@@ -578,11 +685,8 @@ class TACGenerator:
         # Evaluar condición (until: repetir mientras condición sea falsa)
         if hasattr(cond_node, 'children') and cond_node.children:
             cond_expr = cond_node.children[0]
-            cond_result = self.process_expression(cond_expr)
-            
-            if cond_result is not None:
-                # Si la condición es verdadera, salir del ciclo
-                self.add_instruction(f"if {cond_result} == true goto {end_label}")
+            # Si la condición es verdadera, salir del ciclo
+            self.process_conditional_jump(cond_expr, end_label, jump_if=True)
         
         # Volver al inicio si la condición es falsa
         self.add_instruction(f"goto {loop_label}")
@@ -613,6 +717,78 @@ class TACGenerator:
         if expr_result is not None:
             self.add_instruction(f"write {expr_result}")
     
+    def reuse_temporaries(self):
+        """
+        Reasigna los temporales de self.instructions reutilizando los que ya no están vivos.
+        
+        Cada temporal vive desde su primera aparición hasta su último uso en orden lineal; si
+        está vivo al entrar a un ciclo (salto hacia atrás), su vida se extiende hasta el salto.
+        Los temporales se asignan por tipo, de modo que var_types sigue siendo válido.
+        
+        Returns:
+            Número de temporales distintos después de la reasignación
+        """
+        instructions = [parse_tac_instruction(inst) for inst in self.instructions]
+        
+        # Intervalos de vida en orden lineal
+        start = {}
+        end = {}
+        for index, inst in enumerate(instructions):
+            for name in inst.args:
+                if is_temporary(name):
+                    # Un uso antes de cualquier definición: vivo desde el inicio
+                    start.setdefault(name, 0)
+                    end[name] = index
+            if is_temporary(inst.dest):
+                start.setdefault(inst.dest, index)
+                end[inst.dest] = index
+        
+        # Extender los intervalos que cruzan un salto hacia atrás (ciclos)
+        labels = {inst.label: i for i, inst in enumerate(instructions) if inst.kind == 'label'}
+        back_edges = [(labels[inst.label], i) for i, inst in enumerate(instructions)
+                      if inst.kind in ('goto', 'if') and labels.get(inst.label, i) < i]
+        changed = True
+        while changed:
+            changed = False
+            for header, latch in back_edges:
+                for name in start:
+                    if start[name] < header <= end[name] < latch:
+                        end[name] = latch
+                        changed = True
+        
+        # Asignación lineal: un temporal se libera después de su último uso
+        mapping = {}
+        free = {}  # tipo -> nombres libres
+        active = []  # (fin, nombre nuevo, tipo)
+        new_types = {}
+        for name in sorted(start, key=lambda n: (start[n], end[n])):
+            tipo = self.var_types.get(name)
+            still_active = []
+            for interval_end, new_name, new_type in active:
+                if interval_end <= start[name]:
+                    free.setdefault(new_type, []).append(new_name)
+                else:
+                    still_active.append((interval_end, new_name, new_type))
+            active = still_active
+            
+            if free.get(tipo):
+                new_name = free[tipo].pop()
+            else:
+                new_name = f"t{len(new_types)}"
+                new_types[new_name] = tipo
+            mapping[name] = new_name
+            active.append((end[name], new_name, tipo))
+        
+        for inst in instructions:
+            inst.args = [mapping.get(arg, arg) for arg in inst.args]
+            inst.dest = mapping.get(inst.dest, inst.dest)
+        self.instructions = [str(inst) for inst in instructions]
+        
+        # Actualizar los tipos: los temporales anteriores se sustituyen por los nuevos
+        self.var_types = {name: tipo for name, tipo in self.var_types.items() if not is_temporary(name)}
+        self.var_types.update({name: tipo for name, tipo in new_types.items() if tipo})
+        return len(new_types)
+    
     def save_to_file(self, filename="codigo_intermedio.tac"):
         """Guarda las instrucciones TAC en un archivo."""
         try:
@@ -625,39 +801,507 @@ class TACGenerator:
             return False
 
 
-class TACInterpreter:
+# Operadores reconocidos en las instrucciones TAC
+ARITHMETIC_OPERATORS = ("+", "-", "*", "/", "%")
+RELATIONAL_OPERATORS = ("==", "!=", "<=", ">=", "<", ">")
+LOGICAL_OPERATORS = ("&&", "||")
+
+
+class TACInstruction:
     """
-    Intérprete (máquina virtual) para ejecutar código TAC.
+    Instrucción TAC separada en sus partes.
+
+    kind: 'label', 'goto', 'if', 'assign', 'read', 'write' o 'unknown'
+    dest: Variable destino (assign, read)
+    op: Operador ('+', '<', '&&', '!', ...) o None en copias y condiciones simples
+    args: Operandos (nombres de variables/temporales o literales)
+    label: Etiqueta (label, goto, if)
+    negated: En saltos condicionales, True si se salta cuando la condición es falsa (ifFalse)
     """
-    
+
+    def __init__(self, kind, dest=None, op=None, args=(), label=None, text="", negated=False):
+        self.kind = kind
+        self.dest = dest
+        self.op = op
+        self.args = list(args)
+        self.label = label
+        self.text = text  # Texto original (para instrucciones desconocidas)
+        self.negated = negated
+
+    def __str__(self):
+        if self.kind == 'label':
+            return f"{self.label}:"
+        if self.kind == 'goto':
+            return f"goto {self.label}"
+        if self.kind == 'if':
+            keyword = "ifFalse" if self.negated else "if"
+            if self.op is None:
+                return f"{keyword} {self.args[0]} goto {self.label}"
+            return f"{keyword} {self.args[0]} {self.op} {self.args[1]} goto {self.label}"
+        if self.kind == 'assign':
+            if self.op is None:
+                return f"{self.dest} = {self.args[0]}"
+            if self.op == '!':
+                return f"{self.dest} = ! {self.args[0]}"
+            return f"{self.dest} = {self.args[0]} {self.op} {self.args[1]}"
+        if self.kind == 'read':
+            return f"read {self.dest}"
+        if self.kind == 'write':
+            return f"write {self.args[0]}"
+        return self.text
+
+    def __repr__(self):
+        return f"TACInstruction({self})"
+
+
+def parse_tac_instruction(instruction):
+    """
+    Separa una instrucción TAC en sus partes.
+
+    Formatos soportados:
+        L0:                      etiqueta
+        goto L0                  salto incondicional
+        if x goto L0             salto si x es verdadero
+        if a op b goto L0        salto condicional (op relacional)
+        ifFalse x goto L0        salto si x es falso
+        ifFalse a op b goto L0   salto si la comparación es falsa
+        x = a                    copia
+        x = ! a                  negación lógica
+        x = a op b               operación binaria
+        read x / write a         entrada y salida
+
+    Returns:
+        TACInstruction
+
+    Raises:
+        ValueError: si la instrucción tiene una forma conocida pero está mal formada
+    """
+    instruction = instruction.strip()
+
+    if instruction.endswith(':'):
+        return TACInstruction('label', label=instruction[:-1].strip())
+
+    if " = " in instruction:
+        dest, expr = instruction.split(" = ", 1)
+        parts = expr.split()
+        if len(parts) == 1:
+            return TACInstruction('assign', dest=dest.strip(), args=parts)
+        if len(parts) == 2 and parts[0] == '!':
+            return TACInstruction('assign', dest=dest.strip(), op='!', args=parts[1:])
+        if len(parts) == 3 and parts[1] in ARITHMETIC_OPERATORS + RELATIONAL_OPERATORS + LOGICAL_OPERATORS:
+            return TACInstruction('assign', dest=dest.strip(), op=parts[1], args=(parts[0], parts[2]))
+        raise ValueError(f"Expresión TAC no soportada: '{expr.strip()}'")
+
+    if instruction.startswith("if ") or instruction.startswith("ifFalse "):
+        if " goto " not in instruction:
+            raise ValueError("Formato de salto condicional inválido")
+        negated = instruction.startswith("ifFalse ")
+        condition, label = instruction[8 if negated else 3:].split(" goto ", 1)
+        parts = condition.split()
+        if len(parts) == 1:
+            return TACInstruction('if', args=parts, label=label.strip(), negated=negated)
+        if len(parts) == 3 and parts[1] in RELATIONAL_OPERATORS:
+            return TACInstruction('if', op=parts[1], args=(parts[0], parts[2]), label=label.strip(),
+                                  negated=negated)
+        raise ValueError(f"Condición TAC no soportada: '{condition.strip()}'")
+
+    if instruction.startswith("goto "):
+        return TACInstruction('goto', label=instruction[5:].strip())
+
+    if instruction.startswith("read "):
+        return TACInstruction('read', dest=instruction[5:].strip())
+
+    if instruction.startswith("write "):
+        parts = instruction[6:].split()
+        if len(parts) != 1:
+            raise ValueError(f"Expresión TAC no soportada: '{instruction[6:].strip()}'")
+        return TACInstruction('write', args=parts)
+
+    return TACInstruction('unknown', text=instruction)
+
+
+def is_temporary(name):
+    """Verifica si un nombre es un temporal generado por TACGenerator (t0, t1, ...)."""
+    return bool(name) and re.fullmatch(r"t\d+", name) is not None
+
+
+def is_literal_operand(operand):
+    """Verifica si un operando TAC es un literal (número o booleano)."""
+    return operand in ('true', 'false') or operand[:1] in "0123456789-."
+
+
+def parse_literal(operand):
+    """Convierte un literal TAC a su valor (int, float o bool)."""
+    if operand in ('true', 'false'):
+        return operand == 'true'
+    try:
+        return int(operand)
+    except ValueError:
+        return float(operand)
+
+
+def format_tac_value(value):
+    """Convierte un valor de la máquina virtual a texto ('true'/'false' para booleanos)."""
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    return str(value)
+
+
+def evaluate_operation(op, x, y=None):
+    """
+    Evalúa una operación TAC sobre valores nativos con la misma semántica que la máquina
+    virtual (división o módulo entre cero dan 0; relacionales y lógicos dan bool).
+    """
+    if op == '+':
+        return x + y
+    if op == '-':
+        return x - y
+    if op == '*':
+        return x * y
+    if op == '/':
+        return x / y if y != 0 else 0
+    if op == '%':
+        return x % y if y != 0 else 0
+    if op == '<':
+        return x < y
+    if op == '>':
+        return x > y
+    if op == '<=':
+        return x <= y
+    if op == '>=':
+        return x >= y
+    if op == '==':
+        return x == y
+    if op == '!=':
+        return x != y
+    if op == '&&':
+        return bool(x) and bool(y)
+    if op == '||':
+        return bool(x) or bool(y)
+    if op == '!':
+        return not x
+    raise ValueError(f"Operador TAC no soportado: '{op}'")
+
+
+def convert_input_value(value, var_type=None):
+    """
+    Convierte un valor de entrada (cin) al tipo de la variable destino.
+
+    Args:
+        value: Valor leído (texto o número)
+        var_type: 'int', 'float', 'bool' o None si se desconoce el tipo
+
+    Raises:
+        ValueError: si el valor no se puede convertir al tipo de la variable
+    """
+    text = value.strip() if isinstance(value, str) else value
+    if var_type == 'bool':
+        if text in ('true', 'false'):
+            return text == 'true'
+        return float(text) != 0
+    if text in ('true', 'false'):
+        text = text == 'true'
+    if var_type == 'int':
+        try:
+            return int(text)
+        except ValueError:
+            # Como cin >> int: se descarta la parte decimal
+            return int(float(text))
+    if var_type == 'float':
+        return float(text)
+    if isinstance(text, str):
+        if '.' in text or 'e' in text.lower():
+            return float(text)
+        return int(text)
+    return text
+
+
+# Códigos de operación de la máquina virtual.
+# Cada instrucción decodificada es una tupla (opcode, destino, operando_a, operando_b) donde los
+# operandos son índices de registro; en los saltos el destino es el índice de la instrucción
+# a ejecutar a continuación.
+OP_NOP = 0
+OP_COPY = 1
+OP_ADD = 2
+OP_SUB = 3
+OP_MUL = 4
+OP_DIV = 5
+OP_MOD = 6
+OP_LT = 7
+OP_GT = 8
+OP_LE = 9
+OP_GE = 10
+OP_EQ = 11
+OP_NE = 12
+OP_AND = 13
+OP_OR = 14
+OP_NOT = 15
+OP_GOTO = 16
+OP_IF_TRUE = 17
+OP_IF_FALSE = 18
+OP_IF_LT = 19
+OP_IF_GT = 20
+OP_IF_LE = 21
+OP_IF_GE = 22
+OP_IF_EQ = 23
+OP_IF_NE = 24
+OP_READ = 25
+OP_WRITE = 26
+OP_INVALID = 27
+
+_BINARY_OPCODES = {
+    "+": OP_ADD, "-": OP_SUB, "*": OP_MUL, "/": OP_DIV, "%": OP_MOD,
+    "<": OP_LT, ">": OP_GT, "<=": OP_LE, ">=": OP_GE, "==": OP_EQ, "!=": OP_NE,
+    "&&": OP_AND, "||": OP_OR,
+}
+
+_BRANCH_OPCODES = {
+    "<": OP_IF_LT, ">": OP_IF_GT, "<=": OP_IF_LE, ">=": OP_IF_GE, "==": OP_IF_EQ, "!=": OP_IF_NE,
+}
+
+# Comparación contraria de cada operador relacional (para ifFalse)
+_NEGATED_RELATIONAL = {"<": ">=", ">": "<=", "<=": ">", ">=": "<", "==": "!=", "!=": "=="}
+
+# Motores de ejecución
+ENGINE_TAC = "tac"        # Máquina virtual TAC (TACInterpreter)
+ENGINE_PYTHON = "python"  # AST traducido a una función Python (phases.python_backend)
+ENGINE_AST = "ast"        # AST compilado a closures (phases.ast_interpreter)
+ENGINES = (ENGINE_TAC, ENGINE_PYTHON, ENGINE_AST)
+
+# Qué cuenta cada motor como un paso (unidad de max_steps y steps)
+ENGINE_STEP_UNITS = {
+    ENGINE_TAC: "instrucciones TAC",
+    ENGINE_PYTHON: "iteraciones de ciclos",
+    ENGINE_AST: "iteraciones de ciclos",
+}
+
+# Estados que retorna ExecutionEngine.run()
+STATUS_FINISHED = "FINISHED"      # Se ejecutó la última instrucción
+STATUS_PAUSED = "PAUSE"           # Se necesita un valor de entrada (read)
+STATUS_ERROR = "ERROR"            # Error de ejecución (ver ExecutionEngine.error)
+STATUS_STEP_LIMIT = "STEP_LIMIT"  # Se agotó el número máximo de pasos
+STATUS_TIME_LIMIT = "TIME_LIMIT"  # El watchdog detuvo la ejecución por tiempo
+STATUS_STOPPED = "STOPPED"        # Se pidió detener la ejecución (request_stop)
+
+# Límites de ejecución por defecto: sin límite de pasos y un watchdog de tiempo real
+DEFAULT_MAX_STEPS = None  # None = sin límite de pasos
+DEFAULT_TIME_LIMIT = 10.0  # Segundos de ejecución continua (None = sin límite)
+WATCHDOG_INTERVAL = 20000  # Cada cuántas instrucciones se revisan reloj, detención y progreso
+
+
+class ExecutionEngine(ABC):
+    """
+    Interfaz común de los motores de ejecución: TACInterpreter y, en phases.python_backend,
+    GeneratorProgram (PythonProgram y ASTProgram). El IDE y generate_and_run_intermediate_code
+    solo usan esta interfaz, así que pueden ejecutar el programa con cualquier motor.
+    Cada motor cuenta los pasos en su propia unidad (step_unit, ver ENGINE_STEP_UNITS).
+
+    Aquí está lo que comparten (entrada, salida, detención, execute() y mensajes); cada motor
+    implementa la ejecución y el acceso a sus variables.
+    """
+
+    step_unit = "pasos"  # Qué cuenta el motor como un paso (para limit_message)
+
     def __init__(self):
-        """Inicializa el intérprete TAC."""
-        self.memory = {}  # Almacén de variables y temporales
-        self.instructions = []  # Lista de instrucciones TAC
-        self.pc = 0  # Program counter (índice de instrucción actual)
-        self.labels = {}  # Mapeo de etiquetas a índices de instrucción
+        self.instructions = []  # Texto del programa que muestra el IDE (pc es el índice de la línea actual)
+        self.var_types = {}  # Tipo de cada variable ('int', 'float', 'bool'), para convertir las entradas de cin
+        self.pc = 0
         self.output = []  # Salida del programa (para cout)
         self.input_queue = []  # Cola de entrada (para cin)
         self.running = False
         self.error = None
+        self.steps = 0  # Pasos ejecutados desde el último reset
+        self.elapsed = 0.0  # Segundos de ejecución desde el último reset (sin contar pausas)
         self.output_callback = None  # Callback para salida
         self.input_callback = None  # Callback para solicitud de entrada
+        self.progress_callback = None  # Callback periódico durante run() (en cada punto de revisión)
+        self.stop_requested = False  # Puesto en True por request_stop() (puede llamarse desde otro hilo)
+
+    @property
+    @abstractmethod
+    def memory(self):
+        """Variables del programa con su valor actual."""
+
+    @abstractmethod
+    def diff_memory(self, previous):
+        """
+        Retorna {nombre: valor} de las variables que cambiaron respecto a previous (el resultado
+        acumulado de consultas anteriores) y actualiza previous.
+        """
+
+    @abstractmethod
+    def get_value(self, identifier):
+        """Valor actual de una variable (0 si no existe o no se ha asignado)."""
+
+    @abstractmethod
+    def reset(self):
+        """Reinicia el programa (valores, salida, entrada, estado y contadores)."""
+
+    @abstractmethod
+    def pending_input_variable(self):
+        """Variable que espera un valor de entrada (o None si no hay un cin pendiente)."""
+
+    @abstractmethod
+    def provide_input(self, value):
+        """
+        Entrega un valor de entrada al cin pendiente; si no hay uno, lo agrega a la cola de entrada.
+        Retorna la variable que recibió el valor (o None si se encoló).
+        """
+
+    @abstractmethod
+    def stats_summary(self):
+        """Resumen de la ejecución: pasos, tiempo y velocidad."""
+
+    @abstractmethod
+    def run(self, max_steps=None, time_limit=None):
+        """
+        Ejecuta el programa desde donde quedó hasta terminar, necesitar un valor de entrada,
+        encontrar un error, ejecutar max_steps pasos o superar time_limit segundos.
+
+        Returns:
+            Uno de STATUS_FINISHED, STATUS_PAUSED, STATUS_ERROR, STATUS_STEP_LIMIT,
+            STATUS_TIME_LIMIT o STATUS_STOPPED
+        """
+
+    def set_input(self, values):
+        """Establece valores de entrada para cin."""
+        self.input_queue = list(values)
+
+    def get_output(self):
+        """Retorna la salida acumulada del programa."""
+        return "\n".join(str(v) for v in self.output)
+
+    def request_stop(self):
+        """Pide detener la ejecución; run() termina con STATUS_STOPPED en el siguiente punto de revisión."""
+        self.stop_requested = True
+
+    def _convert_input(self, var, value):
+        """Convierte un valor de entrada al tipo de la variable que lo recibe."""
+        try:
+            return convert_input_value(value, self.var_types.get(var))
+        except ValueError:
+            tipo = self.var_types.get(var)
+            raise ValueError(f"Entrada inválida para '{var}'" + (f" ({tipo})" if tipo else "") + f": '{value}'")
+
+    def execute(self, max_steps=DEFAULT_MAX_STEPS, time_limit=DEFAULT_TIME_LIMIT):
+        """
+        Ejecuta el programa desde el inicio.
+
+        Args:
+            max_steps: Número máximo de pasos (step_unit) a ejecutar (None = sin límite)
+            time_limit: Segundos máximos de ejecución antes de detener un ciclo infinito (None = sin límite)
+
+        Returns:
+            (success: bool, error_message: str)
+        """
+        # Conservar los valores de entrada establecidos con set_input()
+        pending_input = self.input_queue
+        self.reset()
+        self.input_queue = pending_input
+
+        status = self.run(max_steps, time_limit)
+        if status == STATUS_FINISHED:
+            return True, None
+        if status == STATUS_PAUSED:
+            self.error = f"No hay valores de entrada para '{self.pending_input_variable()}'"
+        elif status in (STATUS_STEP_LIMIT, STATUS_TIME_LIMIT):
+            self.error = self.limit_message(status, max_steps, time_limit)
+        return False, self.error
+
+    def limit_message(self, status, max_steps, time_limit):
+        """Mensaje para una ejecución detenida por el límite de pasos o por el watchdog de tiempo."""
+        if status == STATUS_STEP_LIMIT:
+            return f"Límite de {self.step_unit} alcanzado ({max_steps}). Posible ciclo infinito."
+        return (f"Tiempo límite alcanzado ({time_limit} s, {self.steps} {self.step_unit}, "
+                f"{self.steps_per_second():.0f} por segundo). Posible ciclo infinito.")
+
+    def steps_per_second(self):
+        """Velocidad de ejecución (pasos por segundo) desde el último reset."""
+        return self.steps / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class TACInterpreter(ExecutionEngine):
+    """
+    Intérprete (máquina virtual) para ejecutar código TAC.
+
+    Las instrucciones se decodifican una sola vez al cargarlas: cada una se convierte en una
+    tupla (opcode, destino, operando_a, operando_b) con los saltos ya resueltos a índices, y
+    run() las ejecuta con un ciclo de despacho.
+
+    Variables, temporales y literales se resuelven a registros (índices de una lista
+    preasignada): primero las variables y temporales, después un registro por cada literal
+    distinto con su valor ya convertido.
+
+    Los registros guardan valores nativos (int, float o bool). Los tipos de variables y
+    temporales (var_types, generados por TACGenerator a partir del análisis semántico) se
+    usan para convertir las entradas de cin; write muestra los booleanos como 'true'/'false'.
+    """
     
-    def load_from_file(self, filename="codigo_intermedio.tac"):
+    step_unit = ENGINE_STEP_UNITS[ENGINE_TAC]
+    
+    def __init__(self):
+        """Inicializa el intérprete TAC (instructions son las instrucciones TAC y pc su índice)."""
+        super().__init__()
+        self.code = []  # Instrucciones decodificadas (opcode, destino, a, b)
+        self.names = []  # Variables y temporales del programa, en orden de aparición
+        self.slots = {}  # Nombre o literal -> índice de registro
+        self.constants = []  # (registro, valor) de cada literal del programa
+        self.registers = []  # Banco de registros: variables, temporales y literales
+        self.labels = {}  # Mapeo de etiquetas a índices de instrucción
+    
+    @property
+    def memory(self):
+        """Variables y temporales con su valor actual (sin los literales)."""
+        registers = self.registers
+        slots = self.slots
+        return {name: registers[slots[name]] for name in self.names}
+    
+    def diff_memory(self, previous):
+        """
+        Retorna {nombre: valor} de las variables y temporales que cambiaron respecto a previous
+        (el resultado acumulado de consultas anteriores) y actualiza previous.
+        Permite a una vista refrescar solo las entradas modificadas.
+        """
+        registers = self.registers
+        slots = self.slots
+        changes = {}
+        for name in self.names:
+            value = registers[slots[name]]
+            if name not in previous:
+                changes[name] = value
+                continue
+            old = previous[name]
+            # Comparar también el tipo: 1 y True son iguales para Python
+            if old != value or old.__class__ is not value.__class__:
+                changes[name] = value
+        previous.update(changes)
+        return changes
+    
+    def load_from_file(self, filename="codigo_intermedio.tac", var_types=None):
         """Carga instrucciones TAC desde un archivo."""
         try:
             with open(filename, "r", encoding="utf-8") as f:
                 self.instructions = [line.strip() for line in f if line.strip()]
-            self._build_label_map()
+            self.var_types = dict(var_types or {})
+            self._decode()
             return True
         except Exception as e:
             self.error = f"Error cargando archivo TAC: {e}"
             return False
     
-    def load_from_list(self, instructions):
-        """Carga instrucciones TAC desde una lista."""
+    def load_from_list(self, instructions, var_types=None):
+        """
+        Carga instrucciones TAC desde una lista.
+        
+        Args:
+            instructions: Instrucciones TAC (texto)
+            var_types: Tipos de variables y temporales (TACGenerator.var_types), opcional
+        """
         self.instructions = [inst.strip() for inst in instructions if inst.strip()]
-        self._build_label_map()
+        self.var_types = dict(var_types or {})
+        self._decode()
     
     def _build_label_map(self):
         """Construye el mapeo de etiquetas a índices de instrucción."""
@@ -667,409 +1311,298 @@ class TACInterpreter:
                 label = instruction[:-1].strip()
                 self.labels[label] = i
     
-    def set_input(self, values):
-        """Establece valores de entrada para cin."""
-        self.input_queue = list(values)
+    def _decode(self):
+        """Decodifica las instrucciones TAC en el arreglo de instrucciones de la máquina virtual."""
+        self._build_label_map()
+        self.code = []
+        self.names = []
+        self.slots = {}
+        literals = {}
+        
+        def operand(text):
+            if is_literal_operand(text):
+                if text not in literals:
+                    literals[text] = parse_literal(text)
+                return text
+            if text not in self.slots:
+                self.slots[text] = len(self.names)
+                self.names.append(text)
+            return self.slots[text]
+        
+        def target(label):
+            if label not in self.labels:
+                raise ValueError(f"Etiqueta '{label}' no encontrada")
+            # Continuar en la instrucción siguiente a la etiqueta
+            return self.labels[label] + 1
+        
+        for instruction in self.instructions:
+            try:
+                inst = parse_tac_instruction(instruction)
+                kind = inst.kind
+                if kind == 'assign':
+                    dest = operand(inst.dest)
+                    args = [operand(arg) for arg in inst.args]
+                    if inst.op is None:
+                        decoded = (OP_COPY, dest, args[0], None)
+                    elif inst.op == '!':
+                        decoded = (OP_NOT, dest, args[0], None)
+                    else:
+                        decoded = (_BINARY_OPCODES[inst.op], dest, args[0], args[1])
+                elif kind == 'if':
+                    args = [operand(arg) for arg in inst.args]
+                    decoded = self._decode_branch(inst.op, args, target(inst.label), inst.negated)
+                elif kind == 'goto':
+                    decoded = (OP_GOTO, target(inst.label), None, None)
+                elif kind == 'read':
+                    decoded = (OP_READ, operand(inst.dest), None, None)
+                elif kind == 'write':
+                    decoded = (OP_WRITE, None, operand(inst.args[0]), None)
+                else:
+                    # Etiquetas e instrucciones desconocidas no hacen nada
+                    decoded = (OP_NOP, None, None, None)
+            except ValueError as e:
+                decoded = (OP_INVALID, str(e), None, None)
+            self.code.append(decoded)
+        
+        # Los literales ocupan los registros posteriores a las variables y temporales
+        self.constants = []
+        for text, value in literals.items():
+            self.slots[text] = len(self.names) + len(self.constants)
+            self.constants.append((self.slots[text], value))
+        # Sustituir los operandos literales por su registro
+        slots = self.slots
+        self.code = [(op, dest, slots.get(a, a), slots.get(b, b)) for op, dest, a, b in self.code]
+        self._init_values()
     
-    def get_output(self):
-        """Retorna la salida acumulada del programa."""
-        return "\n".join(str(v) for v in self.output)
+    def _decode_branch(self, op, args, target, negated=False):
+        """
+        Decodifica un salto condicional. En ifFalse la comparación se invierte al decodificar
+        ("ifFalse a < b" es OP_IF_GE), así no cuesta una instrucción más al ejecutar.
+        """
+        if op is None:
+            return (OP_IF_FALSE if negated else OP_IF_TRUE, target, args[0], None)
+        # Comparaciones contra un literal booleano: "if t0 == false goto L1"
+        left, right = args
+        if right in ('true', 'false') and op in ('==', '!='):
+            jump_if_true = ((right == 'true') == (op == '==')) != negated
+            return (OP_IF_TRUE if jump_if_true else OP_IF_FALSE, target, left, None)
+        if negated:
+            op = _NEGATED_RELATIONAL[op]
+        return (_BRANCH_OPCODES[op], target, left, right)
+    
+    def _init_values(self):
+        """Inicializa los registros: variables sin asignar en 0 y literales con su valor."""
+        self.registers = [0] * (len(self.names) + len(self.constants))
+        for slot, value in self.constants:
+            self.registers[slot] = value
     
     def reset(self):
         """Reinicia el intérprete."""
-        self.memory = {}
+        self._init_values()
         self.pc = 0
         self.output = []
         self.input_queue = []
         self.running = False
         self.error = None
+        self.steps = 0
+        self.elapsed = 0.0
+        self.stop_requested = False
     
     def get_value(self, identifier):
         """Obtiene el valor de una variable o temporal."""
         identifier = identifier.strip()
         
-        # Primero verificar en memoria
-        if identifier in self.memory:
-            return self.memory[identifier]
-        
-        # Intentar como literal booleano (retornar como string 'true'/'false')
-        if identifier == 'true':
-            return 'true'
-        if identifier == 'false':
-            return 'false'
+        # Primero verificar en los registros
+        if identifier in self.slots:
+            return self.registers[self.slots[identifier]]
         
-        # Intentar como número (puede ser un literal en la expresión)
-        try:
-            if '.' in identifier:
-                return float(identifier)
-            else:
-                return int(identifier)
-        except ValueError:
-            pass
+        # Intentar como literal
+        if is_literal_operand(identifier):
+            try:
+                return parse_literal(identifier)
+            except ValueError:
+                pass
         
         # Si no se encuentra, retornar 0 (variable no inicializada)
-        # Esto puede causar errores, pero es mejor que None
         return 0
     
     def set_value(self, identifier, value):
         """Establece el valor de una variable o temporal."""
-        self.memory[identifier] = value
+        if identifier not in self.slots:
+            self.slots[identifier] = len(self.registers)
+            self.names.append(identifier)
+            self.registers.append(value)
+        else:
+            self.registers[self.slots[identifier]] = value
     
-    def parse_value(self, value_str):
-        """Parsea un valor desde un string."""
-        # Verificar si es un identificador
-        if value_str in self.memory:
-            return self.memory[value_str]
-        
-        # Verificar si es booleano
-        if value_str == 'true':
-            return True
-        if value_str == 'false':
-            return False
-        
-        # Verificar si es número
-        try:
-            if '.' in value_str:
-                return float(value_str)
-            else:
-                return int(value_str)
-        except ValueError:
-            pass
-        
-        # Si no se puede parsear, retornar 0
-        return 0
+    def pending_input_variable(self):
+        """Retorna la variable que espera un valor de entrada (o None si no hay un read pendiente)."""
+        if self.pc < len(self.code) and self.code[self.pc][0] == OP_READ:
+            return self.names[self.code[self.pc][1]]
+        return None
+    
+    def provide_input(self, value):
+        """
+        Entrega un valor de entrada a la instrucción read pendiente y avanza el PC.
+        Si no hay un read pendiente, el valor se agrega a la cola de entrada.
+        Retorna la variable que recibió el valor (o None si se encoló).
+        """
+        var = self.pending_input_variable()
+        if var is None:
+            self.input_queue.append(value)
+            return None
+        self.set_value(var, self._convert_input(var, value))
+        self.pc += 1
+        return var
+    
+    def stats_summary(self):
+        """Resumen de la ejecución: instrucciones, tiempo y velocidad."""
+        return (f"{self.steps} instrucciones en {self.elapsed:.3f} s "
+                f"({self.steps_per_second():.0f} instrucciones/s)")
     
-    def execute(self, max_steps=10000):
+    def run(self, max_steps=None, time_limit=None):
         """
-        Ejecuta el código TAC.
+        Ejecuta instrucciones desde el PC actual hasta terminar el programa, necesitar un valor
+        de entrada, encontrar un error, ejecutar max_steps instrucciones o superar time_limit
+        segundos de ejecución.
         
-        Args:
-            max_steps: Número máximo de instrucciones a ejecutar (para evitar loops infinitos)
+        El watchdog de tiempo, la solicitud de detención (request_stop) y progress_callback se
+        revisan cada WATCHDOG_INTERVAL instrucciones, de modo que el ciclo de despacho solo
+        compara el contador de pasos en cada instrucción.
         
         Returns:
-            (success: bool, error_message: str)
+            Uno de STATUS_FINISHED, STATUS_PAUSED, STATUS_ERROR, STATUS_STEP_LIMIT,
+            STATUS_TIME_LIMIT o STATUS_STOPPED
         """
-        self.reset()
-        self.running = True
+        code = self.code
+        values = self.registers
+        end = len(code)
+        pc = self.pc
+        budget = max_steps if max_steps is not None else float("inf")
+        started = time.perf_counter()
+        deadline = started + time_limit if time_limit else None
+        # Siguiente número de pasos en el que se revisan los límites
+        checkpoint = min(budget, WATCHDOG_INTERVAL)
         steps = 0
+        status = STATUS_FINISHED
+        self.running = True
         
-        while self.running and self.pc < len(self.instructions) and steps < max_steps:
-            instruction = self.instructions[self.pc].strip()
-            
-            # Saltar etiquetas (ya procesadas en el mapeo)
-            if instruction.endswith(':'):
-                self.pc += 1
-                steps += 1
-                continue
-            
-            # Ejecutar instrucción
-            success, error = self._execute_instruction(instruction)
-            if not success:
-                self.error = error
-                self.running = False
-                return False, error
-            
-            self.pc += 1
-            steps += 1
-        
-        if steps >= max_steps:
-            return False, f"Límite de pasos alcanzado ({max_steps}). Posible ciclo infinito."
-        
-        return True, None
-    
-    def _execute_instruction(self, instruction):
-        """Ejecuta una instrucción TAC individual."""
         try:
-            # Asignación: var = value
-            if " = " in instruction:
-                parts = instruction.split(" = ", 1)
-                if len(parts) == 2:
-                    var = parts[0].strip()
-                    expr = parts[1].strip()
-                    value = self._evaluate_expression(expr)
-                    # Si el resultado es booleano, guardar como 'true' o 'false'
-                    if isinstance(value, bool):
-                        value = 'true' if value else 'false'
-                    self.set_value(var, value)
-                    return True, None
-            
-            # Salto condicional: if cond goto label
-            if instruction.startswith("if "):
-                return self._execute_conditional_jump(instruction)
-            
-            # Salto incondicional: goto label
-            if instruction.startswith("goto "):
-                label = instruction[5:].strip()
-                if label in self.labels:
-                    self.pc = self.labels[label]
-                    return True, None
-                else:
-                    return False, f"Etiqueta '{label}' no encontrada"
-            
-            # Entrada: read var
-            if instruction.startswith("read "):
-                var = instruction[5:].strip()
+            while pc < end:
+                if steps >= checkpoint:
+                    if steps >= budget:
+                        status = STATUS_STEP_LIMIT
+                        break
+                    if self.stop_requested:
+                        status = STATUS_STOPPED
+                        break
+                    if deadline and time.perf_counter() >= deadline:
+                        status = STATUS_TIME_LIMIT
+                        break
+                    if self.progress_callback:
+                        self.pc = pc
+                        self.progress_callback()
+                    checkpoint = min(budget, steps + WATCHDOG_INTERVAL)
+                op, dest, a, b = code[pc]
+                steps += 1
                 
-                if self.input_queue:
-                    value = self.input_queue.pop(0)
-                    # Intentar convertir a número
-                    try:
-                        if isinstance(value, str):
-                            if '.' in value:
-                                value = float(value)
-                            else:
-                                value = int(value)
-                    except ValueError:
-                        pass
-                    self.set_value(var, value)
-                    return True, None
-                else:
-                    # Si no hay entrada en la cola, llamar callback y pausar
-                    if self.input_callback:
-                        self.input_callback(var)
-                    # Retornar un estado especial que indique que necesita pausar
-                    # No avanzar el PC, se avanzará cuando llegue el valor
-                    return "PAUSE", var  # Estado especial: necesita entrada
-            
-            # Salida: write expr
-            if instruction.startswith("write "):
-                expr = instruction[6:].strip()
-                value = self._evaluate_expression(expr)
-                self.output.append(value)
-                # Llamar callback si existe
-                if self.output_callback:
-                    self.output_callback(value)
-                return True, None
-            
-            return True, None  # Instrucción desconocida, ignorar
-        
-        except Exception as e:
-            return False, f"Error ejecutando instrucción '{instruction}': {e}"
-    
-    def _execute_conditional_jump(self, instruction):
-        """Ejecuta un salto condicional."""
-        # Formato: if cond goto label
-        # Ejemplos: if t0 == false goto L1, if t1 > 0 goto L2
-        
-        # Extraer condición y etiqueta
-        if " goto " not in instruction:
-            return False, "Formato de salto condicional inválido"
-        
-        parts = instruction.split(" goto ", 1)
-        condition = parts[0][3:].strip()  # Quitar "if "
-        label = parts[1].strip()
-        
-        if label not in self.labels:
-            return False, f"Etiqueta '{label}' no encontrada"
-        
-        # Evaluar condición
-        result = self._evaluate_boolean_condition(condition)
-        
-        if result:
-            self.pc = self.labels[label]
-            return True, None
-        else:
-            return True, None  # No saltar
-    
-    def _evaluate_boolean_condition(self, condition):
-        """Evalúa una condición booleana."""
-        # Formato: expr1 op expr2
-        operators = ["==", "!=", "<=", ">=", "<", ">"]
-        
-        for op in operators:
-            if op in condition:
-                parts = condition.split(op, 1)
-                if len(parts) == 2:
-                    left = parts[0].strip()
-                    right = parts[1].strip()
-                    
-                    left_val = self._evaluate_expression(left)
-                    right_val = self._evaluate_expression(right)
-                    
-                    # Convertir 'true'/'false' a booleanos para comparar
-                    left_bool = self._to_bool(left_val)
-                    right_bool = self._to_bool(right_val)
-                    
-                    if op == "==":
-                        return left_bool == right_bool
-                    elif op == "!=":
-                        return left_bool != right_bool
-                    elif op == "<=":
-                        return left_bool <= right_bool
-                    elif op == ">=":
-                        return left_bool >= right_bool
-                    elif op == "<":
-                        return left_bool < right_bool
-                    elif op == ">":
-                        return left_bool > right_bool
-        
-        # Si no hay operador, evaluar como expresión booleana
-        value = self._evaluate_expression(condition)
-        return self._to_bool(value)
-    
-    def _evaluate_expression(self, expr):
-        """Evalúa una expresión aritmética o booleana respetando precedencia de operadores."""
-        expr = expr.strip()
-        
-        # Si está vacío, retornar 0
-        if not expr:
-            return 0
-        
-        # Negación
-        if expr.startswith("!"):
-            val = self._evaluate_expression(expr[1:].strip())
-            # Convertir a booleano y luego a 'true'/'false'
-            result = not bool(self._to_bool(val))
-            return 'true' if result else 'false'
-        
-        # Operadores relacionales (mayor precedencia que lógicos, menor que aritméticos)
-        # IMPORTANTE: Para comparaciones relacionales, comparamos valores numéricos, no booleanos
-        for op in ["==", "!=", "<=", ">=", "<", ">"]:
-            if op in expr:
-                parts = expr.split(op, 1)
-                if len(parts) == 2:
-                    left = parts[0].strip()
-                    right = parts[1].strip()
-                    
-                    left_val = self._evaluate_expression(left)
-                    right_val = self._evaluate_expression(right)
-                    
-                    # Convertir a números para comparar (no a booleanos)
-                    # Si son 'true'/'false', convertirlos a números primero
-                    left_num = self._to_number(left_val)
-                    right_num = self._to_number(right_val)
-                    
-                    if op == "==":
-                        result = left_num == right_num
-                    elif op == "!=":
-                        result = left_num != right_num
-                    elif op == "<=":
-                        result = left_num <= right_num
-                    elif op == ">=":
-                        result = left_num >= right_num
-                    elif op == "<":
-                        result = left_num < right_num
-                    elif op == ">":
-                        result = left_num > right_num
+                if op == OP_COPY:
+                    values[dest] = values[a]
+                elif op == OP_IF_FALSE:
+                    if not values[a]:
+                        pc = dest
+                        continue
+                elif op == OP_GOTO:
+                    pc = dest
+                    continue
+                elif op == OP_NOP:
+                    pass
+                elif op == OP_ADD:
+                    values[dest] = values[a] + values[b]
+                elif op == OP_SUB:
+                    values[dest] = values[a] - values[b]
+                elif op == OP_MUL:
+                    values[dest] = values[a] * values[b]
+                elif op == OP_DIV:
+                    y = values[b]
+                    values[dest] = values[a] / y if y != 0 else 0
+                elif op == OP_MOD:
+                    y = values[b]
+                    values[dest] = values[a] % y if y != 0 else 0
+                elif op == OP_LT:
+                    values[dest] = values[a] < values[b]
+                elif op == OP_GT:
+                    values[dest] = values[a] > values[b]
+                elif op == OP_LE:
+                    values[dest] = values[a] <= values[b]
+                elif op == OP_GE:
+                    values[dest] = values[a] >= values[b]
+                elif op == OP_EQ:
+                    values[dest] = values[a] == values[b]
+                elif op == OP_NE:
+                    values[dest] = values[a] != values[b]
+                elif op == OP_AND:
+                    values[dest] = bool(values[a]) and bool(values[b])
+                elif op == OP_OR:
+                    values[dest] = bool(values[a]) or bool(values[b])
+                elif op == OP_NOT:
+                    values[dest] = not values[a]
+                elif op == OP_IF_TRUE:
+                    if values[a]:
+                        pc = dest
+                        continue
+                elif op <= OP_IF_NE:
+                    x = values[a]
+                    y = values[b]
+                    if op == OP_IF_LT:
+                        taken = x < y
+                    elif op == OP_IF_GT:
+                        taken = x > y
+                    elif op == OP_IF_LE:
+                        taken = x <= y
+                    elif op == OP_IF_GE:
+                        taken = x >= y
+                    elif op == OP_IF_EQ:
+                        taken = x == y
                     else:
+                        taken = x != y
+                    if taken:
+                        pc = dest
                         continue
-                    
-                    return 'true' if result else 'false'
-        
-        # Operadores lógicos (menor precedencia)
-        if "||" in expr:
-            parts = expr.split("||", 1)
-            if len(parts) == 2:
-                left_val = self._evaluate_expression(parts[0].strip())
-                right_val = self._evaluate_expression(parts[1].strip())
-                result = bool(self._to_bool(left_val)) or bool(self._to_bool(right_val))
-                return 'true' if result else 'false'
-        
-        if "&&" in expr:
-            parts = expr.split("&&", 1)
-            if len(parts) == 2:
-                left_val = self._evaluate_expression(parts[0].strip())
-                right_val = self._evaluate_expression(parts[1].strip())
-                result = bool(self._to_bool(left_val)) and bool(self._to_bool(right_val))
-                return 'true' if result else 'false'
-        
-        # Operadores aritméticos: primero * / %, luego + -
-        # Buscar desde la derecha para respetar asociatividad izquierda
-        for op in ["*", "/", "%"]:
-            # Buscar desde la derecha para respetar precedencia
-            last_pos = expr.rfind(op)
-            if last_pos > 0:
-                # Verificar que no sea parte de un identificador o número
-                if last_pos > 0 and (expr[last_pos - 1].isspace() or not expr[last_pos - 1].isalnum()):
-                    left = expr[:last_pos].strip()
-                    right = expr[last_pos + len(op):].strip()
-                    
-                    if left and right:  # Asegurar que ambas partes existen
-                        left_val = self._evaluate_expression(left)
-                        right_val = self._evaluate_expression(right)
-                        
-                        # Convertir 'true'/'false' a números si es necesario
-                        left_num = self._to_number(left_val)
-                        right_num = self._to_number(right_val)
-                        
-                        if op == "*":
-                            return left_num * right_num
-                        elif op == "/":
-                            return left_num / right_num if right_num != 0 else 0
-                        elif op == "%":
-                            return left_num % right_num if right_num != 0 else 0
-        
-        # Operadores + y - (menor precedencia que * / %)
-        # Buscar desde la derecha, evitando números negativos
-        for op in ["+", "-"]:
-            last_pos = expr.rfind(op)
-            if last_pos > 0:  # No al inicio
-                # Verificar que no sea parte de un número negativo o identificador
-                char_before = expr[last_pos - 1]
-                if char_before.isspace() or (not char_before.isalnum() and char_before != '.'):
-                    left = expr[:last_pos].strip()
-                    right = expr[last_pos + len(op):].strip()
-                    
-                    if left and right:  # Asegurar que ambas partes existen
-                        left_val = self._evaluate_expression(left)
-                        right_val = self._evaluate_expression(right)
-                        
-                        # Convertir 'true'/'false' a números si es necesario
-                        left_num = self._to_number(left_val)
-                        right_num = self._to_number(right_val)
-                        
-                        if op == "+":
-                            return left_num + right_num
-                        elif op == "-":
-                            return left_num - right_num
-        
-        # Valor simple (variable, literal, temporal)
-        return self.get_value(expr)
-    
-    def _to_bool(self, value):
-        """Convierte un valor a booleano, manejando 'true'/'false' y números."""
-        if value == 'true':
-            return True
-        if value == 'false':
-            return False
-        if isinstance(value, bool):
-            return value
-        if isinstance(value, (int, float)):
-            return bool(value)
-        # Intentar convertir string a número
-        try:
-            if isinstance(value, str):
-                if '.' in value:
-                    return bool(float(value))
+                elif op == OP_READ:
+                    if not self.input_queue:
+                        # Pausar sin avanzar el PC; se continúa con provide_input()
+                        status = STATUS_PAUSED
+                        break
+                    values[dest] = self._convert_input(self.names[dest], self.input_queue.pop(0))
+                elif op == OP_WRITE:
+                    value = format_tac_value(values[a])
+                    self.output.append(value)
+                    if self.output_callback:
+                        self.output_callback(value)
                 else:
-                    return bool(int(value))
-        except ValueError:
-            pass
-        return bool(value)
-    
-    def _to_number(self, value):
-        """Convierte un valor a número, manejando 'true'/'false'."""
-        if value == 'true':
-            return 1
-        if value == 'false':
-            return 0
-        if isinstance(value, bool):
-            return 1 if value else 0
-        if isinstance(value, (int, float)):
-            return value
-        # Intentar convertir string a número
-        try:
-            if isinstance(value, str):
-                if '.' in value:
-                    return float(value)
-                else:
-                    return int(value)
-        except ValueError:
-            pass
-        return 0
+                    self.error = f"Error ejecutando instrucción '{self.instructions[pc]}': {dest}"
+                    status = STATUS_ERROR
+                    break
+                
+                pc += 1
+        except Exception as e:
+            self.error = f"Error ejecutando instrucción '{self.instructions[pc]}': {e}"
+            status = STATUS_ERROR
+        
+        self.pc = pc
+        self.steps += steps
+        self.elapsed += time.perf_counter() - started
+        if status != STATUS_PAUSED:
+            self.running = False
+        elif self.input_callback:
+            self.input_callback(self.pending_input_variable())
+        return status
 
 
-def generate_and_run_intermediate_code(ast_root, annotations, symbol_table=None, input_values=None):
+def generate_and_run_intermediate_code(ast_root, annotations, symbol_table=None, input_values=None,
+                                       max_steps=DEFAULT_MAX_STEPS, time_limit=DEFAULT_TIME_LIMIT,
+                                       optimization_level=None, engine=ENGINE_TAC):
     """
     Función pública principal que genera código TAC y lo ejecuta.
     
@@ -1078,26 +1611,40 @@ def generate_and_run_intermediate_code(ast_root, annotations, symbol_table=None,
         annotations: Diccionario de anotaciones del análisis semántico
         symbol_table: Tabla de símbolos (opcional)
         input_values: Lista de valores de entrada para cin (opcional)
+        max_steps: Número máximo de instrucciones a ejecutar (None = sin límite)
+        time_limit: Segundos máximos de ejecución (None = sin límite)
+        optimization_level: Nivel de optimización del TAC (0 = sin optimizar, 1 = código muerto,
+                            2 = además constantes; None = nivel por defecto)
+        engine: Motor de ejecución (ENGINE_TAC, ENGINE_PYTHON o ENGINE_AST); el TAC se genera siempre
     
     Returns:
         (instructions: list, execution_output: str, success: bool, error: str)
     """
     # Generar código TAC
-    generator = TACGenerator(annotations, symbol_table)
+    generator = TACGenerator(annotations, symbol_table, optimization_level=optimization_level)
     instructions = generator.generate_from_ast(ast_root)
     
     # Guardar en archivo
     generator.save_to_file("codigo_intermedio.tac")
     
-    # Ejecutar código TAC
-    interpreter = TACInterpreter()
-    interpreter.load_from_list(instructions)
+    # Ejecutar con el motor elegido
+    if engine == ENGINE_PYTHON:
+        from phases import python_backend
+        interpreter = python_backend.compile_program(ast_root, annotations, symbol_table)
+    elif engine == ENGINE_AST:
+        from phases import ast_interpreter
+        interpreter = ast_interpreter.compile_program(ast_root, annotations, symbol_table)
+    elif engine == ENGINE_TAC:
+        interpreter = TACInterpreter()
+        interpreter.load_from_list(instructions, generator.var_types)
+    else:
+        raise ValueError(f"Motor de ejecución desconocido: '{engine}'")
     
     # Establecer valores de entrada si se proporcionan
     if input_values is not None:
         interpreter.set_input(input_values)
     
-    success, error = interpreter.execute()
+    success, error = interpreter.execute(max_steps, time_limit)
     output = interpreter.get_output()
     
     return instructions, output, success, error
@@ -1105,6 +1652,22 @@ def generate_and_run_intermediate_code(ast_root, annotations, symbol_table=None,
 
 if __name__ == "__main__":
     # Prueba del generador e intérprete TAC
+    import sys
+    from phases.pipeline import compile_source
+
     print("Generación e interpretación de código intermedio TAC")
     print("Esta funcionalidad debe ser llamada desde el IDE o después del análisis semántico.")
 
+    # Reutilización de temporales por tipo: el temporal de a / b (float) muere antes de que
+    # empiece el de a * b (int); no deben compartir nombre, porque '/' siempre da un float
+    resultado = compile_source("main {\n int a, b, n;\n float f;\n cin >> a;\n cin >> b;\n"
+                               " f = a / b + 1;\n n = a * b + 1;\n cout << f;\n cout << n;\n}",
+                               optimization_level=0)
+    instrucciones = [parse_tac_instruction(inst) for inst in resultado.instructions]
+    division = next(inst.dest for inst in instrucciones if inst.op == '/')
+    producto = next(inst.dest for inst in instrucciones if inst.op == '*')
+    tipos = (resultado.var_types.get(division), resultado.var_types.get(producto))
+    if division == producto or tipos != ('float', 'int'):
+        print(f"ERROR: temporales de '/' y '*': {division} ({tipos[0]}) / {producto} ({tipos[1]})")
+        sys.exit(1)
+    print(f"Temporales por tipo: {division} (float), {producto} (int)")
@@ -1,11 +1,26 @@
 # lexical.py
-RESERVED_WORDS = {
-    "if", "else", "end", "do", "while", "switch", "case",
-    "int", "float", "main", "cin", "cout", "then", "until", "return",
-    "break", "continue", "for", "in", "function", "var", "let", "const",
-}
+import re
+from util.tokens import (Token, PALABRAS_CLAVE, SIMBOLOS, IDENTIFIER, INT_LITERAL, FLOAT_LITERAL,
+                         OPERATOR)
+
+# Palabras reservadas (cada una tiene su propia clase de token, ver util/tokens.py)
+RESERVED_WORDS = set(PALABRAS_CLAVE)
 
 def analizar_codigo_fuente(codigo):
+    """
+    Analiza el código fuente y devuelve (tokens, errores).
+
+    Usa el analizador de patrón maestro (expresión regular) si el código es ASCII; si tiene
+    caracteres no ASCII usa el autómata carácter por carácter, porque isalpha()/isdigit()/isspace()
+    aceptan letras, dígitos y espacios Unicode que el patrón no reconoce.
+    """
+    if codigo.isascii():
+        return analizar_codigo_fuente_regex(codigo)
+    return analizar_codigo_fuente_automata(codigo)
+
+
+def analizar_codigo_fuente_automata(codigo):
+    """Analizador léxico carácter por carácter (autómata de estados)."""
     tokens = []
     errores = []
     estado = "INICIO"
@@ -15,8 +30,8 @@ def analizar_codigo_fuente(codigo):
     i = 0
     longitud = len(codigo)
 
-    def agregar_token(tipo):
-        tokens.append({"line": fila, "column": columna - len(lexema), "lexema": lexema, "tipo": tipo})
+    def agregar_token(clase):
+        tokens.append(Token(lexema, clase, fila, columna - len(lexema)))
 
     def agregar_error(descripcion):
         errores.append({"line": fila, "column": columna - len(lexema), "value": lexema, "descripcion": descripcion})
@@ -61,7 +76,7 @@ def analizar_codigo_fuente(codigo):
                 lexema += c
             elif c in "{}[]();,":
                 lexema += c
-                agregar_token("DELIMITADOR")
+                agregar_token(SIMBOLOS[lexema])
             else:
                 lexema += c
                 agregar_error("Carácter no reconocido")
@@ -72,7 +87,7 @@ def analizar_codigo_fuente(codigo):
                 lexema += c
                 estado = "PUNTO_DECIMAL"
             else:
-                agregar_token("NUMERO_ENTERO")
+                agregar_token(INT_LITERAL)
                 estado = "INICIO"
                 continue
         elif estado == "PUNTO_DECIMAL":
@@ -87,15 +102,14 @@ def analizar_codigo_fuente(codigo):
             if c.isdigit():
                 lexema += c
             else:
-                agregar_token("NUMERO_FLOTANTE")
+                agregar_token(FLOAT_LITERAL)
                 estado = "INICIO"
                 continue
         elif estado == "IDENT":
             if c.isalnum() or c == "_":
                 lexema += c
             else:
-                tipo = "PALABRA_RESERVADA" if lexema in RESERVED_WORDS else "IDENTIFICADOR"
-                agregar_token(tipo)
+                agregar_token(PALABRAS_CLAVE.get(lexema, IDENTIFIER))
                 estado = "INICIO"
                 continue
         elif estado == "POSIBLE_COMENTARIO":
@@ -106,7 +120,7 @@ def analizar_codigo_fuente(codigo):
                 estado = "COMENTARIO_MULTILINEA"
                 lexema += c
             else:
-                agregar_token("OPERADOR_ARITMETICO")
+                agregar_token(SIMBOLOS[lexema])
                 estado = "INICIO"
                 continue
         elif estado == "COMENTARIO_UNILINEA":
@@ -123,7 +137,7 @@ def analizar_codigo_fuente(codigo):
             # Solo aceptamos && y || completos
             if (lexema == "&" and c == "&") or (lexema == "|" and c == "|"):
                 lexema += c
-                agregar_token("OPERADOR_LOGICO")
+                agregar_token(SIMBOLOS[lexema])
                 estado = "INICIO"
             else:
                 agregar_error("Operador lógico incompleto (se esperaba '&&' o '||')")
@@ -134,32 +148,18 @@ def analizar_codigo_fuente(codigo):
             # Manejo de operadores aritméticos, relacionales, asignación y entrada/salida
             if (lexema == ">" and c == ">") or (lexema == "<" and c == "<"):
                 lexema += c
-                agregar_token("OPERADOR_ARITMETICO")
+                agregar_token(SIMBOLOS[lexema])
                 estado = "INICIO"
             elif c == "=" and lexema in "+-*/%=<>!":
                 lexema += c
-                if lexema in ("==", "!=", "<=", ">="):
-                    agregar_token("OPERADOR_RELACIONAL")
-                else:
-                    agregar_token("OPERADOR_ASIGNACION")
+                agregar_token(SIMBOLOS[lexema])  # Relacional o de asignación
                 estado = "INICIO"
             elif lexema == c and c in "+-":
                 lexema += c
-                agregar_token("OPERADOR_ARITMETICO")  # ++ o --
+                agregar_token(SIMBOLOS[lexema])  # ++ o --
                 estado = "INICIO"
             else:
-                tipo = {
-                    "+": "OPERADOR_ARITMETICO",
-                    "-": "OPERADOR_ARITMETICO",
-                    "*": "OPERADOR_ARITMETICO",
-                    "/": "OPERADOR_ARITMETICO",
-                    "%": "OPERADOR_ARITMETICO",
-                    "=": "OPERADOR_ASIGNACION",
-                    "<": "OPERADOR_RELACIONAL",
-                    ">": "OPERADOR_RELACIONAL",
-                    "!": "OPERADOR_LOGICO"
-                }.get(lexema, "OPERADOR")
-                agregar_token(tipo)
+                agregar_token(SIMBOLOS.get(lexema, OPERATOR))
                 estado = "INICIO"
                 continue
 
@@ -169,29 +169,327 @@ def analizar_codigo_fuente(codigo):
     # Finalizar token si queda uno abierto
     if lexema:
         if estado == "NUM_ENTERO":
-            agregar_token("NUMERO_ENTERO")
+            agregar_token(INT_LITERAL)
         elif estado == "NUM_FLOTANTE":
-            agregar_token("NUMERO_FLOTANTE")
+            agregar_token(FLOAT_LITERAL)
         elif estado == "IDENT":
-            tipo = "PALABRA_RESERVADA" if lexema in RESERVED_WORDS else "IDENTIFICADOR"
-            agregar_token(tipo)
+            agregar_token(PALABRAS_CLAVE.get(lexema, IDENTIFIER))
         elif estado == "PUNTO_DECIMAL":
             agregar_error("Punto decimal mal utilizado")
         elif estado == "OPERADOR":
             if lexema in ("<<", ">>"):
-                agregar_token("OPERADOR_ARITMETICO")
+                agregar_token(SIMBOLOS[lexema])
             else:
-                agregar_token("OPERADOR")
+                agregar_token(OPERATOR)
         elif estado == "OPERADOR_LOGICO_POTENCIAL":
             agregar_error("Operador lógico incompleto (se esperaba '&&' o '||')")
 
     return tokens, errores
 
+# Patrón maestro del analizador de una sola pasada. Cada coincidencia es (espacios, lexema): los
+# espacios horizontales previos y un lexema completo. El orden de las alternativas importa:
+# en la misma posición gana la primera que coincide ("-1" es número antes que operador).
+PATRON_MAESTRO = re.compile(r"""
+    ([ \t\r\x0b\x0c\x1c-\x1f]*)
+    (
+        [A-Za-z_][A-Za-z0-9_]*          # identificador o palabra reservada
+      | -?[0-9]+(?:\.[0-9]*)?           # número (termina en "." si el punto está mal utilizado)
+      | //[^\n]*\n?                     # comentario unilínea con su salto de línea
+      | /\*.*?\*/                       # comentario multilínea
+      | /\*.*                           # comentario multilínea sin cerrar (hasta el final)
+      | <<|>>|\+\+|--|[-+*%=<>!]=|&&|\|\|
+      | .                               # salto de línea, operador o delimitador simple, o error
+      | \Z
+    )
+""", re.VERBOSE | re.DOTALL)
+
+# Tabla de lexemas fijos -> acción del analizador; los demás (identificadores, números, comentarios
+# y caracteres no reconocidos) se clasifican por su primer carácter. Los SIMBOLO son los que el
+# autómata emite al leer su último carácter (delimitadores y operadores dobles).
+ACCIONES_LEXEMA = {"": "FIN", "\n": "SALTO", "&": "LOGICO_INCOMPLETO", "|": "LOGICO_INCOMPLETO"}
+ACCIONES_LEXEMA.update({simbolo: "SIMBOLO" if len(simbolo) == 2 or simbolo in "{}[]();," else "OPERADOR"
+                        for simbolo in SIMBOLOS})
+
+
+def analizar_codigo_fuente_regex(codigo):
+    """
+    Analizador léxico de una sola pasada con el patrón maestro y la tabla de lexemas. Para código
+    ASCII produce exactamente los mismos tokens y errores (con las mismas líneas y columnas) que
+    analizar_codigo_fuente_automata, incluidas sus particularidades:
+    - Los tokens que el autómata emite al leer su último carácter (delimitadores, operadores
+      dobles y caracteres no reconocidos) quedan con la columna anterior a la de su inicio.
+    - Un comentario multilínea no cuenta sus saltos de línea y su cierre "*/" avanza una sola columna.
+    - Un operador simple al final del código tiene tipo OPERADOR y un "/" final se descarta.
+    """
+    tokens = []
+    errores = []
+    _escanear(PATRON_MAESTRO.findall(codigo), len(codigo), tokens, errores)
+    return tokens, errores
+
+
+def _escanear(coincidencias, longitud, tokens, errores, fila=1, base=-1, posicion=0):
+    """
+    Convierte las coincidencias (espacios, lexema) del patrón maestro en tokens y los agrega a la
+    lista. Es un ciclo que construye la lista directamente (no un generador): es el camino de
+    analizar_codigo_fuente, y el flujo y el analizador incremental lo llaman por tramos.
+
+    Args:
+        coincidencias: Iterable de pares (espacios, lexema) de PATRON_MAESTRO desde `posicion`
+        longitud: Posición donde termina el código analizado
+        tokens: Lista a la que se agregan los tokens
+        errores: Lista a la que se agregan los errores léxicos
+        fila, base, posicion: Estado inicial (columna = posición - base); por defecto, el inicio del código
+
+    Returns:
+        Estado al terminar: (fila, columna del siguiente carácter, dentro de un comentario multilínea)
+    """
+    agregar_token = tokens.append
+    accion_de = ACCIONES_LEXEMA.get
+    palabra_clave = PALABRAS_CLAVE.get
+    crear_token = Token
+
+    for espacios, lexema in coincidencias:
+        inicio = posicion + len(espacios)
+        posicion = inicio + len(lexema)
+        accion = accion_de(lexema)
+
+        if accion is None:
+            c = lexema[0]
+            if c.isalpha() or c == "_":
+                agregar_token(crear_token(lexema, palabra_clave(lexema, IDENTIFIER), fila, inicio - base))
+            elif c.isdigit() or c == "-":
+                if lexema[-1] == ".":
+                    errores.append({"line": fila, "column": inicio - base, "value": lexema,
+                                    "descripcion": "Punto decimal mal utilizado"})
+                else:
+                    clase = FLOAT_LITERAL if "." in lexema else INT_LITERAL
+                    agregar_token(crear_token(lexema, clase, fila, inicio - base))
+            elif lexema.startswith("//"):
+                if lexema[-1] == "\n":
+                    fila += 1
+                    base = posicion - 1
+            elif lexema.startswith("/*"):
+                if len(lexema) < 4 or not lexema.endswith("*/"):
+                    return fila, posicion - base, True  # Comentario sin cerrar: consume el resto del código
+                base += 1
+            else:
+                errores.append({"line": fila, "column": inicio - base - 1, "value": lexema,
+                                "descripcion": "Carácter no reconocido"})
+        elif accion == "SIMBOLO":
+            agregar_token(crear_token(lexema, SIMBOLOS[lexema], fila, inicio - base - 1))
+        elif accion == "SALTO":
+            fila += 1
+            base = inicio
+        elif accion == "OPERADOR":
+            if posicion < longitud:
+                agregar_token(crear_token(lexema, SIMBOLOS[lexema], fila, inicio - base))
+            elif lexema != "/":
+                agregar_token(crear_token(lexema, OPERATOR, fila, inicio - base))
+        elif accion == "LOGICO_INCOMPLETO":
+            errores.append({"line": fila, "column": inicio - base, "value": lexema,
+                            "descripcion": "Operador lógico incompleto (se esperaba '&&' o '||')"})
+
+    return fila, posicion - base, False
+
+
+ESTADO_INICIAL = (1, 1, False)  # (fila, columna, dentro de un comentario multilínea) al inicio del código
+
+
+def _analizar_tramo(codigo, inicio, fin, estado, tokens, errores):
+    """
+    Analiza codigo[inicio:fin], un tramo que termina después de un salto de línea o al final del
+    código, a partir del estado del analizador al inicio del tramo. Un token nunca cruza un salto
+    de línea; solo los comentarios multilínea lo hacen, y de ellos el estado recuerda si siguen
+    abiertos y la columna, porque el autómata no reinicia la columna (ni cuenta la línea) dentro
+    de un comentario.
+
+    Returns:
+        Estado al final del tramo
+    """
+    fila, columna, en_comentario = estado
+    if en_comentario:
+        cierre = codigo.find("*/", inicio, fin)
+        if cierre < 0:
+            return fila, columna + fin - inicio, True
+        columna += cierre + 1 - inicio  # El cierre "*/" avanza una sola columna
+        inicio = cierre + 2
+    return _escanear(PATRON_MAESTRO.findall(codigo, inicio, fin), fin, tokens, errores,
+                     fila, inicio - columna, inicio)
+
+
+TAMANO_TRAMO = 8192  # Caracteres (aproximados) que el flujo de tokens analiza de una vez
+
+
+def generar_tokens(codigo, errores=None):
+    """
+    Flujo de tokens: genera los tokens a medida que se piden, sin construir la lista completa
+    (el analizador sintáctico puede empezar de inmediato y la memoria no crece con el código).
+    Analiza el código por tramos de líneas completas de unos TAMANO_TRAMO caracteres.
+
+    Args:
+        codigo: Código fuente
+        errores: Lista a la que se agregan los errores léxicos a medida que se encuentran
+
+    Yields:
+        Token en el orden del código (los mismos que analizar_codigo_fuente)
+    """
+    if errores is None:
+        errores = []
+    if not codigo.isascii():
+        # El autómata no es incremental: el código no ASCII se analiza completo
+        tokens, errores_automata = analizar_codigo_fuente_automata(codigo)
+        errores.extend(errores_automata)
+        yield from tokens
+        return
+
+    estado = ESTADO_INICIAL
+    inicio = 0
+    longitud = len(codigo)
+    while True:
+        fin = codigo.find("\n", inicio + TAMANO_TRAMO) + 1 or longitud
+        tokens = []
+        estado = _analizar_tramo(codigo, inicio, fin, estado, tokens, errores)
+        yield from tokens
+        if fin == longitud:
+            return
+        inicio = fin
+
+
+def comparar_analizadores(codigo):
+    """
+    Prueba diferencial: analiza el código (ASCII) con el autómata, con el patrón maestro y con
+    el flujo de tokens.
+
+    Returns:
+        None si los tres producen los mismos tokens y errores; si no, una descripción de la
+        primera diferencia
+    """
+    esperado = analizar_codigo_fuente_automata(codigo)
+    errores_flujo = []
+    tokens_flujo = list(generar_tokens(codigo, errores_flujo))
+    for analizador, obtenido in (("patrón", analizar_codigo_fuente_regex(codigo)),
+                                 ("flujo", (tokens_flujo, errores_flujo))):
+        for nombre, lista_esperada, lista_obtenida in zip(("tokens", "errores"), esperado, obtenido):
+            for indice, (a, b) in enumerate(zip(lista_esperada, lista_obtenida)):
+                if a != b:
+                    return f"{nombre}[{indice}]: autómata {a} / {analizador} {b}"
+            if len(lista_esperada) != len(lista_obtenida):
+                return (f"número de {nombre}: autómata {len(lista_esperada)} / "
+                        f"{analizador} {len(lista_obtenida)}")
+    return None
+
+
+class AnalizadorLexicoIncremental:
+    """
+    Analizador léxico incremental: conserva los tokens, los errores y el estado del analizador al
+    inicio de cada línea. Al analizar una nueva versión del texto solo vuelve a analizar las
+    líneas modificadas y las siguientes hasta que el estado coincide con el guardado; a partir de
+    ahí reutiliza los resultados anteriores (desplazando la fila si se agregaron o quitaron líneas).
+
+    Los Token y errores guardados nunca se modifican (al desplazar la fila se reemplazan por
+    copias), así que las listas devueltas por un análisis anterior siguen siendo válidas.
+    """
+
+    def __init__(self):
+        self.lineas = []  # Texto de cada línea física
+        self.estados = []  # Estado del analizador al inicio de cada línea
+        self.tokens_linea = []  # Tokens producidos por cada línea
+        self.errores_linea = []  # Errores producidos por cada línea
+        self.lineas_analizadas = 0  # Líneas analizadas en la última llamada (para diagnóstico)
+
+    def analizar(self, codigo):
+        """
+        Analiza una nueva versión del código.
+
+        Returns:
+            (tokens, errores), iguales a los de analizar_codigo_fuente(codigo)
+        """
+        if not codigo.isascii():
+            # El autómata no guarda estados por línea: se analiza todo y se descarta la caché
+            self.__init__()
+            return analizar_codigo_fuente_automata(codigo)
+
+        partes = codigo.split("\n")
+        lineas = [parte + "\n" for parte in partes[:-1]]
+        lineas.append(partes[-1])
+
+        anteriores = self.lineas
+        limite = min(len(lineas), len(anteriores))
+        prefijo = 0
+        while prefijo < limite and lineas[prefijo] == anteriores[prefijo]:
+            prefijo += 1
+        sufijo = 0
+        while (sufijo < limite - prefijo
+               and lineas[len(lineas) - 1 - sufijo] == anteriores[len(anteriores) - 1 - sufijo]):
+            sufijo += 1
+
+        self._analizar_desde(lineas, prefijo, sufijo)
+        return self.resultado()
+
+    def _analizar_desde(self, lineas, prefijo, sufijo):
+        """Vuelve a analizar desde la línea `prefijo` hasta resincronizarse con las `sufijo` líneas finales."""
+        desplazamiento = len(lineas) - len(self.lineas)  # Índice nuevo = índice anterior + desplazamiento
+        estados = self.estados[:prefijo]
+        tokens_linea = self.tokens_linea[:prefijo]
+        errores_linea = self.errores_linea[:prefijo]
+        estado = self.estados[prefijo] if prefijo < len(self.estados) else ESTADO_INICIAL
+        self.lineas_analizadas = 0
+
+        indice = prefijo
+        while indice < len(lineas):
+            anterior = indice - desplazamiento
+            if indice >= len(lineas) - sufijo:
+                guardado = self.estados[anterior]
+                if guardado[1:] == estado[1:]:
+                    # Resincronizado: el resto de las líneas produce lo mismo, con la fila desplazada
+                    self._desplazar_filas(anterior, estado[0] - guardado[0])
+                    estados += self.estados[anterior:]
+                    tokens_linea += self.tokens_linea[anterior:]
+                    errores_linea += self.errores_linea[anterior:]
+                    break
+            linea = lineas[indice]
+            tokens = []
+            errores = []
+            siguiente = _analizar_tramo(linea, 0, len(linea), estado, tokens, errores)
+            estados.append(estado)
+            tokens_linea.append(tokens)
+            errores_linea.append(errores)
+            estado = siguiente
+            self.lineas_analizadas += 1
+            indice += 1
+
+        self.lineas = lineas
+        self.estados = estados
+        self.tokens_linea = tokens_linea
+        self.errores_linea = errores_linea
+
+    def _desplazar_filas(self, desde, delta):
+        """Reemplaza los estados, tokens y errores guardados desde la línea `desde` por copias con la fila + delta."""
+        if not delta:
+            return
+        for indice in range(desde, len(self.estados)):
+            fila, columna, en_comentario = self.estados[indice]
+            self.estados[indice] = (fila + delta, columna, en_comentario)
+            self.tokens_linea[indice] = [Token(token.lexema, token.clase, token.linea + delta, token.columna)
+                                         for token in self.tokens_linea[indice]]
+            self.errores_linea[indice] = [{**error, "line": error["line"] + delta}
+                                          for error in self.errores_linea[indice]]
+
+    def resultado(self):
+        """(tokens, errores) de la última versión analizada."""
+        tokens = []
+        errores = []
+        for tokens_de_linea, errores_de_linea in zip(self.tokens_linea, self.errores_linea):
+            tokens.extend(tokens_de_linea)
+            errores.extend(errores_de_linea)
+        return tokens, errores
+
+
 def generar_tabla_tokens(tokens):
     output = "Línea\tColumna\tToken\t\tTipo\n"
     output += "-" * 50 + "\n"
     for token in tokens:
-        output += f"{token['line']}\t{token['column']}\t{token['lexema']}\t\t{token['tipo']}\n"
+        output += f"{token.linea}\t{token.columna}\t{token.lexema}\t\t{token.tipo}\n"
     return output
 
 
@@ -213,13 +511,104 @@ def analizar_desde_archivo(ruta_archivo):
     tokens, errores = analizar_codigo_fuente(codigo)
 
     # Guardar tokens en archivo con línea y columna
-    with open("tokens.txt", "w", encoding="utf-8") as f:
-        for token in tokens:
-            lexema = token["lexema"]
-            tipo = token["tipo"]
-            linea = token["line"]
-            columna = token["column"]
-            f.write(f"{lexema}\t{tipo}\t{linea}\t{columna}\n")
+    escribir_archivo_tokens(tokens)
 
     return generar_tabla_tokens(tokens), generar_tabla_errores(errores)
 
+
+def escribir_archivo_tokens(tokens, ruta="tokens.txt"):
+    """Escribe los tokens en formato LEXEMA<TAB>TOKEN<TAB>LINEA<TAB>COLUMNA."""
+    with open(ruta, "w", encoding="utf-8") as f:
+        for token in tokens:
+            f.write(f"{token}\n")
+
+
+if __name__ == "__main__":
+    # Prueba diferencial del patrón maestro y del flujo contra el autómata: archivos de test/, casos límite
+    # y código aleatorio con los caracteres que distinguen a los estados del autómata
+    import glob
+    import random
+    import sys
+    import time
+
+    casos = {}
+    for ruta in sorted(glob.glob("test/**/*.txt", recursive=True)):
+        with open(ruta, "r", encoding="utf-8", errors="replace") as f:
+            codigo = f.read()
+        if codigo.isascii():  # El código no ASCII siempre lo analiza el autómata
+            casos[ruta] = codigo
+    for indice, codigo in enumerate([
+        "", "/", "x /", "a +", "b -", "&", "x & y", "a | b", "12.", "1..2", "1.5.3", "-", "--1",
+        "x=-1", "a<<=b", "a++=b", "/=", "/**/x", "/*/ x */ y", "/* sin cerrar", "// fin",
+        "a /* \n */ b\nc", "x\r\n\ty\x0b\x1cz", "@#$.", "if(x>=1){cout<<x;}",
+    ]):
+        casos[f"caso {indice}"] = codigo
+    alfabeto = "ab_1 9.\n\t-+*/%=<>!&|{}();,@"
+    generador = random.Random(0)
+    for indice in range(2000):
+        casos[f"aleatorio {indice}"] = "".join(generador.choice(alfabeto) for _ in range(generador.randint(0, 40)))
+
+    diferencias = 0
+    for nombre, codigo in casos.items():
+        diferencia = comparar_analizadores(codigo)
+        if diferencia:
+            diferencias += 1
+            print(f"{nombre!r}: {diferencia}")
+    print(f"{len(casos)} casos, {diferencias} con diferencias")
+    fallos = diferencias
+
+    # Medición de rendimiento (solo informativa: el tiempo de reloj varía entre ejecuciones y no hace
+    # fallar la prueba), relativa al costo de solo aplicar el patrón maestro (findall) para que no
+    # dependa de la máquina: mínimo de 7 repeticiones intercaladas. Con los archivos de test/ x200
+    # (324400 tokens) el patrón completo cuesta ~3 veces findall y el autómata ~4; buena parte
+    # es el recolector de ciclos recorriendo los Token vivos. No se pausa (gc.disable() afectaría a
+    # todo el proceso, incluido el programa que ejecuta el IDE en otro hilo).
+    codigo = "\n".join(casos[ruta] for ruta in casos if ruta.startswith("test")) * 200
+    medidos = {
+        "findall": PATRON_MAESTRO.findall,
+        "analizar_codigo_fuente_regex": analizar_codigo_fuente_regex,
+        "analizar_codigo_fuente_automata": analizar_codigo_fuente_automata,
+        "generar_tokens": lambda codigo: sum(1 for _ in generar_tokens(codigo)),
+        "AnalizadorLexicoIncremental (primer análisis)": lambda codigo: AnalizadorLexicoIncremental().analizar(codigo),
+    }
+    tiempos = dict.fromkeys(medidos, float("inf"))
+    for _ in range(7):
+        for nombre, funcion in medidos.items():
+            inicio = time.perf_counter()
+            funcion(codigo)
+            tiempos[nombre] = min(tiempos[nombre], time.perf_counter() - inicio)
+    for nombre, tiempo in tiempos.items():
+        print(f"{nombre}: {tiempo:.3f} s ({tiempo / tiempos['findall']:.1f}x findall)")
+
+    # Prueba diferencial del analizador incremental: secuencias de ediciones aleatorias (incluidas
+    # aperturas y cierres de comentarios multilínea) contra el análisis completo del texto editado;
+    # el resultado de la edición anterior no debe cambiar
+    fragmentos = ["/*", "*/", "\n", "//", "int y;\n", "/* a\n b */", "-1", "x"]
+    ediciones = 0
+    diferencias = 0
+    lineas_totales = 0
+    lineas_analizadas = 0
+    for codigo in list(casos.values())[:200]:
+        incremental = AnalizadorLexicoIncremental()
+        anterior = esperado_anterior = None
+        for _ in range(20):
+            posicion = generador.randint(0, len(codigo))
+            if codigo and generador.random() < 0.4:
+                codigo = codigo[:posicion] + codigo[posicion + generador.randint(1, 5):]
+            else:
+                texto = generador.choice(fragmentos) if generador.random() < 0.5 else generador.choice(alfabeto)
+                codigo = codigo[:posicion] + texto + codigo[posicion:]
+            ediciones += 1
+            obtenido = incremental.analizar(codigo)
+            esperado = analizar_codigo_fuente(codigo)
+            if obtenido != esperado or anterior != esperado_anterior:
+                diferencias += 1
+                print(f"incremental: {codigo!r}")
+            anterior, esperado_anterior = obtenido, esperado
+            lineas_totales += len(incremental.lineas)
+            lineas_analizadas += incremental.lineas_analizadas
+    print(f"{ediciones} ediciones, {diferencias} con diferencias; "
+          f"{lineas_analizadas} de {lineas_totales} líneas vueltas a analizar")
+    fallos += diferencias
+    sys.exit(1 if fallos else 0)
+
@@ -0,0 +1,689 @@
+# optimization.py
+# Optimización del código intermedio (TAC): pasadas sobre la lista de instrucciones
+
+import math
+from collections import Counter, deque
+from phases.intermediate_code import (
+    TACInstruction, parse_tac_instruction, is_literal_operand, is_temporary,
+    parse_literal, format_tac_value, evaluate_operation, STATUS_STEP_LIMIT,
+)
+from phases.cfg import ControlFlowGraph
+from phases.peephole import PeepholeOptimizer
+
+
+# Niveles de optimización
+OPT_NONE = 0    # Sin optimizar
+OPT_BASIC = 1   # Eliminación de código muerto e inalcanzable
+OPT_FULL = 2    # Además, constantes, mirilla, copias y código invariante de ciclos
+DEFAULT_OPTIMIZATION_LEVEL = OPT_FULL
+
+# Límite de instrucciones TAC de cada ejecución en compare_optimization_levels
+DIFFERENTIAL_MAX_STEPS = 1000000
+
+
+class OptimizationReport:
+    """Resumen de la optimización: instrucciones antes y después, y eliminadas por cada pasada."""
+
+    def __init__(self, original_count):
+        self.original_count = original_count
+        self.final_count = original_count
+        self.passes = []  # (nombre de la pasada, instrucciones eliminadas, detalle)
+
+    def record(self, name, before, after, detail=None):
+        """Registra el resultado de una pasada (detail: texto adicional opcional)."""
+        self.passes.append((name, before - after, detail))
+        self.final_count = after
+
+    @property
+    def removed(self):
+        """Total de instrucciones eliminadas."""
+        return self.original_count - self.final_count
+
+    def __str__(self):
+        lines = [f"Optimización: {self.original_count} -> {self.final_count} instrucciones "
+                 f"({self.removed} eliminadas)"]
+        for name, removed, detail in self.passes:
+            lines.append(f"  - {name}: {removed}" + (f" ({detail})" if detail else ""))
+        return "\n".join(lines)
+
+
+def _constant_operand(arg, facts):
+    """Valor constante de un operando (literal o variable con valor conocido) o None."""
+    if is_literal_operand(arg):
+        return parse_literal(arg)
+    return facts.get(arg)
+
+
+def _fold_instruction(inst, facts):
+    """
+    Aplica las constantes conocidas (facts: nombre -> valor) a una instrucción y actualiza facts.
+
+    Returns:
+        La instrucción reescrita, o None si es un salto condicional que nunca se toma
+    """
+    kind = inst.kind
+    if kind == 'assign':
+        values = [_constant_operand(arg, facts) for arg in inst.args]
+        if all(value is not None for value in values):
+            if inst.op is None:
+                result = values[0]
+            else:
+                result = evaluate_operation(inst.op, *values)
+            # No plegar resultados que no se pueden escribir como literal TAC (inf, nan)
+            if not (isinstance(result, float) and not math.isfinite(result)):
+                facts[inst.dest] = result
+                return TACInstruction('assign', dest=inst.dest, args=[format_tac_value(result)])
+        args = [format_tac_value(facts[arg]) if arg in facts else arg for arg in inst.args]
+        facts.pop(inst.dest, None)
+        return TACInstruction('assign', dest=inst.dest, op=inst.op, args=args)
+
+    if kind == 'if':
+        values = [_constant_operand(arg, facts) for arg in inst.args]
+        if all(value is not None for value in values):
+            if inst.op is None:
+                taken = bool(values[0])
+            elif inst.op in ('==', '!=') and inst.args[1] in ('true', 'false'):
+                # Igual que la máquina virtual: comparar la veracidad del operando
+                taken = (bool(values[0]) == values[1]) == (inst.op == '==')
+            else:
+                taken = evaluate_operation(inst.op, *values)
+            if inst.negated:
+                taken = not taken
+            return TACInstruction('goto', label=inst.label) if taken else None
+        args = [format_tac_value(facts[arg]) if arg in facts else arg for arg in inst.args]
+        return TACInstruction('if', op=inst.op, args=args, label=inst.label, negated=inst.negated)
+
+    if kind == 'read':
+        facts.pop(inst.dest, None)
+        return inst
+
+    if kind == 'write':
+        arg = inst.args[0]
+        if arg in facts:
+            return TACInstruction('write', args=[format_tac_value(facts[arg])])
+        return inst
+
+    return inst
+
+
+def _same_constant(a, b):
+    # 1 y True son iguales para Python, pero no son la misma constante TAC
+    return a is not None and b is not None and a == b and a.__class__ is b.__class__
+
+
+def _meet(facts_list):
+    """Intersección de hechos: solo las constantes en las que coinciden todos los caminos."""
+    result = dict(facts_list[0])
+    for facts in facts_list[1:]:
+        for name in list(result):
+            if not _same_constant(facts.get(name), result[name]):
+                del result[name]
+    return result
+
+
+def _same_facts(a, b):
+    if a is None or b is None or a.keys() != b.keys():
+        return False
+    return all(_same_constant(a[name], b[name]) for name in a)
+
+
+def fold_constants(instructions):
+    """
+    Plegado y propagación de constantes sobre los bloques básicos.
+
+    Se calcula, con un análisis de flujo de datos hacia adelante, qué variables y temporales
+    tienen un valor constante al entrar a cada bloque (en un ciclo solo si el valor coincide
+    por todos los caminos; read deja el valor como desconocido). Después se sustituyen esas
+    constantes como operandos inmediatos, se evalúan las operaciones con operandos constantes
+    y los saltos condicionales constantes se vuelven goto o se eliminan. Por último se eliminan
+    las asignaciones de constantes a temporales que ya no se usan.
+
+    Args:
+        instructions: Lista de TACInstruction
+
+    Returns:
+        Nueva lista de TACInstruction
+    """
+    graph = ControlFlowGraph(instructions)
+    blocks = graph.blocks
+    if not blocks:
+        return []
+
+    # Análisis: constantes a la entrada de cada bloque (None = bloque aún no alcanzado)
+    in_facts = [None] * len(blocks)
+    out_facts = [None] * len(blocks)
+    worklist = deque([0])
+    queued = {0}
+    while worklist:
+        index = worklist.popleft()
+        queued.discard(index)
+        incoming = [out_facts[p] for p in blocks[index].predecessors if out_facts[p] is not None]
+        if index == 0:
+            incoming.append({})
+        facts = _meet(incoming) if incoming else {}
+        in_facts[index] = dict(facts)
+        for inst in blocks[index].instructions:
+            _fold_instruction(inst, facts)
+        if not _same_facts(facts, out_facts[index]):
+            out_facts[index] = facts
+            for target in blocks[index].successors:
+                if target not in queued:
+                    queued.add(target)
+                    worklist.append(target)
+
+    # Transformación con las constantes de entrada de cada bloque
+    folded = []
+    for index, block in enumerate(blocks):
+        if in_facts[index] is None:
+            # Bloque inalcanzable: se conserva sin cambios
+            folded.extend(block.instructions)
+            continue
+        facts = dict(in_facts[index])
+        for inst in block.instructions:
+            new_inst = _fold_instruction(inst, facts)
+            if new_inst is not None:
+                folded.append(new_inst)
+
+    # Eliminar asignaciones de constantes a temporales que ya no se leen
+    used = {arg for inst in folded for arg in inst.args}
+    return [
+        inst for inst in folded
+        if not (inst.kind == 'assign' and inst.op is None and is_temporary(inst.dest)
+                and is_literal_operand(inst.args[0]) and inst.dest not in used)
+    ]
+
+
+def _defined_name(inst):
+    """Variable o temporal que escribe una instrucción (o None)."""
+    return inst.dest if inst.kind in ('assign', 'read') else None
+
+
+def _with_args(inst, args):
+    """Copia de una instrucción con otros operandos."""
+    return TACInstruction(inst.kind, dest=inst.dest, op=inst.op, args=args, label=inst.label, text=inst.text,
+                          negated=inst.negated)
+
+
+def _propagate_block(block, single_defs):
+    """Sustituye, dentro de un bloque, los usos de "tN = y" por y mientras y no cambie."""
+    copies = {}  # temporal -> operando copiado
+    result = []
+    for inst in block:
+        if copies and inst.args:
+            args = [copies.get(arg, arg) for arg in inst.args]
+            if args != inst.args:
+                inst = _with_args(inst, args)
+                if inst.kind == 'assign' and inst.op is None and inst.args[0] == inst.dest:
+                    # "tN = x; x = tN" queda como "x = x", que no hace nada
+                    continue
+        defined = _defined_name(inst)
+        if defined is not None:
+            if copies:
+                copies = {temp: source for temp, source in copies.items()
+                          if temp != defined and source != defined}
+            if (inst.kind == 'assign' and inst.op is None and is_temporary(defined)
+                    and defined in single_defs and inst.args[0] != defined):
+                copies[defined] = inst.args[0]
+        result.append(inst)
+    return result
+
+
+def _coalesce_block(block, uses, single_defs):
+    """
+    Fusiona "tN = expr" y "x = tN" en "x = expr" cuando tN se define y se usa una sola vez
+    y entre ambas instrucciones x no se lee ni se escribe.
+    """
+    block = list(block)
+    removed = set()
+    for j, inst in enumerate(block):
+        if not (inst.kind == 'assign' and inst.op is None):
+            continue
+        temp = inst.args[0]
+        target = inst.dest
+        if not is_temporary(temp) or temp == target or uses[temp] != 1 or temp not in single_defs:
+            continue
+        for i in range(j - 1, -1, -1):
+            if i in removed:
+                continue
+            candidate = block[i]
+            if _defined_name(candidate) == temp:
+                if candidate.kind == 'assign':
+                    block[i] = TACInstruction('assign', dest=target, op=candidate.op, args=candidate.args)
+                    removed.add(j)
+                break
+            if target in candidate.args or _defined_name(candidate) == target:
+                break
+    return [inst for index, inst in enumerate(block) if index not in removed]
+
+
+def propagate_copies(instructions):
+    """
+    Propagación de copias y fusión de temporales, bloque por bloque.
+
+    Primero, después de una copia "tN = y" los usos de tN en el mismo bloque se sustituyen
+    por y mientras y no cambie. Después, "tN = a op b" seguido de "x = tN" se escribe
+    directamente como "x = a op b" cuando es seguro. Los temporales que quedan sin usar los
+    elimina eliminate_dead_code().
+
+    Args:
+        instructions: Lista de TACInstruction
+
+    Returns:
+        Nueva lista de TACInstruction
+    """
+    defs = Counter(_defined_name(inst) for inst in instructions)
+    single_defs = {name for name, count in defs.items() if count == 1}
+
+    graph = ControlFlowGraph(instructions)
+    propagated = [_propagate_block(block.instructions, single_defs) for block in graph.blocks]
+
+    uses = Counter(arg for block in propagated for inst in block for arg in inst.args)
+    result = []
+    for block in propagated:
+        result.extend(_coalesce_block(block, uses, single_defs))
+    return result
+
+
+def _loop_invariants(graph, body, single_defs):
+    """
+    Instrucciones invariantes de un ciclo, en un orden válido para ejecutarlas antes de él.
+
+    Una instrucción es invariante si asigna a un temporal con una sola definición que solo se
+    usa dentro del ciclo, y cada operando es un literal, no se modifica dentro del ciclo o es
+    otro temporal invariante. Las operaciones TAC no tienen efectos secundarios (la división
+    entre cero da 0), así que moverlas es seguro aunque estén dentro de un if.
+    """
+    loop_instructions = [inst for index in sorted(body) for inst in graph.blocks[index].instructions]
+    defined_in_loop = {_defined_name(inst) for inst in loop_instructions}
+    used_outside = {arg for block in graph.blocks if block.index not in body
+                    for inst in block.instructions for arg in inst.args}
+
+    invariants = []
+    hoisted = set()
+    progress = True
+    while progress:
+        progress = False
+        for inst in loop_instructions:
+            if (inst.kind != 'assign' or inst.dest in hoisted or not is_temporary(inst.dest)
+                    or inst.dest not in single_defs or inst.dest in used_outside):
+                continue
+            if all(is_literal_operand(arg) or arg not in defined_in_loop or arg in hoisted
+                   for arg in inst.args):
+                invariants.append(inst)
+                hoisted.add(inst.dest)
+                progress = True
+    return invariants
+
+
+def _has_preheader_position(graph, header, body):
+    """
+    Indica si el código se puede insertar justo antes de la cabecera: todo predecesor de fuera
+    del ciclo debe ser el bloque anterior y llegar por continuación (no por un salto a la etiqueta).
+    """
+    label = graph.blocks[header].label
+    for pred in graph.blocks[header].predecessors:
+        if pred in body:
+            continue
+        jump = graph.blocks[pred].terminator
+        if pred != header - 1 or (jump is not None and jump.label == label):
+            return False
+    return True
+
+
+def hoist_loop_invariants(instructions):
+    """
+    Movimiento de código invariante: busca los ciclos naturales en el CFG (aristas de regreso
+    a un bloque que domina al origen) y mueve sus cálculos invariantes a un preencabezado,
+    es decir, justo antes de la etiqueta de la cabecera, donde se ejecutan una sola vez.
+    Los ciclos internos se procesan primero, así un cálculo puede salir de varios niveles.
+
+    Args:
+        instructions: Lista de TACInstruction
+
+    Returns:
+        (nueva lista de TACInstruction, número de instrucciones movidas)
+    """
+    moved = 0
+    done = set()  # Cabeceras ya procesadas (por etiqueta)
+    while True:
+        graph = ControlFlowGraph(instructions)
+        defs = Counter(_defined_name(inst) for inst in instructions)
+        single_defs = {name for name, count in defs.items() if count == 1}
+
+        # Ciclos naturales agrupados por cabecera
+        loops = {}
+        for source, header in graph.back_edges():
+            loops.setdefault(header, set()).update(graph.natural_loop(source, header))
+
+        candidates = [(header, body) for header, body in loops.items()
+                      if graph.blocks[header].label not in done]
+        if not candidates:
+            return instructions, moved
+        header, body = min(candidates, key=lambda item: len(item[1]))
+        done.add(graph.blocks[header].label)
+        if not _has_preheader_position(graph, header, body):
+            continue
+
+        invariants = _loop_invariants(graph, body, single_defs)
+        if not invariants:
+            continue
+        hoisted = {id(inst) for inst in invariants}
+        result = []
+        for block in graph.blocks:
+            if block.index == header:
+                result.extend(invariants)
+            result.extend(inst for inst in block.instructions if id(inst) not in hoisted)
+        instructions = result
+        moved += len(invariants)
+
+
+def remove_unreachable_blocks(instructions):
+    """Elimina los bloques básicos a los que no se llega desde la primera instrucción."""
+    graph = ControlFlowGraph(instructions)
+    reachable = graph.reachable()
+    return graph.instructions([block for block in graph.blocks if block.index in reachable])
+
+
+def remove_jumps_to_next(instructions):
+    """Elimina los saltos (goto o condicionales) a una etiqueta que sigue inmediatamente."""
+    result = []
+    for index, inst in enumerate(instructions):
+        if inst.kind in ('goto', 'if'):
+            # Etiquetas entre el salto y la siguiente instrucción ejecutable
+            following = index + 1
+            while following < len(instructions) and instructions[following].kind == 'label':
+                if instructions[following].label == inst.label:
+                    break
+                following += 1
+            if following < len(instructions) and instructions[following].kind == 'label':
+                continue
+        result.append(inst)
+    return result
+
+
+def remove_unused_labels(instructions):
+    """Elimina las etiquetas que ningún salto usa."""
+    targets = {inst.label for inst in instructions if inst.kind in ('goto', 'if')}
+    return [inst for inst in instructions if inst.kind != 'label' or inst.label in targets]
+
+
+def remove_dead_temporaries(instructions):
+    """Elimina las asignaciones a temporales cuyo valor nunca se lee (hasta que no quede ninguna)."""
+    while True:
+        used = {arg for inst in instructions for arg in inst.args}
+        result = [inst for inst in instructions
+                  if not (inst.kind == 'assign' and is_temporary(inst.dest) and inst.dest not in used)]
+        if len(result) == len(instructions):
+            return result
+        instructions = result
+
+
+def eliminate_dead_code(instructions):
+    """
+    Eliminación de código muerto: bloques inalcanzables, saltos a la instrucción siguiente,
+    etiquetas sin usar y asignaciones a temporales que no se leen. Se repite hasta que ninguna
+    de estas reglas cambia el código, porque cada una puede habilitar a las demás.
+    """
+    while True:
+        before = len(instructions)
+        instructions = remove_unreachable_blocks(instructions)
+        instructions = remove_jumps_to_next(instructions)
+        instructions = remove_unused_labels(instructions)
+        instructions = remove_dead_temporaries(instructions)
+        if len(instructions) == before:
+            return instructions
+
+
+def optimize_tac(instructions, level=DEFAULT_OPTIMIZATION_LEVEL, var_types=None, peephole_rules=None):
+    """
+    Optimiza una lista de instrucciones TAC (texto).
+
+    Args:
+        instructions: Instrucciones TAC
+        level: OPT_NONE, OPT_BASIC u OPT_FULL
+        var_types: Tipos de variables y temporales (los usa el optimizador de mirilla)
+        peephole_rules: Reglas de mirilla (ver phases.peephole; None = reglas por defecto)
+
+    Returns:
+        (instrucciones optimizadas, OptimizationReport)
+    """
+    report = OptimizationReport(len(instructions))
+    if level <= OPT_NONE:
+        return list(instructions), report
+    try:
+        parsed = [parse_tac_instruction(inst) for inst in instructions]
+    except ValueError:
+        # Instrucciones con formato no soportado: no se optimiza
+        return list(instructions), report
+
+    if level >= OPT_FULL:
+        before = len(parsed)
+        parsed = fold_constants(parsed)
+        report.record("Plegado y propagación de constantes", before, len(parsed))
+
+        before = len(parsed)
+        peephole = PeepholeOptimizer(peephole_rules, var_types)
+        parsed = peephole.optimize(parsed)
+        report.record("Mirilla", before, len(parsed), peephole.summary() or None)
+
+        before = len(parsed)
+        parsed = propagate_copies(parsed)
+        report.record("Propagación de copias", before, len(parsed))
+
+        before = len(parsed)
+        parsed, moved = hoist_loop_invariants(parsed)
+        report.record("Código invariante de ciclos", before, len(parsed), f"{moved} movidas al preencabezado")
+
+    before = len(parsed)
+    parsed = eliminate_dead_code(parsed)
+    report.record("Eliminación de código muerto", before, len(parsed))
+
+    return [str(inst) for inst in parsed], report
+
+
+def _run_at_level(source, level, input_values, max_steps):
+    """
+    Compila el código con el nivel dado y lo ejecuta en la máquina virtual TAC.
+
+    Returns:
+        (estado, error, entradas sin consumir, salida), o None si el programa tiene errores fatales
+    """
+    from phases.pipeline import compile_source
+    engine = compile_source(source, optimization_level=level).create_engine()
+    if engine is None:
+        return None
+    engine.reset()
+    engine.set_input(input_values)
+    status = engine.run(max_steps)
+    return status, engine.error, len(engine.input_queue), engine.output
+
+
+def compare_optimization_levels(source, input_values=(), levels=(OPT_BASIC, OPT_FULL),
+                                max_steps=DIFFERENTIAL_MAX_STEPS):
+    """
+    Prueba diferencial: ejecuta el programa sin optimizar (OPT_NONE) y con cada nivel de levels en
+    la máquina virtual TAC, con las mismas entradas, y compara estado, error, entradas consumidas
+    y salida.
+
+    Las versiones ejecutan distinto número de instrucciones: si alguna se detiene por el límite de
+    pasos, solo se comprueba que su salida sea prefijo de la otra.
+
+    Returns:
+        None si todos los niveles producen el mismo resultado (o el programa tiene errores
+        fatales); si no, una descripción de la primera diferencia
+    """
+    expected = _run_at_level(source, OPT_NONE, input_values, max_steps)
+    if expected is None:
+        return None
+    for level in levels:
+        obtained = _run_at_level(source, level, input_values, max_steps)
+        limited = STATUS_STEP_LIMIT in (expected[0], obtained[0])
+        if not limited:
+            for name, a, b in zip(("estado", "error", "entradas sin consumir"), expected, obtained):
+                if a != b:
+                    return f"{name}: -O{OPT_NONE} {a!r} / -O{level} {b!r}"
+        for index, (a, b) in enumerate(zip(expected[3], obtained[3])):
+            if a != b:
+                return f"salida[{index}]: -O{OPT_NONE} {a!r} / -O{level} {b!r}"
+        if not limited and len(expected[3]) != len(obtained[3]):
+            return f"líneas de salida: -O{OPT_NONE} {len(expected[3])} / -O{level} {len(obtained[3])}"
+    return None
+
+
+def _random_program(rng, statements=10):
+    """
+    Programa aleatorio para la prueba diferencial: asignaciones, if/else, ciclos acotados con
+    contadores propios, cin y cout, con expresiones que ejercitan el plegado de constantes, la
+    mirilla (x * 2, x + 0, x - 0, x * 1) y el código invariante de ciclos. Al final muestra todas
+    las variables, así que cualquier diferencia en el estado final aparece en la salida.
+
+    Las expresiones "enteras" son las que el análisis semántico tipa como int, pero incluyen '/'
+    (que en la máquina virtual siempre da un float, y -0.0 con un dividendo 0 y un divisor
+    negativo); sus cocientes alimentan las identidades de la mirilla y se asignan tanto a
+    variables int como float.
+    """
+    ints = ["a", "b", "c"]
+    floats = ["f", "g"]
+    lines = ["main {", "    int a, b, c, i0, i1, i2;", "    float f, g;"]
+
+    def operand(integer, counters):
+        choice = rng.random()
+        if choice < 0.35:
+            return str(rng.choice([0, 1, 2, 3, 7, 10]))
+        if not integer and choice < 0.45:
+            return rng.choice(["0.5", "2.5", "1.0"])
+        names = ints + counters + ([] if integer else floats)
+        return rng.choice(names)
+
+    def identity(operand_text):
+        return rng.choice([f"{operand_text} * 2", f"{operand_text} + 0", f"0 + {operand_text}",
+                           f"{operand_text} - 0", f"{operand_text} * 1", f"1 * {operand_text}"])
+
+    def quotient(depth, integer, counters):
+        # Divisores a menudo negativos (las variables empiezan en 0 y las entradas son pequeñas)
+        divisor = (f"({operand(integer, counters)} - {rng.choice([3, 7, 10])})" if rng.random() < 0.5
+                   else expression(depth, integer, counters))
+        return f"({expression(depth, integer, counters)} / {divisor})"
+
+    def expression(depth, integer, counters):
+        if depth == 0 or rng.random() < 0.3:
+            return operand(integer, counters)
+        pattern = rng.random()
+        if pattern < 0.15:
+            return identity(quotient(depth - 1, integer, counters))
+        left = expression(depth - 1, integer, counters)
+        if pattern < 0.3:
+            return identity(f"({left})")
+        if pattern < 0.35:
+            return f"(0 - {left})"
+        op = rng.choice(["+", "-", "*", "/", "%"])
+        return f"({left} {op} {expression(depth - 1, integer, counters)})"
+
+    def condition(counters):
+        choice = rng.random()
+        if choice < 0.1:
+            return rng.choice(["true", "false"])
+        integer = rng.random() < 0.6
+        text = (f"{expression(2, integer, counters)} {rng.choice(['<', '>', '<=', '>=', '==', '!='])} "
+                f"{expression(2, integer, counters)}")
+        if choice < 0.3:
+            return f"{text} {rng.choice(['&&', '||'])} {condition(counters)}"
+        if choice < 0.35:
+            return f"!({text})"
+        return text
+
+    def block(depth, counters, count):
+        for _ in range(count):
+            statement(depth, counters)
+
+    def statement(depth, counters):
+        indent = "    " * (depth + 1)
+        choice = rng.random()
+        nested = depth < 3
+        if nested and choice < 0.12:
+            lines.append(f"{indent}if {condition(counters)} then")
+            block(depth + 1, counters, rng.randint(1, 3))
+            if rng.random() < 0.5:
+                lines.append(f"{indent}else")
+                block(depth + 1, counters, rng.randint(1, 3))
+            lines.append(f"{indent}end")
+        elif nested and choice < 0.22:
+            counter = f"i{depth}"
+            lines.append(f"{indent}{counter} = 0;")
+            if rng.random() < 0.5:
+                lines.append(f"{indent}while {counter} < {rng.randint(0, 3)} do")
+                block(depth + 1, counters + [counter], rng.randint(1, 3))
+                lines.append(f"{indent}    {counter}++;")
+                lines.append(f"{indent}end")
+            else:
+                lines.append(f"{indent}do")
+                block(depth + 1, counters + [counter], rng.randint(1, 3))
+                lines.append(f"{indent}    {counter}++;")
+                lines.append(f"{indent}until {counter} >= {rng.randint(1, 3)}")
+        elif choice < 0.32:
+            lines.append(f"{indent}cin >> {rng.choice(ints + floats)};")
+        elif choice < 0.4:
+            lines.append(f"{indent}cout << {expression(2, rng.random() < 0.5, counters)};")
+        elif choice < 0.45:
+            lines.append(f"{indent}{rng.choice(ints + floats)}{rng.choice(['++', '--'])};")
+        elif choice < 0.6:
+            # El módulo acota los enteros dentro de los ciclos
+            lines.append(f"{indent}{rng.choice(ints)} = ({expression(3, True, counters)}) % 97;")
+        elif choice < 0.75:
+            # Un cociente (real, tal vez -0.0) en una variable int o float, o una identidad sobre
+            # una variable que pudo recibirlo, sin el módulo que normaliza -0.0
+            target = rng.choice(ints + floats)
+            integer = target in ints
+            source = (quotient(1, integer, counters) if rng.random() < 0.6
+                      else rng.choice(ints if integer else ints + floats))
+            lines.append(f"{indent}{target} = {identity(source)};")
+            if rng.random() < 0.5:
+                lines.append(f"{indent}{rng.choice(ints if integer else floats)} = {identity(target)};")
+        else:
+            target = rng.choice(floats)
+            op = rng.choice(["=", "=", "+=", "-="])
+            lines.append(f"{indent}{target} {op} {expression(3, rng.random() < 0.5, counters)};")
+
+    block(0, [], statements)
+    lines.extend(f"    cout << {name};" for name in ints + floats)
+    lines.append("}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    # Prueba diferencial de los niveles de optimización: cada programa de test/ (incluido
+    # test/finales) con varias secuencias de entradas fijas y programas aleatorios de varias semillas
+    #   python -m phases.optimization [número de semillas]
+    import glob
+    import random
+    import sys
+
+    seeds = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    generator = random.Random(0)
+    values = ["0", "1", "2", "3", "5", "7", "10", "-4", "2.5", "0.5", "-1.25", "-0.0", "true", "false"]
+    input_sets = [[generator.choice(values) for _ in range(64)] for _ in range(6)]
+
+    cases = {}
+    for path in sorted(glob.glob("test/**/*.txt", recursive=True)):
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            source = f.read()
+        for index, inputs in enumerate(input_sets):
+            cases[f"{path} (entradas {index})"] = (source, inputs)
+    # Regresiones: x + 0 -> x daba -0.0 con -O2 cuando x venía de un '/' (temporal o variable int)
+    cases["regresión / + 0 (temporal)"] = (
+        "main {\n int c;\n float g;\n cin >> c;\n g = c * 2 / (c - 7) + 0;\n cout << g;\n}", ["0"])
+    cases["regresión / + 0 (variable int)"] = (
+        "main {\n int c, x;\n cin >> c;\n x = c / (c - 7);\n cout << x + 0;\n}", ["0"])
+    for seed in range(seeds):
+        generator = random.Random(seed)
+        for index in range(300):
+            cases[f"aleatorio {seed}/{index}"] = (_random_program(generator), generator.choice(input_sets))
+
+    differences = 0
+    for name, (source, inputs) in cases.items():
+        difference = compare_optimization_levels(source, inputs)
+        if difference:
+            differences += 1
+            print(f"{name}: {difference}")
+    print(f"{len(cases)} casos, {differences} con diferencias")
+    sys.exit(1 if differences else 0)
@@ -0,0 +1,335 @@
+# peephole.py
+# Optimización de mirilla (peephole) del código intermedio TAC: reglas de patrones sobre una ventana
+
+from abc import ABC, abstractmethod
+from collections import Counter
+from phases.intermediate_code import TACInstruction, parse_tac_instruction, is_literal_operand, parse_literal
+
+
+class PeepholeRule(ABC):
+    """
+    Regla de mirilla. Las subclases definen name, description, window (número de instrucciones
+    consecutivas que observa la regla) y apply(); una subclase sin apply() no se puede instanciar.
+    """
+
+    name = ""
+    description = ""
+    window = 1
+
+    @abstractmethod
+    def apply(self, instructions, context):
+        """
+        Intenta aplicar la regla a una ventana de instrucciones.
+
+        Args:
+            instructions: Lista de `window` TACInstruction consecutivas
+            context: PeepholeContext con las etiquetas y los tipos del programa
+
+        Returns:
+            Lista de instrucciones que sustituye a la ventana, o None si la regla no aplica
+        """
+
+
+def _integer_literal(arg, value):
+    """Indica si un operando es el literal entero indicado (1 pero no 1.0 ni true)."""
+    return is_literal_operand(arg) and parse_literal(arg).__class__ is int and parse_literal(arg) == value
+
+
+class AlgebraicIdentityRule(PeepholeRule):
+    """
+    x * 1, 1 * x, x + 0, 0 + x y x - 0 se convierten en la copia x = x.
+    Solo con literales enteros (x + 0.0 convierte un int en float) y nunca x / 1, porque '/'
+    siempre produce un float. x + 0 solo si x es entero con seguridad (PeepholeContext.is_int):
+    con floats -0.0 + 0 es 0.0.
+    """
+
+    name = "identidades"
+    description = "x * 1, x + 0 y x - 0 -> x"
+
+    def apply(self, instructions, context):
+        inst = instructions[0]
+        if inst.kind != 'assign' or inst.op not in ('*', '+', '-') or context.is_bool(inst.args):
+            return None
+        left, right = inst.args
+        neutral = 1 if inst.op == '*' else 0
+        if _integer_literal(right, neutral):
+            kept = left
+        elif inst.op != '-' and _integer_literal(left, neutral):
+            kept = right
+        else:
+            return None
+        if inst.op == '+' and not context.is_int(kept):
+            return None
+        return [TACInstruction('assign', dest=inst.dest, args=[kept])]
+
+
+class StrengthReductionRule(PeepholeRule):
+    """x * 2 y 2 * x se convierten en x + x."""
+
+    name = "reducción de fuerza"
+    description = "x * 2 -> x + x"
+
+    def apply(self, instructions, context):
+        inst = instructions[0]
+        if inst.kind != 'assign' or inst.op != '*' or context.is_bool(inst.args):
+            return None
+        left, right = inst.args
+        if _integer_literal(right, 2) and not is_literal_operand(left):
+            operand = left
+        elif _integer_literal(left, 2) and not is_literal_operand(right):
+            operand = right
+        else:
+            return None
+        return [TACInstruction('assign', dest=inst.dest, op='+', args=[operand, operand])]
+
+
+class SelfCopyRule(PeepholeRule):
+    """Elimina las copias de una variable en sí misma (x = x)."""
+
+    name = "copias a sí mismo"
+    description = "x = x -> (nada)"
+
+    def apply(self, instructions, context):
+        inst = instructions[0]
+        if inst.kind == 'assign' and inst.op is None and inst.args[0] == inst.dest:
+            return []
+        return None
+
+
+class JumpThreadingRule(PeepholeRule):
+    """
+    Encadenamiento de saltos: un salto a una etiqueta cuya primera instrucción es "goto L2"
+    se redirige directamente a L2 (las etiquetas que quedan sin usar las elimina
+    la eliminación de código muerto).
+    """
+
+    name = "encadenamiento de saltos"
+    description = "goto L1 ... L1: goto L2 -> goto L2"
+
+    def apply(self, instructions, context):
+        inst = instructions[0]
+        if inst.kind not in ('goto', 'if'):
+            return None
+        target = context.final_target(inst.label)
+        if target == inst.label:
+            return None
+        return [TACInstruction(inst.kind, op=inst.op, args=inst.args, label=target, negated=inst.negated)]
+
+
+class BranchOverJumpRule(PeepholeRule):
+    """
+    Salto condicional sobre un goto: "ifFalse c goto L1" seguido de "goto L2" y de la etiqueta L1
+    salta a L2 cuando c es verdadera y sigue en L1 si no, igual que "if c goto L2" seguido de L1.
+    Se invierte la condición (if <-> ifFalse) y desaparece el goto; la etiqueta se conserva porque
+    otros saltos pueden usarla. Es el patrón que dejan los && y || con código de saltos.
+    """
+
+    name = "salto sobre goto"
+    description = "ifFalse c goto L1; goto L2; L1: -> if c goto L2; L1:"
+    window = 3
+
+    def apply(self, instructions, context):
+        branch, jump, label = instructions
+        if (branch.kind != 'if' or jump.kind != 'goto' or label.kind != 'label'
+                or branch.label != label.label):
+            return None
+        return [TACInstruction('if', op=branch.op, args=branch.args, label=jump.label, negated=not branch.negated),
+                label]
+
+
+class PeepholeContext:
+    """Información global que consultan las reglas: destino de cada etiqueta y tipos."""
+
+    def __init__(self, instructions, var_types=None):
+        self.var_types = var_types or {}
+        self.integers = self._integer_names(instructions)
+        # Etiqueta -> etiqueta a la que salta su primera instrucción (si es un goto)
+        self.forward = {}
+        pending = []
+        for inst in instructions:
+            if inst.kind == 'label':
+                pending.append(inst.label)
+                continue
+            if inst.kind == 'goto':
+                for label in pending:
+                    self.forward[label] = inst.label
+            pending = []
+
+    def final_target(self, label):
+        """Etiqueta final de una cadena de gotos (se detiene en los ciclos goto L0 / L0: goto L0)."""
+        seen = {label}
+        while label in self.forward and self.forward[label] not in seen:
+            label = self.forward[label]
+            seen.add(label)
+        return label
+
+    def _integer_names(self, instructions):
+        """
+        Variables y temporales que solo pueden contener enteros: todas sus definiciones son un
+        read de una variable int, una copia de un entero o +, -, * o % entre enteros.
+
+        No basta con var_types: '/' siempre da un float y la asignación no convierte, así que
+        una variable int puede contener un float (x = a / b).
+        """
+        definitions = {}
+        for inst in instructions:
+            if inst.kind in ('assign', 'read'):
+                definitions.setdefault(inst.dest, []).append(inst)
+        integers = set(definitions)
+
+        def is_integer(arg):
+            if is_literal_operand(arg):
+                return parse_literal(arg).__class__ is int
+            return arg in integers
+
+        def defines_integer(inst):
+            if inst.kind == 'read':
+                return self.var_types.get(inst.dest) == 'int'
+            if inst.op is None:
+                return is_integer(inst.args[0])
+            return inst.op in ('+', '-', '*', '%') and all(is_integer(arg) for arg in inst.args)
+
+        # Punto fijo: se descartan los nombres con alguna definición no entera (los ciclos
+        # como i = i + 1 siguen siendo enteros)
+        changed = True
+        while changed:
+            changed = False
+            for name in list(integers):
+                if not all(defines_integer(inst) for inst in definitions[name]):
+                    integers.discard(name)
+                    changed = True
+        return integers
+
+    def is_int(self, arg):
+        """Indica si un operando es entero con seguridad (literal entero o ver _integer_names)."""
+        if is_literal_operand(arg):
+            return parse_literal(arg).__class__ is int
+        return arg in self.integers
+
+    def is_bool(self, args):
+        """Indica si algún operando es booleano (literal o por su tipo conocido)."""
+        return any(arg in ('true', 'false') or self.var_types.get(arg) == 'bool' for arg in args)
+
+
+# Reglas disponibles por nombre; register_rule() agrega reglas nuevas
+RULES = {}
+
+
+def register_rule(rule):
+    """
+    Registra una regla (instancia de PeepholeRule) para poder elegirla por nombre.
+
+    Raises:
+        TypeError: si la regla no es una instancia de PeepholeRule
+        ValueError: si no tiene nombre o su ventana no es de al menos una instrucción
+    """
+    if not isinstance(rule, PeepholeRule):
+        raise TypeError(f"La regla de mirilla debe ser una instancia de PeepholeRule: {rule!r}")
+    if not rule.name or rule.window < 1:
+        raise ValueError(f"Regla de mirilla sin nombre o con ventana inválida: {rule!r}")
+    RULES[rule.name] = rule
+    return rule
+
+
+for _rule in (AlgebraicIdentityRule(), StrengthReductionRule(), SelfCopyRule(), JumpThreadingRule(),
+              BranchOverJumpRule()):
+    register_rule(_rule)
+
+# Conjunto de reglas que se usa si no se indica otro
+DEFAULT_RULES = ("identidades", "reducción de fuerza", "copias a sí mismo", "encadenamiento de saltos",
+                 "salto sobre goto")
+
+
+class PeepholeOptimizer:
+    """
+    Optimizador de mirilla: desliza una ventana sobre las instrucciones y sustituye las que
+    coinciden con alguna regla. Se repite hasta que ninguna regla aplica, porque una
+    sustitución puede habilitar otra. Cuenta cuántas veces se aplicó cada regla.
+    """
+
+    MAX_PASSES = 10  # Límite de pasadas (cada una es lineal en el número de instrucciones)
+
+    def __init__(self, rules=None, var_types=None):
+        """
+        Args:
+            rules: Reglas a aplicar, por nombre (ver RULES) o como instancias de PeepholeRule
+                   (None = DEFAULT_RULES)
+            var_types: Tipos de variables y temporales (para no aplicar reglas a booleanos)
+
+        Raises:
+            ValueError: si una regla indicada por nombre no existe
+        """
+        self.rules = []
+        for rule in DEFAULT_RULES if rules is None else rules:
+            if isinstance(rule, str):
+                if rule not in RULES:
+                    raise ValueError(f"Regla de mirilla desconocida: '{rule}'")
+                rule = RULES[rule]
+            self.rules.append(rule)
+        self.var_types = var_types
+        self.stats = Counter()  # Nombre de la regla -> veces aplicada
+
+    def optimize(self, instructions):
+        """
+        Aplica las reglas a una lista de instrucciones.
+
+        Args:
+            instructions: Lista de TACInstruction o de instrucciones TAC en texto
+
+        Returns:
+            Nueva lista de TACInstruction
+        """
+        instructions = [parse_tac_instruction(inst) if isinstance(inst, str) else inst
+                        for inst in instructions]
+        for _ in range(self.MAX_PASSES):
+            context = PeepholeContext(instructions, self.var_types)
+            result = []
+            changed = False
+            index = 0
+            while index < len(instructions):
+                for rule in self.rules:
+                    window = instructions[index:index + rule.window]
+                    if len(window) < rule.window:
+                        continue
+                    replacement = rule.apply(window, context)
+                    if replacement is not None:
+                        self.stats[rule.name] += 1
+                        result.extend(replacement)
+                        index += rule.window
+                        changed = True
+                        break
+                else:
+                    result.append(instructions[index])
+                    index += 1
+            instructions = result
+            if not changed:
+                break
+        return instructions
+
+    def summary(self):
+        """Veces que se aplicó cada regla, en texto (por ejemplo "identidades: 2")."""
+        return ", ".join(f"{name}: {count}" for name, count in self.stats.items())
+
+
+if __name__ == "__main__":
+    codigo = [
+        "read x",
+        "t0 = x * 1",
+        "t1 = t0 + 0",
+        "t2 = t1 * 2",
+        "y = y",
+        "ifFalse t2 < 10 goto L0",
+        "write t2",
+        "L0:",
+        "goto L1",
+        "L1:",
+        "if y > 0 goto L2",
+        "goto L3",
+        "L2:",
+        "write y",
+        "L3:",
+    ]
+    optimizador = PeepholeOptimizer(var_types={"x": "int"})
+    for inst in optimizador.optimize(codigo):
+        print(inst)
+    print(optimizador.summary())
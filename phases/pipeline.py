@@ -0,0 +1,282 @@
+# pipeline.py
+# Pipeline de compilación en memoria: léxico → sintáctico → semántico → código intermedio
+
+import sys
+from phases import lexical, syntactic, semantic, intermediate_code
+
+
+class CompilationPipeline:
+    """
+    Ejecuta las fases del compilador sobre un texto fuente pasando los resultados en memoria.
+
+    Los tokens, el AST, las anotaciones y las instrucciones TAC se pasan directamente entre fases,
+    sin el viaje de ida y vuelta por tokens.txt. Los archivos de salida (tokens.txt,
+    tabla_simbolos.txt, errores_semanticos.txt, ast_anotado.json y codigo_intermedio.tac)
+    solo se escriben si write_files es True.
+    """
+
+    def __init__(self, source, write_files=False, optimization_level=None, keep_tokens=True, lexer=None):
+        """
+        Inicializa el pipeline.
+
+        Args:
+            source: Texto del código fuente
+            write_files: Si es True, cada fase escribe sus archivos de salida
+            optimization_level: Nivel de optimización del TAC (None = nivel por defecto)
+            keep_tokens: Si es False, el análisis sintáctico consume el flujo de tokens del léxico
+                         sin guardar la lista (tokens queda en None); con write_files siempre se
+                         guarda, porque hace falta para tokens.txt
+            lexer: Función texto -> (tokens, errores) para la fase léxica; por defecto
+                   lexical.analizar_codigo_fuente (el IDE usa su AnalizadorLexicoIncremental)
+        """
+        self.source = source
+        self.write_files = write_files
+        self.optimization_level = optimization_level
+        self.keep_tokens = keep_tokens or write_files
+        self.lexer = lexer or lexical.analizar_codigo_fuente
+
+        # Fase léxica
+        self.tokens = None
+        self.lexical_errors = None
+
+        # Fase sintáctica
+        self.ast = None
+        self.syntax_errors = None
+
+        # Fase semántica
+        self.ast_anotado = None
+        self.tabla_simbolos = None
+        self.semantic_errors = None
+        self.annotations = None
+
+        # Código intermedio
+        self.instructions = None
+        self.var_types = None  # Tipos de variables y temporales para la máquina virtual
+        self.optimization_report = None  # Resumen de las optimizaciones aplicadas al TAC
+
+    def run_lexical(self):
+        """Ejecuta el análisis léxico sobre el texto fuente."""
+        self.tokens, self.lexical_errors = self.lexer(self.source)
+        if self.write_files:
+            lexical.escribir_archivo_tokens(self.tokens)
+        return self.tokens, self.lexical_errors
+
+    def run_syntactic(self):
+        """Ejecuta el análisis sintáctico con los tokens en memoria o con el flujo de tokens."""
+        if self.tokens is None and not self.keep_tokens:
+            self.lexical_errors = []
+            flujo = lexical.generar_tokens(self.source, self.lexical_errors)
+            self.ast, self.syntax_errors = syntactic.get_ast(flujo)
+            for _ in flujo:  # Los tokens que siguen al programa completan los errores léxicos
+                pass
+            return self.ast, self.syntax_errors
+        if self.tokens is None:
+            self.run_lexical()
+        self.ast, self.syntax_errors = syntactic.get_ast(self.tokens)
+        return self.ast, self.syntax_errors
+
+    def run_semantic(self):
+        """Ejecuta el análisis semántico sobre el AST en memoria."""
+        if self.ast is None:
+            self.run_syntactic()
+        (self.ast_anotado, self.tabla_simbolos, self.semantic_errors,
+         self.annotations, self.ast) = semantic.get_semantic_results(self.ast, write_files=self.write_files)
+        return self.ast_anotado, self.tabla_simbolos, self.semantic_errors, self.annotations, self.ast
+
+    def run_intermediate(self):
+        """Genera el código TAC a partir del AST anotado (no se genera si hay errores fatales)."""
+        if self.annotations is None:
+            self.run_semantic()
+
+        if self.ast is None or self.has_fatal_errors():
+            self.instructions = []
+            self.var_types = {}
+            return self.instructions
+
+        generator = intermediate_code.TACGenerator(self.annotations, self.tabla_simbolos,
+                                                   optimization_level=self.optimization_level)
+        self.instructions = generator.generate_from_ast(self.ast)
+        self.var_types = generator.var_types
+        self.optimization_report = generator.optimization_report
+        if self.write_files:
+            generator.save_to_file("codigo_intermedio.tac")
+        return self.instructions
+
+    def create_engine(self, engine=intermediate_code.ENGINE_TAC):
+        """
+        Crea un motor de ejecución cargado con el programa compilado: TACInterpreter con las
+        instrucciones TAC, PythonProgram con el AST traducido a Python o ASTProgram con el AST
+        compilado a closures. Todos implementan intermediate_code.ExecutionEngine.
+
+        Returns:
+            El motor, o None si el programa no se pudo compilar
+        """
+        if self.instructions is None:
+            self.run_intermediate()
+        if self.ast is None or self.has_fatal_errors():
+            return None
+        if engine == intermediate_code.ENGINE_PYTHON:
+            from phases import python_backend
+            return python_backend.compile_program(self.ast, self.annotations, self.tabla_simbolos)
+        if engine == intermediate_code.ENGINE_AST:
+            from phases import ast_interpreter
+            return ast_interpreter.compile_program(self.ast, self.annotations, self.tabla_simbolos, self.source)
+        if engine != intermediate_code.ENGINE_TAC:
+            raise ValueError(f"Motor de ejecución desconocido: '{engine}'")
+        interpreter = intermediate_code.TACInterpreter()
+        interpreter.load_from_list(self.instructions, self.var_types)
+        return interpreter
+
+    def run(self):
+        """Ejecuta todas las fases en orden y retorna el propio pipeline."""
+        if self.keep_tokens:
+            self.run_lexical()
+        self.run_syntactic()
+        self.run_semantic()
+        self.run_intermediate()
+        return self
+
+    def has_fatal_errors(self):
+        """Indica si el análisis semántico reportó errores fatales."""
+        return bool(self.semantic_errors) and any(error.get('fatal', False) for error in self.semantic_errors)
+
+
+class CompilationSession:
+    """
+    Sesión de compilación por documento.
+
+    Conserva el resultado de cada fase y solo lo marca como obsoleto cuando cambia el texto
+    fuente, de modo que pedir varias fases seguidas ejecuta cada una exactamente una vez.
+    """
+
+    def __init__(self, write_files=False, lexer=None):
+        self.write_files = write_files
+        self.lexer = lexer  # Función de la fase léxica (ver CompilationPipeline)
+        self.source = None
+        self.pipeline = None
+        self.completed = set()  # Fases ya ejecutadas para el texto actual
+
+    def set_source(self, text):
+        """
+        Establece el texto fuente del documento.
+        Si el texto cambió, todas las fases quedan obsoletas. Retorna True si hubo cambio.
+        """
+        if self.pipeline is not None and text == self.source:
+            return False
+        self.source = text
+        self.pipeline = CompilationPipeline(text, write_files=self.write_files, lexer=self.lexer)
+        self.completed = set()
+        return True
+
+    def invalidate(self):
+        """Marca todas las fases como obsoletas (por ejemplo, al cerrar o cambiar de archivo)."""
+        self.source = None
+        self.pipeline = None
+        self.completed = set()
+
+    def is_stale(self, phase):
+        """Indica si la fase indicada debe ejecutarse de nuevo para el texto actual."""
+        return phase not in self.completed
+
+    def _run_phase(self, phase, method_name):
+        if self.pipeline is None:
+            raise RuntimeError("La sesión de compilación no tiene texto fuente")
+        if phase not in self.completed:
+            getattr(self.pipeline, method_name)()
+            self.completed.add(phase)
+        return self.pipeline
+
+    def lexical(self):
+        """Retorna el pipeline con la fase léxica completada."""
+        return self._run_phase("lexical", "run_lexical")
+
+    def syntactic(self):
+        """Retorna el pipeline con la fase sintáctica completada."""
+        self.lexical()
+        return self._run_phase("syntactic", "run_syntactic")
+
+    def semantic(self):
+        """Retorna el pipeline con la fase semántica completada."""
+        self.syntactic()
+        return self._run_phase("semantic", "run_semantic")
+
+    def intermediate(self):
+        """Retorna el pipeline con el código intermedio generado."""
+        self.semantic()
+        return self._run_phase("intermediate", "run_intermediate")
+
+
+def compile_source(text, write_files=False, optimization_level=None, keep_tokens=False):
+    """
+    Compila un texto fuente completo en memoria.
+
+    Por defecto el parser consume el flujo de tokens del léxico sin guardar la lista, así que
+    `tokens` del resultado queda en None (los errores léxicos sí quedan en `lexical_errors`).
+
+    Args:
+        text: Código fuente
+        write_files: Si es True, escribe los archivos de salida de cada fase (guarda los tokens
+                     para tokens.txt)
+        optimization_level: Nivel de optimización del TAC (None = nivel por defecto)
+        keep_tokens: Si es True, guarda la lista de tokens en `tokens`
+
+    Returns:
+        CompilationPipeline con los resultados de todas las fases
+    """
+    return CompilationPipeline(text, write_files=write_files, optimization_level=optimization_level,
+                               keep_tokens=keep_tokens).run()
+
+
+if __name__ == "__main__":
+    # Compilación por lotes:
+    #   python -m phases.pipeline archivo.txt [--archivos] [--tokens] [-O0|-O1|-O2] [--ejecutar] [--motor=tac|python|ast]
+    # El parser consume los tokens a medida que el léxico los genera; con --tokens se guarda la lista
+    # para informar cuántos hay. Con --ejecutar, las entradas de cin se leen de la entrada estándar (un valor por línea);
+    # --motor=todos ejecuta el programa con cada motor y compara las salidas
+    if len(sys.argv) < 2:
+        print("Uso: python -m phases.pipeline archivo.txt [--archivos] [--tokens] [-O0|-O1|-O2] "
+              "[--ejecutar] [--motor=tac|python|ast|todos]")
+        sys.exit(1)
+
+    with open(sys.argv[1], "r", encoding="utf-8") as f:
+        codigo = f.read()
+
+    nivel = None
+    motor = intermediate_code.ENGINE_TAC
+    for arg in sys.argv[2:]:
+        if arg.startswith("-O") and arg[2:].isdigit():
+            nivel = int(arg[2:])
+        elif arg.startswith("--motor="):
+            motor = arg[len("--motor="):]
+
+    resultado = compile_source(codigo, write_files="--archivos" in sys.argv[2:], optimization_level=nivel,
+                               keep_tokens="--tokens" in sys.argv[2:])
+    if resultado.tokens is None:
+        print(f"Tokens: en flujo (errores léxicos: {len(resultado.lexical_errors)})")
+    else:
+        print(f"Tokens: {len(resultado.tokens)} (errores léxicos: {len(resultado.lexical_errors)})")
+    print(f"Errores sintácticos: {len(resultado.syntax_errors)}")
+    print(f"Errores semánticos: {len(resultado.semantic_errors)}")
+    if resultado.optimization_report:
+        print(resultado.optimization_report)
+    print("\n".join(resultado.instructions))
+
+    if "--ejecutar" in sys.argv[2:]:
+        entradas = [line.strip() for line in sys.stdin if line.strip()]
+        motores = intermediate_code.ENGINES if motor == "todos" else (motor,)
+        salidas = {}
+        for nombre in motores:
+            programa = resultado.create_engine(nombre)
+            if programa is None:
+                print("No se puede ejecutar: el programa tiene errores fatales")
+                sys.exit(1)
+            programa.set_input(entradas)
+            exito, error = programa.execute()
+            salidas[nombre] = (exito, programa.output)
+            if len(motores) > 1:
+                print(f"--- {nombre} ---")
+            print("\n".join(programa.output))
+            print(programa.stats_summary() if exito else f"ERROR: {error}")
+        if len(motores) > 1:
+            iguales = len(set(repr(salida) for salida in salidas.values())) == 1
+            print("Las salidas de todos los motores coinciden" if iguales else "Las salidas de los motores NO coinciden")
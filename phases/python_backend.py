@@ -0,0 +1,498 @@
+# python_backend.py
+# Backend Python: traduce el AST anotado a código fuente Python y lo ejecuta con compile()/exec
+
+import time
+from abc import abstractmethod
+from phases.intermediate_code import (
+    TACGenerator, ExecutionEngine, parse_literal, format_tac_value, ENGINE_PYTHON, ENGINE_STEP_UNITS,
+    DEFAULT_MAX_STEPS, DEFAULT_TIME_LIMIT, WATCHDOG_INTERVAL,
+    STATUS_FINISHED, STATUS_PAUSED, STATUS_ERROR, STATUS_STEP_LIMIT, STATUS_TIME_LIMIT, STATUS_STOPPED,
+)
+
+
+# Solicitudes que el programa generado entrega (con yield) a PythonProgram.run()
+REQUEST_CHECKPOINT = "checkpoint"  # Revisar límites, detención y progreso
+REQUEST_READ = "read"              # Se necesita un valor de entrada (cin)
+REQUEST_RESUME = "resume"          # Interno: valor de entrada ya recibido con provide_input()
+
+FUNCTION_NAME = "programa"
+VARIABLE_PREFIX = "v_"  # Evita choques con palabras reservadas y nombres internos de Python
+
+
+def _divide(x, y):
+    """División de la máquina virtual TAC: siempre real y 0 si el divisor es 0."""
+    return x / y if y != 0 else 0
+
+
+def _modulo(x, y):
+    """Módulo de la máquina virtual TAC: 0 si el divisor es 0."""
+    return x % y if y != 0 else 0
+
+
+class PythonCodeGenerator:
+    """
+    Traductor del AST anotado a código fuente Python.
+
+    Genera una sola función generadora con ciclos estructurados (while de Python para while
+    y do-until) y expresiones nativas, con la misma semántica que el código TAC en la máquina
+    virtual: variables sin asignar en 0, '/' real y división o módulo entre cero igual a 0,
+    && y || en cortocircuito con resultado booleano. cin y los puntos de revisión del
+    watchdog se comunican con PythonProgram mediante yield; cout llama a _write().
+    """
+
+    def __init__(self, annotations, symbol_table):
+        """
+        Args:
+            annotations: Diccionario de anotaciones del análisis semántico {id_nodo: {...}}
+            symbol_table: Tabla de símbolos con información de variables
+        """
+        # Se reutilizan las utilidades de lectura del AST del generador TAC
+        self.reader = TACGenerator(annotations, symbol_table, reuse_temps=False, optimization_level=0)
+        self.var_types = self.reader.collect_variable_types()
+        self.variables = {}  # Variables del programa en orden de aparición (como conjunto ordenado)
+        self.lines = []
+        self.indent = 1
+
+    def emit(self, line):
+        """Agrega una línea al cuerpo de la función con la sangría actual."""
+        self.lines.append("    " * self.indent + line)
+
+    def variable(self, name):
+        """Nombre de la variable en el código Python generado."""
+        self.variables.setdefault(name, None)
+        return VARIABLE_PREFIX + name
+
+    def lexema(self, node):
+        return self.reader.extract_lexema(node.name if hasattr(node, 'name') else str(node))
+
+    def generate_from_ast(self, ast_root):
+        """
+        Genera el código fuente Python del programa.
+
+        Returns:
+            str: Código fuente de la función FUNCTION_NAME
+        """
+        self.lines = []
+        self.indent = 1
+        self.variables = dict.fromkeys(self.var_types)
+
+        if ast_root is not None and hasattr(ast_root, 'children'):
+            for child in ast_root.children:
+                if child is not None and self.lexema(child) not in ('main', '{', '}', 'Programa'):
+                    self.process_statement(child)
+
+        header = [f"def {FUNCTION_NAME}(_write):",
+                  "    # Variables sin asignar en 0, como en la máquina virtual"]
+        header += [f"    {VARIABLE_PREFIX}{name} = 0" for name in self.variables]
+        header += ["    _steps = 0",
+                   f"    _checkpoint = yield ('{REQUEST_CHECKPOINT}', None, 0)"]
+        memory = ", ".join(f"'{name}': {VARIABLE_PREFIX}{name}" for name in self.variables)
+        footer = [f"    return _steps, {{{memory}}}"]
+        return "\n".join(header + self.lines + footer) + "\n"
+
+    def process_block(self, node):
+        """Procesa las sentencias hijas de un bloque (then, else, Cuerpo); pass si está vacío."""
+        start = len(self.lines)
+        if hasattr(node, 'children') and node.children:
+            for stmt in node.children:
+                self.process_statement(stmt)
+        if len(self.lines) == start:
+            self.emit("pass")
+
+    def process_statement(self, node):
+        """Traduce una sentencia (misma estructura que TACGenerator.process_statement)."""
+        if node is None:
+            return
+        node_name = node.name if hasattr(node, 'name') else str(node)
+        lexema = self.lexema(node)
+        children = node.children if hasattr(node, 'children') else []
+
+        if lexema in ('main', '{', '}'):
+            for child in children:
+                self.process_statement(child)
+            return
+
+        if node_name == "Declaración":
+            # Solo las inicializaciones generan código
+            for child in children[1:]:
+                if child is not None and hasattr(child, 'name') and child.name == "=":
+                    self.process_statement(child)
+            return
+
+        if lexema in ('int', 'float', 'bool'):
+            return
+
+        if lexema == "=":
+            if len(children) >= 2:
+                value = self.expression(children[1])
+                if value is not None:
+                    self.emit(f"{self.variable(self.lexema(children[0]))} = {value}")
+        elif lexema in ("+=", "-=", "*=", "/=", "%="):
+            if len(children) >= 2:
+                value = self.expression(children[1])
+                if value is not None:
+                    target = self.variable(self.lexema(children[0]))
+                    self.emit(f"{target} = {self.binary(lexema[0], target, value)}")
+        elif lexema.startswith("Expansión de"):
+            if children:
+                self.process_statement(children[0])
+        elif lexema == "if":
+            self.process_if_statement(children)
+        elif lexema == "while":
+            self.process_loop(children, until=False)
+        elif lexema == "do":
+            self.process_loop(children, until=True)
+        elif lexema == "cin":
+            if children:
+                name = self.lexema(children[0])
+                self.emit(f"{self.variable(name)} = yield ('{REQUEST_READ}', '{name}', _steps)")
+        elif lexema == "cout":
+            if children:
+                value = self.expression(children[0])
+                if value is not None:
+                    self.emit(f"_write({value})")
+        else:
+            for child in children:
+                self.process_statement(child)
+
+    @staticmethod
+    def _parts(children):
+        return {child.name: child for child in children if hasattr(child, 'name')}
+
+    def process_if_statement(self, children):
+        parts = self._parts(children)
+        cond_node, then_node, else_node = parts.get("Condición"), parts.get("then"), parts.get("else")
+        if cond_node is None or then_node is None or not cond_node.children:
+            return
+        condition = self.condition(cond_node.children[0])
+        if condition is None:
+            return
+        self.emit(f"if {condition}:")
+        self.indent += 1
+        self.process_block(then_node)
+        self.indent -= 1
+        if else_node is not None:
+            self.emit("else:")
+            self.indent += 1
+            self.process_block(else_node)
+            self.indent -= 1
+
+    def process_loop(self, children, until):
+        """
+        while cond do ... end  ->  while cond: ...
+        do ... until cond      ->  while True: ...; if cond: break
+        Cada iteración cuenta un paso para el watchdog de PythonProgram.
+        """
+        parts = self._parts(children)
+        cond_node, body_node = parts.get("Condición"), parts.get("Cuerpo")
+        if cond_node is None or body_node is None:
+            return
+        condition = self.condition(cond_node.children[0]) if cond_node.children else None
+        self.emit(f"while {condition if condition is not None and not until else 'True'}:")
+        self.indent += 1
+        self.emit("_steps += 1")
+        self.emit("if _steps >= _checkpoint:")
+        self.emit(f"    _checkpoint = yield ('{REQUEST_CHECKPOINT}', None, _steps)")
+        self.process_block(body_node)
+        if until and condition is not None:
+            self.emit(f"if {condition}:")
+            self.emit("    break")
+        self.indent -= 1
+
+    def binary(self, operator, left, right):
+        """Operación binaria con la semántica de la máquina virtual."""
+        if operator in ('/', '%'):
+            try:
+                divisor = parse_literal(right)
+            except ValueError:
+                divisor = None
+            if divisor is not None and divisor is not True and divisor is not False and divisor != 0:
+                return f"({left} {operator} {right})"
+            return f"{'_divide' if operator == '/' else '_modulo'}({left}, {right})"
+        return f"({left} {operator} {right})"
+
+    def condition(self, node):
+        """Expresión Python de una condición (solo importa si es verdadera o falsa)."""
+        lexema = self.lexema(node)
+        children = node.children if hasattr(node, 'children') else []
+        if lexema in ('&&', '||') and len(children) >= 2:
+            left = self.condition(children[0])
+            right = self.condition(children[1])
+            if left is None or right is None:
+                return None
+            return f"({left} {'and' if lexema == '&&' else 'or'} {right})"
+        if lexema == '!' and children and not self.reader.is_literal(node):
+            operand = self.condition(children[0])
+            return None if operand is None else f"(not {operand})"
+        return self.expression(node)
+
+    def expression(self, node):
+        """Expresión Python del valor de un nodo (o None si no se puede traducir)."""
+        if node is None:
+            return None
+        lexema = self.lexema(node)
+        children = node.children if hasattr(node, 'children') else []
+
+        if self.reader.is_literal(node):
+            return repr(parse_literal(str(self.reader.get_literal_value(node))))
+        if self.reader.is_identifier(node):
+            return self.variable(lexema)
+        if lexema in ('+', '-', '*', '/', '%', '<', '>', '<=', '>=', '==', '!=') and len(children) >= 2:
+            left = self.expression(children[0])
+            right = self.expression(children[1])
+            if left is None or right is None:
+                return None
+            return self.binary(lexema, left, right)
+        if lexema in ('&&', '||'):
+            condition = self.condition(node)
+            return None if condition is None else f"bool{condition}"
+        if lexema == '!':
+            operand = self.expression(children[0]) if children else None
+            return None if operand is None else f"(not {operand})"
+        if children:
+            return self.expression(children[0])
+        return None
+
+
+class GeneratorProgram(ExecutionEngine):
+    """
+    Motor de ejecución basado en un generador de Python. Implementa la interfaz de
+    ExecutionEngine (run, provide_input, memoria, límites y callbacks), igual que
+    TACInterpreter, de modo que el IDE y generate_and_run_intermediate_code pueden usar
+    cualquier motor.
+
+    El programa se suspende con yield para pedir un valor de entrada (REQUEST_READ) o en los
+    puntos de revisión del watchdog (REQUEST_CHECKPOINT), y run() lo reanuda con send().
+    Cada solicitud es (tipo, variable, pasos) y al terminar el generador retorna
+    (pasos, memoria). Aquí un "paso" es una iteración de un ciclo.
+
+    Las subclases implementan _start(), _live_values() y _current_line().
+    """
+
+    engine_name = ""  # Nombre del motor para stats_summary()
+    step_unit = ENGINE_STEP_UNITS[ENGINE_PYTHON]
+
+    def __init__(self, names, var_types=None):
+        """
+        Args:
+            names: Variables del programa
+            var_types: Tipos de las variables (para convertir las entradas de cin)
+        """
+        super().__init__()
+        self.names = list(names)
+        self.var_types = dict(var_types or {})
+
+    @abstractmethod
+    def _start(self):
+        """Crea el generador del programa (detenido antes de su primera instrucción)."""
+
+    @abstractmethod
+    def _live_values(self):
+        """Valores actuales de las variables mientras el programa está suspendido."""
+
+    @abstractmethod
+    def _current_line(self):
+        """Índice en self.instructions de la posición actual del programa."""
+
+    def reset(self):
+        """Reinicia el programa (crea un nuevo generador detenido en su primera revisión)."""
+        self.generator = self._start()
+        self.request = next(self.generator)
+        self.reply = None
+        self.final_memory = None  # Valores de las variables al terminar
+        self.pc = 0
+        self.output = []
+        self.input_queue = []
+        self.running = False
+        self.error = None
+        self.steps = 0
+        self.elapsed = 0.0
+        self.stop_requested = False
+
+    def _write(self, value):
+        text = format_tac_value(value)
+        self.output.append(text)
+        if self.output_callback:
+            self.output_callback(text)
+
+    def _update_pc(self):
+        finished = self.generator.gi_frame is None
+        self.pc = len(self.instructions) if finished else self._current_line()
+
+    @property
+    def memory(self):
+        """Variables del programa con su valor actual."""
+        if self.final_memory is not None:
+            return dict(self.final_memory)
+        values = self._live_values() if self.generator.gi_frame is not None else {}
+        memory = {name: values.get(name, 0) for name in self.names}
+        if self.request[0] == REQUEST_RESUME:
+            # Valor de entrada recibido que el programa asignará al continuar
+            memory[self.request[1]] = self.reply
+        return memory
+
+    def diff_memory(self, previous):
+        """Variables que cambiaron respecto a previous (ver ExecutionEngine.diff_memory)."""
+        changes = {}
+        for name, value in self.memory.items():
+            old = previous.get(name)
+            if name not in previous or old != value or old.__class__ is not value.__class__:
+                changes[name] = value
+        previous.update(changes)
+        return changes
+
+    def get_value(self, identifier):
+        """Valor actual de una variable (0 si no existe o no se ha asignado)."""
+        return self.memory.get(identifier, 0)
+
+    def pending_input_variable(self):
+        """Variable que espera un valor de entrada (o None si no hay un cin pendiente)."""
+        return self.request[1] if self.request[0] == REQUEST_READ else None
+
+    def provide_input(self, value):
+        """
+        Entrega un valor de entrada al cin pendiente (el programa continúa en el siguiente run()).
+        Si no hay un cin pendiente, el valor se agrega a la cola de entrada.
+        Retorna la variable que recibió el valor (o None si se encoló).
+
+        Raises:
+            ValueError: si el valor no se puede convertir al tipo de la variable
+        """
+        var = self.pending_input_variable()
+        if var is None:
+            self.input_queue.append(value)
+            return None
+        self.reply = self._convert_input(var, value)
+        self.request = (REQUEST_RESUME, var, self.request[2])
+        return var
+
+    def stats_summary(self):
+        """Resumen de la ejecución: iteraciones de ciclos, tiempo y velocidad."""
+        return (f"{self.steps} iteraciones de ciclos en {self.elapsed:.3f} s "
+                f"({self.steps_per_second():.0f} iteraciones/s, {self.engine_name})")
+
+    def run(self, max_steps=None, time_limit=None):
+        """
+        Ejecuta el programa hasta terminar, necesitar un valor de entrada, encontrar un error,
+        ejecutar max_steps iteraciones de ciclos o superar time_limit segundos.
+
+        Returns:
+            Uno de STATUS_FINISHED, STATUS_PAUSED, STATUS_ERROR, STATUS_STEP_LIMIT,
+            STATUS_TIME_LIMIT o STATUS_STOPPED
+        """
+        if self.final_memory is not None:
+            return STATUS_FINISHED
+        if self.error is not None:
+            # El generador terminó con una excepción: no se puede reanudar
+            return STATUS_ERROR
+        started = time.perf_counter()
+        deadline = started + time_limit if time_limit else None
+        budget = self.steps + max_steps if max_steps is not None else float("inf")
+        status = STATUS_FINISHED
+        self.running = True
+
+        try:
+            while True:
+                kind, var, steps = self.request
+                self.steps = steps
+                if kind == REQUEST_READ:
+                    if not self.input_queue:
+                        status = STATUS_PAUSED
+                        break
+                    reply = self._convert_input(var, self.input_queue.pop(0))
+                elif kind == REQUEST_RESUME:
+                    reply = self.reply
+                else:
+                    if steps >= budget:
+                        status = STATUS_STEP_LIMIT
+                        break
+                    if self.stop_requested:
+                        status = STATUS_STOPPED
+                        break
+                    if deadline and time.perf_counter() >= deadline:
+                        status = STATUS_TIME_LIMIT
+                        break
+                    if self.progress_callback:
+                        self._update_pc()
+                        self.progress_callback()
+                    reply = min(budget, steps + WATCHDOG_INTERVAL)
+                self.request = self.generator.send(reply)
+        except StopIteration as finished:
+            self.steps, self.final_memory = finished.value
+        except Exception as e:
+            self.error = f"Error de ejecución: {e}"
+            status = STATUS_ERROR
+
+        self._update_pc()
+        self.elapsed += time.perf_counter() - started
+        if status != STATUS_PAUSED:
+            self.running = False
+        elif self.input_callback:
+            self.input_callback(self.pending_input_variable())
+        return status
+
+
+class PythonProgram(GeneratorProgram):
+    """
+    Programa traducido a una función Python nativa (ver PythonCodeGenerator): CPython
+    despacha directamente todo el código salvo cin y los puntos de revisión de los ciclos.
+    """
+
+    engine_name = "Python nativo"
+
+    def __init__(self, source, names, var_types=None):
+        """
+        Args:
+            source: Código fuente generado por PythonCodeGenerator
+            names: Variables del programa (sin el prefijo VARIABLE_PREFIX)
+            var_types: Tipos de las variables (para convertir las entradas de cin)
+        """
+        super().__init__(names, var_types)
+        self.source = source
+        self.instructions = source.splitlines()  # Líneas del código (pc es el índice de la línea)
+        namespace = {"__builtins__": {"bool": bool}, "_divide": _divide, "_modulo": _modulo}
+        exec(compile(source, f"<{FUNCTION_NAME}>", "exec"), namespace)
+        self.function = namespace[FUNCTION_NAME]
+        self.reset()
+
+    def _start(self):
+        return self.function(self._write)
+
+    def _live_values(self):
+        values = self.generator.gi_frame.f_locals
+        return {name: values.get(VARIABLE_PREFIX + name, 0) for name in self.names}
+
+    def _current_line(self):
+        return self.generator.gi_frame.f_lineno - 1
+
+
+def generate_python_source(ast_root, annotations, symbol_table=None):
+    """
+    Traduce el AST anotado a código fuente Python.
+
+    Returns:
+        (código fuente, variables del programa, tipos de las variables)
+    """
+    generator = PythonCodeGenerator(annotations, symbol_table)
+    source = generator.generate_from_ast(ast_root)
+    return source, list(generator.variables), generator.var_types
+
+
+def compile_program(ast_root, annotations, symbol_table=None):
+    """Traduce el AST anotado y lo compila a un PythonProgram listo para ejecutarse."""
+    return PythonProgram(*generate_python_source(ast_root, annotations, symbol_table))
+
+
+def generate_and_run_python(ast_root, annotations, symbol_table=None, input_values=None,
+                            max_steps=DEFAULT_MAX_STEPS, time_limit=DEFAULT_TIME_LIMIT):
+    """
+    Traduce el AST a Python y lo ejecuta.
+
+    Returns:
+        (source: str, execution_output: str, success: bool, error: str)
+    """
+    program = compile_program(ast_root, annotations, symbol_table)
+    if input_values is not None:
+        program.set_input(input_values)
+    success, error = program.execute(max_steps, time_limit)
+    return program.source, program.get_output(), success, error
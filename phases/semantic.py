@@ -355,7 +355,10 @@ class SemanticAnalyzer:
                     else:
                         result_value = left_num / right_num
                 elif node.name == '%':
-                    result_value = left_num % right_num
+                    if right_num == 0:
+                        result_value = None  # Módulo por cero
+                    else:
+                        result_value = left_num % right_num
                 
                 # Formatear resultado según el tipo
                 if result_value is not None:
@@ -1237,12 +1240,13 @@ def ast_to_dict_annotated(ast_node, annotations, parent_id=None):
     return result
 
 
-def get_semantic_results(ast_root=None):
+def get_semantic_results(ast_root=None, write_files=True):
     """
     Función principal que realiza el análisis semántico.
     
     Args:
         ast_root: ASTNode opcional. Si es None, se obtiene desde syntactic.get_ast()
+        write_files: Si es True, escribe tabla_simbolos.txt, errores_semanticos.txt y ast_anotado.json
     
     Returns:
         (ast_anotado_dict, tabla_simbolos_dict, errores_list, annotations_dict, ast_root_node)
@@ -1266,9 +1270,10 @@ def get_semantic_results(ast_root=None):
     ast_anotado_dict = ast_to_dict_annotated(ast_root, results["annotations"])
     
     # Generar archivos
-    _write_symbol_table_file(results["tabla_simbolos"])
-    _write_errors_file(results["errores"])
-    _write_annotated_ast_file(ast_anotado_dict)
+    if write_files:
+        _write_symbol_table_file(results["tabla_simbolos"])
+        _write_errors_file(results["errores"])
+        _write_annotated_ast_file(ast_anotado_dict)
     
     return ast_anotado_dict, results["tabla_simbolos"], results["errores"], results["annotations"], ast_root
 
@@ -1,69 +1,94 @@
 import os
+import itertools
+from collections import deque
 from util.treeNode import ASTNode
+from util.tokens import (
+    Token, clase_de, describir_clase, IDENTIFIER, INT_LITERAL, FLOAT_LITERAL, OPERATOR,
+    KW_MAIN, KW_INT, KW_FLOAT, KW_IF, KW_THEN, KW_ELSE, KW_END, KW_WHILE, KW_DO, KW_UNTIL, KW_CIN, KW_COUT,
+    PLUS, MINUS, STAR, SLASH, PERCENT, SHIFT_LEFT, SHIFT_RIGHT, INCREMENT, DECREMENT,
+    ASSIGN, PLUS_ASSIGN, MINUS_ASSIGN, STAR_ASSIGN, PERCENT_ASSIGN,
+    LESS, GREATER, EQUAL, NOT_EQUAL, LESS_EQUAL, GREATER_EQUAL, NOT, AND, OR,
+    LBRACE, RBRACE, LPAREN, RPAREN, SEMICOLON, COMMA,
+)
 from PyQt5.QtWidgets import QTreeWidget, QTreeWidgetItem, QPlainTextEdit
 
-class Token:
-    def __init__(self, lexema, tipo, linea, columna):
-        self.lexema = lexema
-        self.tipo = tipo
-        self.linea = linea
-        self.columna = columna
-    
-    def __str__(self):
-        return f"{self.lexema}\t{self.tipo}\t{self.linea}\t{self.columna}"
+def _token_desde_tupla(t):
+    """Convierte una tupla (lexema, tipo, linea, columna) en Token."""
+    return Token(t[0], clase_de(t[1], t[0]), t[2], t[3])
+
+# Clases de token que el parser acepta como grupo
+OPERADORES_ASIGNACION = (ASSIGN, PLUS_ASSIGN, MINUS_ASSIGN, STAR_ASSIGN, PERCENT_ASSIGN)
+OPERADORES_RELACIONALES = (LESS, GREATER, EQUAL, NOT_EQUAL, LESS_EQUAL, GREATER_EQUAL)
 
 class Parser:
     def __init__(self, tokens):
-        self.tokens = [Token(*t) for t in tokens]
-        self.current = 0
+        """
+        Args:
+            tokens: Lista de Token o cualquier iterable de Token (por ejemplo lexical.generar_tokens),
+                    que se consume a medida que avanza el análisis; las tuplas
+                    (lexema, tipo, linea, columna) se convierten
+        """
+        self.fuente = iter(tokens)
+        primero = next(self.fuente, None)
+        if primero is not None and not isinstance(primero, Token):
+            self.fuente = map(_token_desde_tupla, itertools.chain([primero], self.fuente))
+            primero = next(self.fuente)
+        self.buffer = deque()  # Tokens leídos por adelantado (lookahead) y aún no consumidos
+        self.current = 0  # Número de tokens consumidos
         self.errors = []
-    
+        self.actual = primero  # Token actual (None al final)
+        self.clase_actual = None if primero is None else primero.clase  # check() solo compara enteros
+
     def error(self, message):
-        if self.current < len(self.tokens):
-            token = self.tokens[self.current]
-            if token and hasattr(token, 'linea') and hasattr(token, 'columna'):
-                self.errors.append(f"Error en línea {token.linea}, columna {token.columna}: {message}")
-            else:
-                self.errors.append(f"Error: {message} (token nulo)")
+        token = self.actual
+        if token is not None:
+            self.errors.append(f"Error en línea {token.linea}, columna {token.columna}: {message}")
         else:
             self.errors.append(f"Error: {message} (fin de archivo)")
         return None
 
     def peek(self):
         """Retorna el token actual sin avanzar el cursor."""
-        if self.current < len(self.tokens):
-            token = self.tokens[self.current]
-            if token and hasattr(token, 'lexema') and hasattr(token, 'tipo') and hasattr(token, 'linea') and hasattr(token, 'columna'):
-                return token
-        return None
+        return self.actual
+
+    def lookahead(self, distancia=1):
+        """Retorna el token que está `distancia` posiciones después del actual, sin consumir nada."""
+        if self.actual is None:
+            return None
+        while len(self.buffer) < distancia:
+            token = next(self.fuente, None)
+            if token is None:
+                return None
+            self.buffer.append(token)
+        return self.buffer[distancia - 1]
 
     def advance(self):
-        token = self.peek()
+        token = self.actual
         self.current += 1
+        if token is not None:
+            siguiente = self.buffer.popleft() if self.buffer else next(self.fuente, None)
+            self.actual = siguiente
+            self.clase_actual = None if siguiente is None else siguiente.clase
         return token
 
-    def check(self, tipo=None, lexema=None):
-        token = self.peek()
-        if not token:
-            return False
-        if tipo and token.tipo != tipo:
-            return False
-        if lexema and (isinstance(lexema, str) and token.lexema != lexema or 
-                        isinstance(lexema, (list, tuple)) and token.lexema not in lexema):
-            return False
-        return True
-
-    def match(self, tipo=None, lexema=None):
-        if self.check(tipo, lexema):
+    def check(self, *clases, lexema=None):
+        """Indica si el token actual es de alguna de las clases (y, si se indica, de uno de los lexemas)."""
+        return self.clase_actual in clases and (lexema is None or self.actual.lexema in lexema)
+
+    def match(self, *clases, lexema=None):
+        if self.clase_actual in clases and (lexema is None or self.actual.lexema in lexema):
             return self.advance()
         return None
 
-    def require(self, tipo=None, lexema=None, mensaje=None):
-        token = self.match(tipo, lexema)
+    def require(self, *clases, mensaje=None):
+        token = self.match(*clases)
         if not token:
             actual = self.peek()
             if not mensaje:
-                esperado = lexema if lexema else tipo
+                if len(clases) == 1:
+                    esperado = describir_clase(clases[0])
+                else:
+                    esperado = tuple(describir_clase(clase) for clase in clases)
                 mensaje = f"Se esperaba {esperado}"
                 if actual and hasattr(actual, 'lexema'):
                     mensaje += f", se encontró '{actual.lexema}'"
@@ -81,36 +106,37 @@ class Parser:
         root = ASTNode("Programa")
         
         # Verificar 'main'
-        main_token = self.require("PALABRA_RESERVADA", "main")
+        main_token = self.require(KW_MAIN)
         if not main_token:
             return root
         root.add_child(ASTNode(self.format_token(main_token)))
         
         # Verificar '{'
-        llave_token = self.require("DELIMITADOR", "{")
+        llave_token = self.require(LBRACE)
         if not llave_token:
             return root
         
         # Parsear el cuerpo del programa
-        while self.peek() and not self.check("DELIMITADOR", "}"):
+        while self.peek() and not self.check(RBRACE):
             if decl := self.parse_declaracion():
                 root.add_child(decl)
         
         # Verificar '}'
-        llave_token = self.require("DELIMITADOR", "}")
+        llave_token = self.require(RBRACE)
         if llave_token:
             root.add_child(ASTNode(self.format_token(llave_token)))
         return root
 
     def parse_declaracion(self):
         """declaracion → declaracion_variable | sentencia"""
-        if self.check("PALABRA_RESERVADA", ("int", "float", "bool")):
+        # 'bool' no es palabra reservada: el analizador léxico lo clasifica como identificador
+        if self.check(KW_INT, KW_FLOAT):
             return self.parse_declaracion_variable()
         return self.parse_sentencia()
 
     def parse_declaracion_variable(self):
         """declaracion_variable → tipo identificador_list ;"""
-        tipo_token = self.require("PALABRA_RESERVADA", ("int", "float", "bool"))
+        tipo_token = self.require(KW_INT, KW_FLOAT)
         if not tipo_token:
             return None
         
@@ -119,13 +145,13 @@ class Parser:
         
         # Lista de identificadores
         while True:
-            id_token = self.require("IDENTIFICADOR")
+            id_token = self.require(IDENTIFIER)
             if not id_token:
                 return None
             id_node = ASTNode(self.format_token(id_token))
             
             # Si hay una asignación inicial
-            if self.check("OPERADOR_ASIGNACION", "="):
+            if self.check(ASSIGN):
                 op_token = self.advance()
                 op_node = ASTNode(self.format_token(op_token))
                 op_node.add_child(id_node)
@@ -137,11 +163,11 @@ class Parser:
             else:
                 node.add_child(id_node)
             
-            if not self.check("DELIMITADOR", ","):
+            if not self.check(COMMA):
                 break
             self.advance()  # Consumir la coma
         
-        if not self.require("DELIMITADOR", ";"):
+        if not self.require(SEMICOLON):
             return None
         
         return node
@@ -151,17 +177,17 @@ class Parser:
         if not self.peek():
             return None
             
-        if self.check("PALABRA_RESERVADA", "if"):
+        if self.check(KW_IF):
             return self.parse_if_stmt()
-        elif self.check("PALABRA_RESERVADA", "while"):
+        elif self.check(KW_WHILE):
             return self.parse_while_stmt()
-        elif self.check("PALABRA_RESERVADA", "do"):
+        elif self.check(KW_DO):
             return self.parse_do_while_stmt()
-        elif self.check("PALABRA_RESERVADA", "cin"):
+        elif self.check(KW_CIN):
             return self.parse_entrada()
-        elif self.check("PALABRA_RESERVADA", "cout"):
+        elif self.check(KW_COUT):
             return self.parse_salida()
-        elif self.check("IDENTIFICADOR"):
+        elif self.check(IDENTIFIER):
             return self.parse_asignacion()
         
         token = self.peek()
@@ -171,7 +197,7 @@ class Parser:
 
     def parse_if_stmt(self):
         """if_stmt → if expresion then bloque (else bloque)? end"""
-        if_token = self.require("PALABRA_RESERVADA", "if")
+        if_token = self.require(KW_IF)
         if not if_token:
             return None
         
@@ -186,32 +212,32 @@ class Parser:
             return None
         
         # Then
-        if not self.require("PALABRA_RESERVADA", "then"):
+        if not self.require(KW_THEN):
             return None
         
         # Bloque then
         then_node = ASTNode("then")
-        while self.peek() and not self.check("PALABRA_RESERVADA", ("else", "end")):
+        while self.peek() and not self.check(KW_ELSE, KW_END):
             if stmt := self.parse_sentencia():
                 then_node.add_child(stmt)
         node.add_child(then_node)
         
         # Else (opcional)
-        if self.match("PALABRA_RESERVADA", "else"):
+        if self.match(KW_ELSE):
             else_node = ASTNode("else")
-            while self.peek() and not self.check("PALABRA_RESERVADA", "end"):
+            while self.peek() and not self.check(KW_END):
                 if stmt := self.parse_sentencia():
                     else_node.add_child(stmt)
             node.add_child(else_node)
         
-        if not self.require("PALABRA_RESERVADA", "end"):
+        if not self.require(KW_END):
             return None
         
         return node
 
     def parse_while_stmt(self):
         """while_stmt → while expresion do bloque end"""
-        while_token = self.require("PALABRA_RESERVADA", "while")
+        while_token = self.require(KW_WHILE)
         if not while_token:
             return None
         
@@ -226,24 +252,24 @@ class Parser:
             return None
         
         # Verificar 'do'
-        if not self.require("PALABRA_RESERVADA", "do"):
+        if not self.require(KW_DO):
             return None
         
         # Bloque
         body_node = ASTNode("Cuerpo")
-        while self.peek() and not self.check("PALABRA_RESERVADA", "end"):
+        while self.peek() and not self.check(KW_END):
             if stmt := self.parse_sentencia():
                 body_node.add_child(stmt)
         node.add_child(body_node)
         
-        if not self.require("PALABRA_RESERVADA", "end"):
+        if not self.require(KW_END):
             return None
         
         return node
 
     def parse_do_while_stmt(self):
         """do_while_stmt → do bloque until expresion"""
-        do_token = self.require("PALABRA_RESERVADA", "do")
+        do_token = self.require(KW_DO)
         if not do_token:
             return None
         
@@ -251,13 +277,13 @@ class Parser:
         
         # Bloque
         body_node = ASTNode("Cuerpo")
-        while self.peek() and not self.check("PALABRA_RESERVADA", "until"):
+        while self.peek() and not self.check(KW_UNTIL):
             if stmt := self.parse_sentencia():
                 body_node.add_child(stmt)
         node.add_child(body_node)
         
         # Until y condición
-        if not self.require("PALABRA_RESERVADA", "until"):
+        if not self.require(KW_UNTIL):
             return None
         
         cond_node = ASTNode("Condición")
@@ -271,12 +297,12 @@ class Parser:
 
     def parse_asignacion(self):
         """asignacion → identificador op_asignacion expresion ;"""
-        id_token = self.require("IDENTIFICADOR")
+        id_token = self.require(IDENTIFIER)
         if not id_token:
             return None
         
         # Operador de asignación o incremento/decremento
-        if self.check("OPERADOR_ASIGNACION") or self.check("OPERADOR_ARITMETICO", ("++", "--")):
+        if self.check(*OPERADORES_ASIGNACION) or self.check(INCREMENT, DECREMENT):
             op_token = self.advance()
             if not op_token:
                 return self.error("Error inesperado en operador de asignación")
@@ -297,7 +323,7 @@ class Parser:
                 op_node.add_child(one_node)
                 assign_node.add_child(op_node)
                 root.add_child(assign_node)
-                if not self.require("DELIMITADOR", ";"):
+                if not self.require(SEMICOLON):
                     return None
                 return root
             
@@ -309,13 +335,13 @@ class Parser:
             if op_token.lexema not in ("++", "--"):
                 if expr := self.parse_expresion():
                     node.add_child(expr)
-                    if not self.require("DELIMITADOR", ";"):
+                    if not self.require(SEMICOLON):
                         return None
                     return node
                 else:
                     return None
             else:
-                if not self.require("DELIMITADOR", ";"):
+                if not self.require(SEMICOLON):
                     return None
                 return node
         
@@ -323,35 +349,35 @@ class Parser:
 
     def parse_entrada(self):
         """entrada → cin >> identificador ;"""
-        cin_token = self.require("PALABRA_RESERVADA", "cin")
+        cin_token = self.require(KW_CIN)
         if not cin_token:
             return None
         
         node = ASTNode(self.format_token(cin_token))
         
-        op_token = self.require("OPERADOR_ARITMETICO", ">>")
+        op_token = self.require(SHIFT_RIGHT)
         if not op_token:
             return None
         
-        id_token = self.require("IDENTIFICADOR")
+        id_token = self.require(IDENTIFIER)
         if not id_token:
             return None
         node.add_child(ASTNode(self.format_token(id_token)))
         
-        if not self.require("DELIMITADOR", ";"):
+        if not self.require(SEMICOLON):
             return None
         
         return node
 
     def parse_salida(self):
         """salida → cout << expresion ;"""
-        cout_token = self.require("PALABRA_RESERVADA", "cout")
+        cout_token = self.require(KW_COUT)
         if not cout_token:
             return None
         
         node = ASTNode(self.format_token(cout_token))
         
-        op_token = self.require("OPERADOR_ARITMETICO", "<<")
+        op_token = self.require(SHIFT_LEFT)
         if not op_token:
             return None
         
@@ -360,7 +386,7 @@ class Parser:
         else:
             return None
         
-        if not self.require("DELIMITADOR", ";"):
+        if not self.require(SEMICOLON):
             return None
         
         return node
@@ -378,7 +404,7 @@ class Parser:
         if not node:
             return None
         
-        while self.check("OPERADOR_LOGICO", "||"):
+        while self.check(OR):
             op_token = self.advance()
             if not op_token:
                 return self.error("Error inesperado en operador lógico OR")
@@ -399,7 +425,7 @@ class Parser:
         if not node:
             return None
         
-        while self.check("OPERADOR_LOGICO", "&&"):
+        while self.check(AND):
             op_token = self.advance()
             if not op_token:
                 return self.error("Error inesperado en operador lógico AND")
@@ -420,7 +446,7 @@ class Parser:
         if not node:
             return None
         
-        while self.check("OPERADOR_RELACIONAL"):
+        while self.check(*OPERADORES_RELACIONALES):
             op_token = self.advance()
             if not op_token:
                 return self.error("Error inesperado en operador relacional")
@@ -441,7 +467,7 @@ class Parser:
         if not node:
             return None
         
-        while self.check("OPERADOR_ARITMETICO", ("+", "-")) or self.check("OPERADOR", ("+", "-")):
+        while self.check(PLUS, MINUS) or self.check(OPERATOR, lexema=("+", "-")):
             op_token = self.advance()
             if not op_token:
                 return self.error("Error inesperado en operador aritmético")
@@ -462,7 +488,7 @@ class Parser:
         if not node:
             return None
         
-        while self.check("OPERADOR_ARITMETICO", ("*", "/", "%")) or self.check("OPERADOR", ("*", "/", "%")):
+        while self.check(STAR, SLASH, PERCENT) or self.check(OPERATOR, lexema=("*", "/", "%")):
             op_token = self.advance()
             if not op_token:
                 return self.error("Error inesperado en operador aritmético")
@@ -483,10 +509,7 @@ class Parser:
             return self.error("Se esperaba un factor")
         
         # Negación lógica
-        if self.match("OPERADOR_LOGICO", "!"):
-            token = self.tokens[self.current - 1]
-            if not token:
-                return self.error("Error inesperado en operador de negación")
+        if token := self.match(NOT):
             node = ASTNode(self.format_token(token))
             factor = self.parse_factor()
             if not factor:
@@ -495,11 +518,11 @@ class Parser:
             return node
         
         # Número negativo (operador - seguido de número)
-        if self.check("OPERADOR", "-") or self.check("OPERADOR_ARITMETICO", "-"):
+        if self.check(MINUS) or self.check(OPERATOR, lexema=("-",)):
             # Verificar si el siguiente token es un número
-            if self.current + 1 < len(self.tokens):
-                next_token = self.tokens[self.current + 1]
-                if next_token and next_token.tipo in ("NUMERO_ENTERO", "NUMERO_FLOTANTE"):
+            next_token = self.lookahead()
+            if next_token:
+                if next_token.clase in (INT_LITERAL, FLOAT_LITERAL):
                     # Es un número negativo
                     minus_token = self.advance()
                     num_token = self.advance()
@@ -509,16 +532,16 @@ class Parser:
                         return ASTNode(f"{negative_value} ({num_token.linea}:{num_token.columna})")
         
         # Paréntesis
-        if self.match("DELIMITADOR", "("):
+        if self.match(LPAREN):
             expr = self.parse_expresion()
             if not expr:
                 return self.error("Se esperaba una expresión después de '('")
-            if not self.require("DELIMITADOR", ")"):
+            if not self.require(RPAREN):
                 return None
             return expr
         
         # Número o identificador
-        if self.check("NUMERO_ENTERO") or self.check("NUMERO_FLOTANTE") or self.check("IDENTIFICADOR"):
+        if self.check(INT_LITERAL, FLOAT_LITERAL, IDENTIFIER):
             token = self.advance()
             if not token:
                 return self.error("Error inesperado en factor")
@@ -539,14 +562,18 @@ def read_tokens_from_file(path="tokens.txt"):
             for line in file:
                 parts = line.strip().split("\t")
                 if len(parts) >= 4:
-                    tokens.append((parts[0], parts[1], int(parts[2]), int(parts[3])))
+                    tokens.append(Token(parts[0], clase_de(parts[1], parts[0]), int(parts[2]), int(parts[3])))
     except Exception as e:
         print(f"Error leyendo tokens desde {path}: {e}")
     return tokens
 
-def get_ast():
-    """Función principal que retorna el AST y los errores encontrados"""
-    tokens = read_tokens_from_file()
+def get_ast(tokens=None):
+    """
+    Función principal que retorna el AST y los errores encontrados.
+    Si no se proporcionan tokens, se leen desde tokens.txt.
+    """
+    if tokens is None:
+        tokens = read_tokens_from_file()
     parser = Parser(tokens)
     ast = parser.parse_programa()
     return ast, parser.errors
@@ -0,0 +1,98 @@
+# tokens.py
+# Token compartido por el analizador léxico y el sintáctico, y sus clases (enteros pequeños)
+
+# Clases de token. Las palabras reservadas y los símbolos de lexema fijo tienen su propia clase,
+# de modo que el analizador sintáctico compara un entero en lugar de tipo y lexema.
+(
+    IDENTIFIER, INT_LITERAL, FLOAT_LITERAL, OPERATOR,
+    KW_IF, KW_ELSE, KW_END, KW_DO, KW_WHILE, KW_SWITCH, KW_CASE, KW_INT, KW_FLOAT, KW_MAIN,
+    KW_CIN, KW_COUT, KW_THEN, KW_UNTIL, KW_RETURN, KW_BREAK, KW_CONTINUE, KW_FOR, KW_IN,
+    KW_FUNCTION, KW_VAR, KW_LET, KW_CONST,
+    PLUS, MINUS, STAR, SLASH, PERCENT, SHIFT_LEFT, SHIFT_RIGHT, INCREMENT, DECREMENT,
+    ASSIGN, PLUS_ASSIGN, MINUS_ASSIGN, STAR_ASSIGN, PERCENT_ASSIGN,
+    LESS, GREATER, EQUAL, NOT_EQUAL, LESS_EQUAL, GREATER_EQUAL,
+    NOT, AND, OR,
+    LBRACE, RBRACE, LBRACKET, RBRACKET, LPAREN, RPAREN, SEMICOLON, COMMA,
+) = range(58)
+
+# Palabra reservada -> clase
+PALABRAS_CLAVE = {
+    "if": KW_IF, "else": KW_ELSE, "end": KW_END, "do": KW_DO, "while": KW_WHILE,
+    "switch": KW_SWITCH, "case": KW_CASE, "int": KW_INT, "float": KW_FLOAT, "main": KW_MAIN,
+    "cin": KW_CIN, "cout": KW_COUT, "then": KW_THEN, "until": KW_UNTIL, "return": KW_RETURN,
+    "break": KW_BREAK, "continue": KW_CONTINUE, "for": KW_FOR, "in": KW_IN,
+    "function": KW_FUNCTION, "var": KW_VAR, "let": KW_LET, "const": KW_CONST,
+}
+
+# Operador o delimitador -> clase
+SIMBOLOS = {
+    "+": PLUS, "-": MINUS, "*": STAR, "/": SLASH, "%": PERCENT,
+    "<<": SHIFT_LEFT, ">>": SHIFT_RIGHT, "++": INCREMENT, "--": DECREMENT,
+    "=": ASSIGN, "+=": PLUS_ASSIGN, "-=": MINUS_ASSIGN, "*=": STAR_ASSIGN, "%=": PERCENT_ASSIGN,
+    "<": LESS, ">": GREATER, "==": EQUAL, "!=": NOT_EQUAL, "<=": LESS_EQUAL, ">=": GREATER_EQUAL,
+    "!": NOT, "&&": AND, "||": OR,
+    "{": LBRACE, "}": RBRACE, "[": LBRACKET, "]": RBRACKET, "(": LPAREN, ")": RPAREN,
+    ";": SEMICOLON, ",": COMMA,
+}
+
+# Clase -> tipo (el texto que muestran la tabla de tokens y tokens.txt)
+TIPOS = ["IDENTIFICADOR", "NUMERO_ENTERO", "NUMERO_FLOTANTE", "OPERADOR"]
+TIPOS += ["PALABRA_RESERVADA"] * len(PALABRAS_CLAVE)
+TIPOS += ["OPERADOR_ARITMETICO"] * 9 + ["OPERADOR_ASIGNACION"] * 5 + ["OPERADOR_RELACIONAL"] * 6
+TIPOS += ["OPERADOR_LOGICO"] * 3 + ["DELIMITADOR"] * 8
+
+# Clase -> lexema, para las clases de lexema fijo
+LEXEMAS = {clase: lexema for lexema, clase in {**PALABRAS_CLAVE, **SIMBOLOS}.items()}
+
+
+def clase_de(tipo, lexema):
+    """
+    Clase de un token a partir de su tipo en texto (por ejemplo, al leer tokens.txt).
+
+    Raises:
+        ValueError: si el tipo no corresponde al lexema
+    """
+    if tipo == "PALABRA_RESERVADA" and lexema in PALABRAS_CLAVE:
+        return PALABRAS_CLAVE[lexema]
+    if lexema in SIMBOLOS and TIPOS[SIMBOLOS[lexema]] == tipo:
+        return SIMBOLOS[lexema]
+    if tipo in ("IDENTIFICADOR", "NUMERO_ENTERO", "NUMERO_FLOTANTE", "OPERADOR"):
+        return TIPOS.index(tipo)
+    raise ValueError(f"Tipo de token desconocido para '{lexema}': {tipo}")
+
+
+def describir_clase(clase):
+    """Lexema de una clase de lexema fijo o, si no lo tiene, su tipo (para mensajes de error)."""
+    return LEXEMAS.get(clase, TIPOS[clase])
+
+
+class Token:
+    """
+    Token del analizador léxico. Usa __slots__ (sin __dict__ por instancia) porque se crea uno por
+    lexema: el léxico los produce y el sintáctico los consume sin copiarlos. Guarda la clase
+    (entero); el tipo en texto se obtiene de la tabla TIPOS.
+    """
+
+    __slots__ = ("lexema", "clase", "linea", "columna")
+
+    def __init__(self, lexema, clase, linea, columna):
+        self.lexema = lexema
+        self.clase = clase
+        self.linea = linea
+        self.columna = columna
+
+    @property
+    def tipo(self):
+        return TIPOS[self.clase]
+
+    def __eq__(self, other):
+        if not isinstance(other, Token):
+            return NotImplemented
+        return (self.lexema == other.lexema and self.clase == other.clase
+                and self.linea == other.linea and self.columna == other.columna)
+
+    def __repr__(self):
+        return f"Token({self.lexema!r}, {self.tipo}, {self.linea}, {self.columna})"
+
+    def __str__(self):
+        return f"{self.lexema}\t{self.tipo}\t{self.linea}\t{self.columna}"